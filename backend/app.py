@@ -2,6 +2,20 @@ from routes.job_routes import job_router
 from routes.user_routes import user_router
 from routes.company_routes import company_router
 from routes.application_routes import application_router
+from routes.export_routes import export_router
+from routes.saved_search_routes import saved_search_router
+from routes.notification_routes import notification_router
+from services.ingest import ingest_command
+from services.dedup import dedup_command
+from services.facets import rebuild_facets_command
+from services.sweeper import start_sweeper, sweep_command
+from services.locations import normalize_locations_command
+from services.user_search import index_user_names_command
+from services.serialization import FastJSONProvider
+from services.compression import init_compression
+from services.passwords import password_hasher
+from services.identity import init_identity
+from services.rate_limit import limiter
 from flask import Flask, request, jsonify, redirect
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
@@ -20,12 +34,19 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)
 app.config.from_object(Config)
+app.json = FastJSONProvider(app)
+init_compression(app)
+password_hasher.init_app(app)
+limiter.init_app(app)
 
 # Register the blueprints
 app.register_blueprint(user_router, url_prefix='/api/users')
 app.register_blueprint(job_router, url_prefix='/api/jobs')
 app.register_blueprint(company_router, url_prefix='/api/companies')
 app.register_blueprint(application_router, url_prefix='/api/applications')
+app.register_blueprint(export_router, url_prefix='/api/export')
+app.register_blueprint(saved_search_router, url_prefix='/api/saved-searches')
+app.register_blueprint(notification_router, url_prefix='/api/notifications')
 
 # Initialize Swagger with security definitions
 swagger = Swagger(app, template={
@@ -108,6 +129,19 @@ migrate = Migrate(app, db)
 
 # Initialize JWT
 jwt = JWTManager(app)
+init_identity(jwt)
+
+# CLI commands
+app.cli.add_command(ingest_command)
+app.cli.add_command(dedup_command)
+app.cli.add_command(sweep_command)
+app.cli.add_command(normalize_locations_command)
+app.cli.add_command(index_user_names_command)
+app.cli.add_command(rebuild_facets_command)
+
+# Close expired jobs in the background when an interval is configured
+if app.config['JOB_SWEEPER_INTERVAL'] > 0:
+    start_sweeper(app, app.config['JOB_SWEEPER_INTERVAL'])
 
 # Register teardown function to clean up the database session
 
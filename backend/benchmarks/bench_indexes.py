@@ -0,0 +1,198 @@
+"""
+Benchmark the hot query paths before and after the indexes added in
+revision c8a4f2e61d05.
+
+Builds a scratch database, loads synthetic users, companies, jobs and
+applications, then prints the query plan and mean latency of each query
+without the indexes and again after creating them.
+
+    python benchmarks/bench_indexes.py --jobs 200000 --applications 500000
+    python benchmarks/bench_indexes.py --database-url postgresql://...
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import Index, MetaData, create_engine, insert, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import db  # noqa: E402
+import models  # noqa: E402,F401  (registers every table on db.metadata)
+
+# Indexes and unique constraints under test, by table
+NEW_INDEXES = {
+    'applications': {'uq_applications_user_id_job_id', 'ix_applications_job_id'},
+    'jobs': {'ix_jobs_job_status_date_posted', 'ix_jobs_company_id_date_posted',
+             'ix_jobs_active_date_posted_id'},
+}
+
+QUERIES = {
+    'apply_for_job duplicate check':
+        'SELECT id FROM applications WHERE user_id = :user_id AND job_id = :job_id LIMIT 1',
+    'get_user_applications':
+        'SELECT * FROM applications WHERE user_id = :user_id',
+    'active jobs, first page':
+        "SELECT id FROM jobs WHERE job_status = 'active' "
+        'ORDER BY date_posted DESC, id DESC LIMIT 21',
+    'jobs of one company':
+        'SELECT id FROM jobs WHERE company_id = :company_id '
+        'ORDER BY date_posted DESC, id DESC LIMIT 21',
+}
+
+EXPLAIN = {'sqlite': 'EXPLAIN QUERY PLAN ', 'postgresql': 'EXPLAIN ', 'mysql': 'EXPLAIN '}
+
+
+def schema_without_new_indexes():
+    """Copy of the app schema with the indexes under test stripped out."""
+    metadata = MetaData()
+    for table in db.metadata.sorted_tables:
+        copy = table.to_metadata(metadata)
+        dropped = NEW_INDEXES.get(table.name, set())
+        copy.indexes = {index for index in copy.indexes if index.name not in dropped}
+        copy.constraints = {constraint for constraint in copy.constraints
+                            if constraint.name not in dropped}
+    return metadata
+
+
+def create_new_indexes(engine, metadata):
+    """Create the indexes under test, as the migration does."""
+    for table_name, names in NEW_INDEXES.items():
+        original = db.metadata.tables[table_name]
+        table = metadata.tables[table_name]
+        for index in original.indexes:
+            if index.name in names:
+                Index(index.name, *(table.c[column.name] for column in index.columns),
+                      unique=index.unique, **index.dialect_kwargs).create(engine)
+        for constraint in original.constraints:
+            if constraint.name in names:
+                Index(constraint.name, *(table.c[column.name] for column in constraint.columns),
+                      unique=True).create(engine)
+
+
+def load_data(engine, metadata, n_users, n_companies, n_jobs, n_applications, batch=10000):
+    rng = random.Random(42)
+    tables = metadata.tables
+    now = datetime.utcnow()
+
+    def chunks(rows):
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) == batch:
+                yield buffer
+                buffer = []
+        if buffer:
+            yield buffer
+
+    with engine.begin() as conn:
+        for rows in chunks({'fullname': f'User {i}', 'email': f'user{i}@example.com',
+                            'password_hash': 'x', 'role': 'job_seeker',
+                            'date_created': now} for i in range(n_users)):
+            conn.execute(insert(tables['users']), rows)
+        for rows in chunks({'company_name': f'Company {i}', 'description': '',
+                            'website_url': '', 'company_size': '10', 'industry': 'Tech',
+                            'contact_email': ''} for i in range(n_companies)):
+            conn.execute(insert(tables['companies']), rows)
+        for rows in chunks({'job_title': f'Job {i}', 'description': 'Lorem ipsum ' * 20,
+                            'job_type': 'Full-time', 'location': 'Remote',
+                            'date_posted': now - timedelta(minutes=rng.randrange(10 ** 6)),
+                            'category': 'Engineering',
+                            'company_id': rng.randrange(1, n_companies + 1),
+                            'experience_level': 'Mid',
+                            'job_status': 'active' if rng.random() < 0.3 else 'closed',
+                            'application_link': 'https://example.com'}
+                           for i in range(n_jobs)):
+            conn.execute(insert(tables['jobs']), rows)
+
+        seen = set()
+
+        def applications():
+            while len(seen) < n_applications:
+                pair = (rng.randrange(1, n_users + 1), rng.randrange(1, n_jobs + 1))
+                if pair not in seen:
+                    seen.add(pair)
+                    yield {'user_id': pair[0], 'job_id': pair[1], 'application_date': now,
+                           'status': 'applied'}
+
+        for rows in chunks(applications()):
+            conn.execute(insert(tables['applications']), rows)
+    return sorted(seen)
+
+
+def measure(engine, pairs, n_companies, repeat):
+    rng = random.Random(7)
+    dialect = engine.dialect.name
+    results = {}
+    with engine.connect() as conn:
+        for name, sql in QUERIES.items():
+            timings = []
+            for _ in range(repeat):
+                user_id, job_id = rng.choice(pairs)
+                params = {'user_id': user_id, 'job_id': job_id,
+                          'company_id': rng.randrange(1, n_companies + 1)}
+                params = {key: value for key, value in params.items() if f':{key}' in sql}
+                started = time.perf_counter()
+                conn.execute(text(sql), params).fetchall()
+                timings.append(time.perf_counter() - started)
+            plan = conn.execute(text(EXPLAIN.get(dialect, 'EXPLAIN ') + sql), params).fetchall()
+            results[name] = (statistics.mean(timings) * 1000, plan)
+    return results
+
+
+def report(label, results):
+    print(f'\n=== {label} ===')
+    for name, (mean_ms, plan) in results.items():
+        print(f'{name}: {mean_ms:.3f} ms')
+        for row in plan:
+            print('    ' + ' | '.join(str(value) for value in row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--database-url', help='Scratch database (default: temporary SQLite file)')
+    parser.add_argument('--users', type=int, default=50000)
+    parser.add_argument('--companies', type=int, default=2000)
+    parser.add_argument('--jobs', type=int, default=200000)
+    parser.add_argument('--applications', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    url = args.database_url
+    if url is None:
+        url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench_indexes.db')
+    engine = create_engine(url)
+    metadata = schema_without_new_indexes()
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    started = time.perf_counter()
+    pairs = load_data(engine, metadata, args.users, args.companies, args.jobs, args.applications)
+    print(f'Loaded {args.jobs} jobs and {args.applications} applications '
+          f'in {time.perf_counter() - started:.1f}s on {engine.dialect.name}')
+    if engine.dialect.name == 'postgresql':
+        with engine.begin() as conn:
+            conn.execute(text('ANALYZE'))
+
+    before = measure(engine, pairs, args.companies, args.repeat)
+    create_new_indexes(engine, metadata)
+    if engine.dialect.name in ('postgresql', 'sqlite'):
+        with engine.begin() as conn:
+            conn.execute(text('ANALYZE'))
+    after = measure(engine, pairs, args.companies, args.repeat)
+
+    report('Before', before)
+    report('After', after)
+    print('\n=== Speedup ===')
+    for name in QUERIES:
+        print(f'{name}: {before[name][0] / after[name][0]:.1f}x')
+    metadata.drop_all(engine)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark JSON serialization and response compression on the large list
+endpoints.
+
+Loads synthetic companies and jobs into a scratch SQLite database, then
+requests GET /api/jobs/?per_page=100 and GET /api/companies/ through the
+Flask test client with each serializer (stdlib json, orjson) and each
+content coding (identity, gzip, br), printing requests per second and
+bytes on the wire.
+
+    python benchmarks/bench_json.py --companies 2000 --jobs 5000 --repeat 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENDPOINTS = ('/api/jobs/?per_page=100', '/api/companies/')
+CODINGS = ('identity', 'gzip', 'br')
+
+
+def load_data(app, n_companies, n_jobs, batch=5000):
+    from sqlalchemy import insert
+
+    from db import db
+    from models.company import Company
+    from models.job import Job
+
+    now = datetime.utcnow()
+    with app.app_context():
+        db.session.execute(insert(Company), [
+            {'company_name': f'Company {i}', 'description': 'We build things. ' * 10,
+             'website_url': f'https://company{i}.example.com', 'company_size': '51-200',
+             'industry': 'Technology', 'contact_email': f'jobs@company{i}.example.com'}
+            for i in range(n_companies)])
+        for start in range(0, n_jobs, batch):
+            db.session.execute(insert(Job), [
+                {'job_title': f'Software Engineer {i}', 'description': 'Lorem ipsum dolor sit amet. ' * 30,
+                 'job_type': 'Full-time', 'location': 'Remote', 'category': 'Engineering',
+                 'date_posted': now - timedelta(minutes=i),
+                 'application_deadline': now + timedelta(days=30),
+                 'company_id': i % n_companies + 1, 'experience_level': 'Mid',
+                 'job_status': 'active', 'application_link': f'https://example.com/jobs/{i}'}
+                for i in range(start, min(start + batch, n_jobs))])
+        db.session.commit()
+
+
+def measure(client, headers, path, coding, repeat):
+    request_headers = dict(headers, **{'Accept-Encoding': coding})
+    response = client.get(path, headers=request_headers)
+    assert response.status_code == 200, response.status_code
+    started = time.perf_counter()
+    for _ in range(repeat):
+        client.get(path, headers=request_headers)
+    elapsed = time.perf_counter() - started
+    return repeat / elapsed, len(response.data), response.headers.get('Content-Encoding', 'identity')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--companies', type=int, default=2000)
+    parser.add_argument('--jobs', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench_json.db')
+    os.environ.setdefault('JWT_SECRET_KEY', 'bench')
+    from flask_jwt_extended import create_access_token
+
+    from app import app
+    from services.serialization import FastJSONProvider, orjson
+
+    load_data(app, args.companies, args.jobs)
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token(identity=1)}'}
+    client = app.test_client()
+
+    serializers = ['json'] + (['orjson'] if orjson is not None else [])
+    print(f'{"endpoint":<26} {"serializer":<10} {"coding":<9} {"req/s":>8} {"bytes":>10}')
+    for path in ENDPOINTS:
+        for serializer in serializers:
+            app.config['JSON_SERIALIZER'] = serializer
+            app.json = FastJSONProvider(app)
+            for coding in CODINGS:
+                rate, size, sent = measure(client, headers, path, coding, args.repeat)
+                print(f'{path:<26} {serializer:<10} {sent:<9} {rate:>8.1f} {size:>10}')
+
+
+if __name__ == '__main__':
+    main()
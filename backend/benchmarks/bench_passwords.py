@@ -0,0 +1,93 @@
+"""
+Benchmark login throughput of the password hasher in services.passwords.
+
+Runs a burst of concurrent password checks from request-like threads,
+first inline on those threads and then through the process pool, and
+reports logins per second overall and per core, together with the
+latency of a cheap request served by another thread during the burst.
+
+    python benchmarks/bench_passwords.py --logins 200 --threads 32
+    python benchmarks/bench_passwords.py --method pbkdf2:sha256:600000 --workers 4
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.passwords import DEFAULT_METHOD, HasherBusy, PasswordHasher  # noqa: E402
+
+
+def cheap_request():
+    """Stand-in for a light endpoint: a little pure-Python work."""
+    return sum(i * i for i in range(2000))
+
+
+def run(hasher, password_hash, logins, threads):
+    """Verify `logins` passwords from `threads` threads; return the measurements."""
+    done = threading.Event()
+    latencies = []
+
+    def probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            cheap_request()
+            latencies.append(time.perf_counter() - started)
+            time.sleep(0.005)
+
+    def login(_):
+        try:
+            return hasher.verify(password_hash, 'correct horse battery staple')
+        except HasherBusy:
+            return None
+
+    prober = threading.Thread(target=probe, daemon=True)
+    hasher.verify(password_hash, 'warm up')  # start the pool outside the timing
+    prober.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        results = list(executor.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    prober.join()
+
+    ok = sum(1 for result in results if result)
+    latencies.sort()
+    return {
+        'logins_per_second': ok / elapsed,
+        'rejected': sum(1 for result in results if result is None),
+        'probe_p50_ms': statistics.median(latencies) * 1000,
+        'probe_p99_ms': latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--method', action='append',
+                        help=f'Hash method to test; repeatable (default: {DEFAULT_METHOD})')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--threads', type=int, default=32, help='Concurrent request threads')
+    parser.add_argument('--logins', type=int, default=200)
+    args = parser.parse_args()
+
+    for method in args.method or [DEFAULT_METHOD]:
+        print(f'\n=== {method} ===')
+        for label, workers in (('inline', 0), (f'pool of {args.workers}', args.workers)):
+            hasher = PasswordHasher(method, workers=workers,
+                                    max_pending=args.threads, wait=60)
+            password_hash = hasher.hash('correct horse battery staple')
+            result = run(hasher, password_hash, args.logins, args.threads)
+            hasher.shutdown()
+            cores = max(1, min(workers, os.cpu_count() or 1)) if workers else 1
+            print(f'{label}: {result["logins_per_second"]:.1f} logins/s, '
+                  f'{result["logins_per_second"] / cores:.1f} per core, '
+                  f'{result["rejected"]} rejected, cheap request p50 '
+                  f'{result["probe_p50_ms"]:.2f} ms / p99 {result["probe_p99_ms"]:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark the cost of one rate limit check per storage backend.
+
+Times `take` on a spread of client keys for the in-memory and SQLite
+storages, and for Redis when a URL is given, single-threaded and from
+several threads at once.
+
+    python benchmarks/bench_rate_limit.py --checks 200000
+    python benchmarks/bench_rate_limit.py --redis-url redis://localhost:6379/0
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.rate_limit import make_storage, parse_rate  # noqa: E402
+
+
+def run(storage, checks, clients, threads, rate):
+    """Mean microseconds per check with `threads` threads sharing `checks`."""
+    per_thread = checks // threads
+
+    def worker(offset):
+        for i in range(per_thread):
+            storage.take(f'bench:ip:{(offset + i) % clients}', *rate)
+
+    workers = [threading.Thread(target=worker, args=(n * 7919,)) for n in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return (time.perf_counter() - started) / (per_thread * threads) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--checks', type=int, default=100000)
+    parser.add_argument('--clients', type=int, default=10000, help='Distinct client keys')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--rate', default='30/minute')
+    parser.add_argument('--redis-url', help='Also benchmark Redis storage at this URL')
+    args = parser.parse_args()
+
+    rate = parse_rate(args.rate)
+    urls = ['memory', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench_rate_limit.db')]
+    if args.redis_url:
+        urls.append(args.redis_url)
+    for url in urls:
+        storage = make_storage(url)
+        name = url.split(':', 1)[0]
+        single = run(storage, args.checks, args.clients, 1, rate)
+        threaded = run(storage, args.checks, args.clients, args.threads, rate)
+        print(f'{name}: {single:.2f} us/check single-threaded, '
+              f'{threaded:.2f} us/check with {args.threads} threads')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark JobRecommender build time and recommendation latency on a
+synthetic catalogue.
+
+Generates job documents from a Zipf-distributed vocabulary, builds the
+TF-IDF matrix in memory (no database), then times recommendations for
+random skill profiles and incremental upserts.
+
+    python benchmarks/bench_recommendations.py --jobs 1000000 --repeat 200
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.recommendations import JobRecommender  # noqa: E402
+
+LEVELS = ('Junior', 'Mid', 'Senior', 'Lead')
+LOCATIONS = ('Remote', 'Berlin', 'London', 'New York', 'Lagos', 'Nairobi', 'Toronto')
+
+
+def make_vocabulary(size):
+    return [f'term{i}' for i in range(size)]
+
+
+def make_job(rng, vocabulary, cum_weights, job_id, description_words):
+    words = rng.choices(vocabulary, cum_weights=cum_weights, k=description_words + 6)
+    return SimpleNamespace(
+        id=job_id, job_status='active',
+        job_title=' '.join(words[:3]), category=' '.join(words[3:5]),
+        experience_level=rng.choice(LEVELS), location=rng.choice(LOCATIONS),
+        description=' '.join(words[6:]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=200000)
+    parser.add_argument('--vocabulary', type=int, default=50000)
+    parser.add_argument('--description-words', type=int, default=80)
+    parser.add_argument('--skills', type=int, default=8, help='Terms per user profile')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(args.vocabulary)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(args.vocabulary)))
+
+    recommender = JobRecommender()
+    started = time.perf_counter()
+    recommender._build(
+        (job.id, vars(job)) for job in
+        (make_job(rng, vocabulary, cum_weights, job_id, args.description_words)
+         for job_id in range(1, args.jobs + 1)))
+    print(f'Built {len(recommender)} jobs x {len(recommender._vocabulary)} terms '
+          f'({recommender._base.nnz} non-zeros) in {time.perf_counter() - started:.1f}s')
+
+    profiles = [{'skills': ' '.join(rng.sample(vocabulary[:5000], args.skills)),
+                 'experience_level': rng.choice(LEVELS), 'location': rng.choice(LOCATIONS)}
+                for _ in range(args.repeat)]
+    timings = []
+    for profile in profiles:
+        started = time.perf_counter()
+        recommender.recommend(profile, limit=args.limit)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(f'recommend: mean {statistics.mean(timings):.2f} ms, '
+          f'p50 {timings[len(timings) // 2]:.2f} ms, p99 {timings[int(len(timings) * 0.99)]:.2f} ms')
+
+    started = time.perf_counter()
+    for job_id in range(args.jobs + 1, args.jobs + 1 + args.repeat):
+        recommender.upsert(make_job(rng, vocabulary, cum_weights, job_id, args.description_words))
+    print(f'upsert: mean {(time.perf_counter() - started) * 1000 / args.repeat:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
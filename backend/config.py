@@ -16,3 +16,47 @@ class Config:
     # jwt configuration
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=1)
+
+    # Job expiry sweeper; 0 disables the in-process scheduler
+    JOB_SWEEPER_INTERVAL = float(os.getenv('JOB_SWEEPER_INTERVAL', '0'))
+    # Closed jobs past their deadline this long are moved to jobs_archive;
+    # 0 disables archiving
+    JOB_ARCHIVE_AFTER_DAYS = int(os.getenv('JOB_ARCHIVE_AFTER_DAYS', '0'))
+
+    # 'orjson' (used when installed) or 'json' for the standard library
+    JSON_SERIALIZER = os.getenv('JSON_SERIALIZER', 'orjson')
+    # Responses smaller than this many bytes are sent uncompressed
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', '6'))
+    COMPRESS_BR_QUALITY = int(os.getenv('COMPRESS_BR_QUALITY', '4'))
+
+    # werkzeug hash method and cost for new passwords, e.g. scrypt:32768:8:1
+    # or pbkdf2:sha256:600000; older hashes are upgraded on login
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    # Worker processes for hashing; 0 hashes on the request thread
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 1)))
+    # Hashes queued or running at once before callers are turned away;
+    # 0 means four per worker
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', '0'))
+    # Seconds a request waits for a free slot before getting a 503
+    PASSWORD_HASH_WAIT = float(os.getenv('PASSWORD_HASH_WAIT', '1'))
+
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    # 'memory' (per process), 'sqlite:///<path>' (shared by the workers of a
+    # host) or 'redis://...' (shared by every host)
+    RATE_LIMIT_STORAGE = os.getenv('RATE_LIMIT_STORAGE', 'memory')
+    # Per policy: '<count>/<second|minute|hour|day>' for each client (JWT
+    # identity, else address) and for the route as a whole, and how many of
+    # its requests may run at once in one process. Empty or 0 disables.
+    RATE_LIMITS = {
+        'auth': {
+            'per_client': os.getenv('RATE_LIMIT_AUTH', '10/minute'),
+            'per_route': os.getenv('RATE_LIMIT_AUTH_ROUTE', '600/minute'),
+            'concurrency': int(os.getenv('RATE_LIMIT_AUTH_CONCURRENCY', '16')),
+        },
+        'search': {
+            'per_client': os.getenv('RATE_LIMIT_SEARCH', '30/minute'),
+            'per_route': os.getenv('RATE_LIMIT_SEARCH_ROUTE', '300/minute'),
+            'concurrency': int(os.getenv('RATE_LIMIT_SEARCH_CONCURRENCY', '32')),
+        },
+    }
@@ -2,3 +2,11 @@ from .job import Job
 from .company import Company
 from .user import User
 from .application import Application
+from .ingest_checkpoint import IngestCheckpoint
+from .job_fingerprint import JobFingerprint, JobLshBand
+from .job_facet_count import JobFacetCount
+from .job_archive import JobArchive
+from .saved_search import SavedSearch
+from .notification import Notification
+from .user_name_trigram import UserNameTrigram
+from .scheduler_lock import SchedulerLock
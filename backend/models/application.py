@@ -4,6 +4,17 @@ from datetime import datetime
 
 class Application(db.Model):
     __tablename__ = 'applications'
+    __table_args__ = (
+        # One application per user and job; also serves user_id lookups
+        db.UniqueConstraint('user_id', 'job_id',
+                            name='uq_applications_user_id_job_id'),
+        db.Index('ix_applications_job_id', 'job_id'),
+        # A user's latest applications for the dashboard
+        db.Index('ix_applications_user_id_application_date',
+                 'user_id', 'application_date', 'id'),
+    )
+    SERIALIZED_FIELDS = ('id', 'job_id', 'user_id', 'cover_letter',
+                         'application_date', 'status')
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False)
@@ -13,5 +24,15 @@ class Application(db.Model):
     # Optional if different from user's resume
     resume = db.Column(db.String(255), nullable=True)
     cover_letter = db.Column(db.Text, nullable=True)  # Optional
+    # Bumped on every write; the validator behind ETag and Last-Modified
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow,
+                           onupdate=datetime.utcnow, index=True)
 
     job = db.relationship('Job', backref=db.backref('applications', lazy=True))
+
+    def to_dict(self, fields=None):
+        return {field: getattr(self, field) for field in fields or self.SERIALIZED_FIELDS}
+
+    def save(self, db_session):
+        db_session.add(self)
+        db_session.commit()
@@ -1,8 +1,19 @@
 from db import db
+from datetime import datetime
+from models.job import Job
 
 
 class Company(db.Model):
     __tablename__ = 'companies'
+    __table_args__ = (
+        db.Index('ix_companies_industry_id', 'industry', 'id'),
+        db.Index('ix_companies_company_size_id', 'company_size', 'id'),
+    )
+
+    # Columns that GET /api/companies accepts as equality filters
+    FILTERABLE_FIELDS = ('industry', 'company_size')
+    SERIALIZED_FIELDS = ('id', 'company_name', 'description', 'website_url',
+                         'company_size', 'industry', 'contact_email')
     id = db.Column(db.Integer, primary_key=True)
     company_name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
@@ -11,19 +22,24 @@ class Company(db.Model):
     industry = db.Column(db.String(100), nullable=False)
     logo = db.Column(db.String(255), nullable=True)  # Optional logo URL
     contact_email = db.Column(db.String(100), nullable=False)
+    # Bumped on every write; the validator behind ETag and Last-Modified
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow,
+                           onupdate=datetime.utcnow, index=True)
 
     jobs = db.relationship('Job', lazy=True)
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'company_name': self.company_name,
-            'description': self.description,
-            'website_url': self.website_url,
-            'company_size': self.company_size,
-            'industry': self.industry,
-            'contact_email': self.contact_email
-        }
+    def to_dict(self, fields=None):
+        return {field: getattr(self, field) for field in fields or self.SERIALIZED_FIELDS}
+
+    @classmethod
+    def open_job_counts(cls, db_session, company_ids):
+        """Active job count per company id, for many companies in one GROUP BY query."""
+        if not company_ids:
+            return {}
+        counts = dict(db_session.query(Job.company_id, db.func.count(Job.id))
+                      .filter(Job.company_id.in_(company_ids), Job.job_status == 'active')
+                      .group_by(Job.company_id))
+        return {company_id: counts.get(company_id, 0) for company_id in company_ids}
 
     def save(self, db_session):
         db_session.add(self)
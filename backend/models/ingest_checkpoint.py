@@ -0,0 +1,32 @@
+from db import db
+from datetime import datetime
+
+
+class IngestCheckpoint(db.Model):
+    """Progress of the ingestion worker for one provider and query."""
+    __tablename__ = 'ingest_checkpoints'
+    id = db.Column(db.Integer, primary_key=True)
+    provider = db.Column(db.String(50), nullable=False)
+    search_query = db.Column(db.String(255), nullable=False)
+    # Next provider page to fetch; reset to 1 once a run completes
+    next_page = db.Column(db.Integer, nullable=False, default=1)
+    jobs_ingested = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.UniqueConstraint('provider', 'search_query',
+                            name='uq_ingest_checkpoints_provider_query'),
+    )
+
+    @classmethod
+    def get_or_create(cls, db_session, provider, query):
+        """Return the checkpoint for (provider, search query), creating it if needed."""
+        checkpoint = db_session.query(cls).filter_by(
+            provider=provider, search_query=query).first()
+        if checkpoint is None:
+            checkpoint = cls(provider=provider, search_query=query,
+                             next_page=1, jobs_ingested=0)
+            db_session.add(checkpoint)
+            db_session.commit()
+        return checkpoint
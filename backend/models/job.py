@@ -1,15 +1,40 @@
 from db import db
 from datetime import datetime
+from sqlalchemy import text, tuple_
 
 
 class Job(db.Model):
     __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_date_posted_id', 'date_posted', 'id'),
+        db.Index('ix_jobs_job_status_date_posted', 'job_status', 'date_posted', 'id'),
+        db.Index('ix_jobs_company_id_date_posted', 'company_id', 'date_posted', 'id'),
+        # Lets per-company open job counts be answered from the index alone
+        db.Index('ix_jobs_company_id_job_status', 'company_id', 'job_status'),
+        db.Index('ix_jobs_job_status_application_deadline',
+                 'job_status', 'application_deadline'),
+        # Partial on PostgreSQL and SQLite; the migration skips it elsewhere
+        db.Index('ix_jobs_active_date_posted_id', 'date_posted', 'id',
+                 postgresql_where=text("job_status = 'active'"),
+                 sqlite_where=text("job_status = 'active'")),
+        db.Index('ix_jobs_is_remote_utc_offset', 'is_remote', 'utc_offset'),
+        db.UniqueConstraint('source', 'source_id',
+                            name='uq_jobs_source_source_id'),
+    )
+
+    # Columns that GET /api/jobs accepts as equality filters
+    FILTERABLE_FIELDS = ('job_type', 'category', 'location',
+                         'experience_level', 'company_id', 'job_status')
+    # Keys of to_dict(), in output order; ?fields= may select any subset
+    SERIALIZED_FIELDS = ('id', 'job_title', 'description', 'job_type', 'location',
+                         'date_posted', 'application_deadline', 'category', 'company_id',
+                         'experience_level', 'job_status', 'application_link')
     id = db.Column(db.Integer, primary_key=True)
     job_title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
     job_type = db.Column(db.String(50), nullable=False)
     location = db.Column(db.String(100), default="Remote")
-    date_posted = db.Column(db.DateTime, default=datetime.utcnow)
+    date_posted = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     application_deadline = db.Column(db.DateTime, nullable=True)
     category = db.Column(db.String(100), nullable=False)
     company_id = db.Column(db.Integer, db.ForeignKey(
@@ -17,24 +42,26 @@ class Job(db.Model):
     experience_level = db.Column(db.String(50), nullable=False)
     job_status = db.Column(db.String(20), default='active')
     application_link = db.Column(db.String(255), nullable=False)
+    # Set for listings ingested from an external provider
+    source = db.Column(db.String(50), nullable=True)
+    source_id = db.Column(db.String(255), nullable=True)
+    # Set on near-duplicates to the listing they were collapsed into
+    canonical_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=True)
+    # Normalized from `location` against the bundled gazetteer (services.locations)
+    place_id = db.Column(db.String(64), nullable=True, index=True)
+    country_code = db.Column(db.String(2), nullable=True, index=True)
+    # Standard offset from UTC in minutes of the place or country
+    utc_offset = db.Column(db.Integer, nullable=True)
+    is_remote = db.Column(db.Boolean, nullable=False, default=False)
+    # Bumped on every write; the validator behind ETag and Last-Modified
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow,
+                           onupdate=datetime.utcnow, index=True)
 
     company = db.relationship('Company', back_populates='jobs', lazy=True)
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'job_title': self.job_title,
-            'description': self.description,
-            'job_type': self.job_type,
-            'location': self.location,
-            'date_posted': self.date_posted,
-            'application_deadline': self.application_deadline,
-            'category': self.category,
-            'company_id': self.company_id,
-            'experience_level': self.experience_level,
-            'job_status': self.job_status,
-            'application_link': self.application_link
-        }
+    def to_dict(self, fields=None):
+        """Serialize the job, restricted to `fields` when given."""
+        return {field: getattr(self, field) for field in fields or self.SERIALIZED_FIELDS}
 
     def save(self, db_session):
         """Add and commit the current instance to the database."""
@@ -56,3 +83,27 @@ class Job(db.Model):
     def find_by_id(cls, db_session, job_id):
         """Find a job by its ID."""
         return db_session.query(cls).filter_by(id=job_id).first()
+
+    @classmethod
+    def filter_by_fields(cls, db_session, **filters):
+        """Build a query matching every non-empty filter in FILTERABLE_FIELDS."""
+        query = db_session.query(cls)
+        for key, value in filters.items():
+            if key in cls.FILTERABLE_FIELDS and value not in (None, ''):
+                query = query.filter(getattr(cls, key) == value)
+        return query
+
+    @classmethod
+    def keyset_page(cls, query, after=None, per_page=20):
+        """
+        Fetch one page of jobs, newest first, strictly after the
+        (date_posted, id) key of the previous page's last row.
+
+        Seeking on the indexed sort key instead of using OFFSET keeps
+        every page as cheap as the first one. One extra row is read so
+        the caller can tell whether a next page exists.
+        """
+        if after is not None:
+            query = query.filter(tuple_(cls.date_posted, cls.id) < tuple_(*after))
+        return query.order_by(cls.date_posted.desc(), cls.id.desc()) \
+            .limit(per_page + 1).all()
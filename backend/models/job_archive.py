@@ -0,0 +1,26 @@
+from db import db
+from datetime import datetime
+
+
+class JobArchive(db.Model):
+    """
+    Jobs moved out of the hot `jobs` table once they have been closed for
+    a while. Rows keep their original id; company_id is not a foreign key
+    so companies can still be deleted.
+    """
+    __tablename__ = 'jobs_archive'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    job_title = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    job_type = db.Column(db.String(50), nullable=False)
+    location = db.Column(db.String(100))
+    date_posted = db.Column(db.DateTime)
+    application_deadline = db.Column(db.DateTime, nullable=True)
+    category = db.Column(db.String(100), nullable=False)
+    company_id = db.Column(db.Integer, nullable=False, index=True)
+    experience_level = db.Column(db.String(50), nullable=False)
+    job_status = db.Column(db.String(20))
+    application_link = db.Column(db.String(255), nullable=False)
+    source = db.Column(db.String(50), nullable=True)
+    source_id = db.Column(db.String(255), nullable=True)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
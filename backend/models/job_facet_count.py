@@ -0,0 +1,21 @@
+from db import db
+
+
+class JobFacetCount(db.Model):
+    """
+    Number of active jobs for one combination of facet values. The table
+    holds one row per distinct combination, not per job, and is kept
+    current by services.facets.
+    """
+    __tablename__ = 'job_facet_counts'
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)
+    category = db.Column(db.String(100), nullable=False)
+    location = db.Column(db.String(100), nullable=False)
+    experience_level = db.Column(db.String(50), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('job_type', 'category', 'location', 'experience_level',
+                            name='uq_job_facet_counts_values'),
+    )
@@ -0,0 +1,25 @@
+from db import db
+
+
+class JobFingerprint(db.Model):
+    """MinHash signature of a job's title, description and company."""
+    __tablename__ = 'job_fingerprints'
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), primary_key=True)
+    signature = db.Column(db.LargeBinary, nullable=False)
+
+
+class JobLshBand(db.Model):
+    """
+    One LSH band bucket of a canonical job's signature. Jobs sharing any
+    (band, bucket) pair are near-duplicate candidates.
+    """
+    __tablename__ = 'job_lsh_bands'
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False, index=True)
+    band = db.Column(db.SmallInteger, nullable=False)
+    bucket = db.Column(db.BigInteger, nullable=False)
+
+    __table_args__ = (
+        # Bucket first: lookups filter on bucket IN (...) across all bands
+        db.Index('ix_job_lsh_bands_bucket_band', 'bucket', 'band'),
+    )
@@ -0,0 +1,33 @@
+from db import db
+from datetime import datetime
+
+
+class Notification(db.Model):
+    """
+    One job matched by one saved search; doubles as an outbox that a
+    mailer or push worker can drain by `delivered_at`.
+    """
+    __tablename__ = 'notifications'
+    __table_args__ = (
+        # A job is announced at most once per saved search
+        db.UniqueConstraint('saved_search_id', 'job_id',
+                            name='uq_notifications_saved_search_id_job_id'),
+        db.Index('ix_notifications_user_id_id', 'user_id', 'id'),
+        db.Index('ix_notifications_job_id', 'job_id'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    saved_search_id = db.Column(db.Integer, db.ForeignKey('saved_searches.id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    read_at = db.Column(db.DateTime, nullable=True)
+    delivered_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'saved_search_id': self.saved_search_id,
+            'job_id': self.job_id,
+            'created_at': self.created_at,
+            'read_at': self.read_at
+        }
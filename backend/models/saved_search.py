@@ -0,0 +1,46 @@
+from db import db
+from datetime import datetime
+
+
+class SavedSearch(db.Model):
+    """
+    A job seeker's stored search. New and updated jobs are matched against
+    every saved search by services.alerts, which writes a Notification for
+    each match.
+    """
+    __tablename__ = 'saved_searches'
+
+    # Equality filters a saved search may set, matched against Job columns
+    FILTER_FIELDS = ('job_type', 'category', 'location', 'experience_level', 'company_id')
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    # Every keyword must appear in the job's title, category or description
+    keywords = db.Column(db.String(255), nullable=True)
+    job_type = db.Column(db.String(50), nullable=True)
+    category = db.Column(db.String(100), nullable=True)
+    location = db.Column(db.String(100), nullable=True)
+    experience_level = db.Column(db.String(50), nullable=True)
+    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'keywords': self.keywords,
+            'job_type': self.job_type,
+            'category': self.category,
+            'location': self.location,
+            'experience_level': self.experience_level,
+            'company_id': self.company_id,
+            'created_at': self.created_at
+        }
+
+    def save(self, db_session):
+        db_session.add(self)
+        db_session.commit()
+
+    def delete(self, db_session):
+        db_session.delete(self)
+        db_session.commit()
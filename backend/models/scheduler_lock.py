@@ -0,0 +1,47 @@
+from db import db
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+
+
+class SchedulerLock(db.Model):
+    """
+    A named lease on a periodic task, so that only one of the processes
+    running it does the work. The holder renews it on every run; once it
+    expires any other process may take it over.
+    """
+    __tablename__ = 'scheduler_locks'
+    name = db.Column(db.String(50), primary_key=True)
+    owner = db.Column(db.String(255), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    @classmethod
+    def acquire(cls, db_session, name, owner, ttl):
+        """
+        Take or renew the lease `name` for `ttl` seconds; returns whether
+        `owner` holds it. Commits.
+        """
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=ttl)
+        renewed = db_session.query(cls) \
+            .filter(cls.name == name, or_(cls.owner == owner, cls.expires_at < now)) \
+            .update({cls.owner: owner, cls.expires_at: expires_at}, synchronize_session=False)
+        if not renewed:
+            if db_session.query(cls.name).filter(cls.name == name).first():
+                db_session.rollback()
+                return False
+            db_session.add(cls(name=name, owner=owner, expires_at=expires_at))
+        try:
+            db_session.commit()
+        except IntegrityError:
+            # Another process created the lease first
+            db_session.rollback()
+            return False
+        return True
+
+    @classmethod
+    def release(cls, db_session, name, owner):
+        """Give up the lease `name` if `owner` holds it. Commits."""
+        db_session.query(cls).filter(cls.name == name, cls.owner == owner) \
+            .delete(synchronize_session=False)
+        db_session.commit()
@@ -48,10 +48,6 @@ class User(db.Model):
         """
         return db.query(cls).filter_by(email=email).first()
 
-    @classmethod
-    def filter_by_fullname(cls, db_session, fullname):
-        return db_session.query(cls).filter(cls.fullname.ilike(f"%{fullname}%"))
-
     @classmethod
     def find_by_id(cls, db: Session, user_id: int):
         """
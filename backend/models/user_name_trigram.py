@@ -0,0 +1,11 @@
+from db import db
+
+
+class UserNameTrigram(db.Model):
+    """
+    One trigram of a user's normalized full name. The primary key doubles
+    as the (trigram, user_id) index that name searches seek on.
+    """
+    __tablename__ = 'user_name_trigrams'
+    trigram = db.Column(db.String(3), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True, index=True)
@@ -1,10 +1,14 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import current_user, jwt_required
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from db import get_db
 from models.application import Application
 from models.job import Job
 from models.user import User
+from services import dashboard
+from services.conditional import conditional_response, make_etag
+from services.fields import InvalidFields, parse_fields, project
 from datetime import datetime
 from flasgger import swag_from
 
@@ -53,7 +57,7 @@ application_router = Blueprint('application', __name__)
 })
 def apply_for_job():
     db: Session = get_db()
-    user_id = get_jwt_identity()  # Get the current user's ID
+    user_id = current_user.id  # Get the current user's ID
     application_data = request.json
 
     if not application_data or 'job_id' not in application_data:
@@ -76,7 +80,13 @@ def apply_for_job():
         status='submitted'
     )
 
-    new_application.save(db)
+    try:
+        new_application.save(db)
+    except IntegrityError:
+        # A concurrent request for the same job won the unique constraint
+        db.rollback()
+        return jsonify({'error': 'You have already applied for this job'}), 400
+    dashboard.invalidate(user_id)
     return jsonify(new_application.to_dict()), 201
 
 
@@ -93,6 +103,13 @@ def apply_for_job():
             'type': 'integer',
             'required': True,
             'description': 'The ID of the application to retrieve.'
+        },
+        {
+            'name': 'fields',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Comma-separated application fields to return, e.g. job_id,status. Defaults to all fields.'
         }
     ],
     'responses': {
@@ -110,17 +127,24 @@ def apply_for_job():
                 }
             }
         },
-        '404': {'description': 'Application not found'}
+        '404': {'description': 'Application not found'},
+        '400': {'description': 'Unknown field'}
     }
 })
 def get_application(application_id: int):
     db: Session = get_db()
-    application = Application.query.get(application_id)
+    try:
+        fields = parse_fields(request.args.get('fields'), Application)
+    except InvalidFields as err:
+        return jsonify({'error': str(err)}), 400
+
+    application = project(db.query(Application), Application, fields) \
+        .filter(Application.id == application_id).first()
 
     if not application:
         return jsonify({'error': 'Application not found'}), 404
 
-    return jsonify(application.to_dict()), 200
+    return jsonify(application.to_dict(fields)), 200
 
 
 @application_router.route('/user_applications', methods=['GET'])
@@ -129,6 +153,15 @@ def get_application(application_id: int):
     'tags': ['Applications'],
     'summary': 'Get all applications for the current user',
     'description': 'Retrieve a list of all job applications made by the current user.',
+    'parameters': [
+        {
+            'name': 'fields',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Comma-separated application fields to return, e.g. job_id,status,application_date. Defaults to all fields.'
+        }
+    ],
     'responses': {
         '200': {
             'description': 'List of applications',
@@ -146,15 +179,29 @@ def get_application(application_id: int):
                     }
                 }
             }
-        }
+        },
+        '304': {'description': 'Not modified; the ETag matched If-None-Match'},
+        '400': {'description': 'Unknown field'}
     }
 })
 def get_user_applications():
     db: Session = get_db()
-    user_id = get_jwt_identity()  # Get the current user's ID
-    applications = Application.query.filter_by(user_id=user_id).all()
+    user_id = current_user.id  # Get the current user's ID
+    try:
+        fields = parse_fields(request.args.get('fields'), Application)
+    except InvalidFields as err:
+        return jsonify({'error': str(err)}), 400
+
+    versions = db.query(Application.id, Application.updated_at) \
+        .filter_by(user_id=user_id).order_by(Application.id).all()
+    etag = make_etag('applications', user_id, fields, [tuple(version) for version in versions])
+
+    def build():
+        applications = project(db.query(Application), Application, fields) \
+            .filter_by(user_id=user_id).order_by(Application.id)
+        return jsonify([application.to_dict(fields) for application in applications])
 
-    return jsonify([application.to_dict() for application in applications]), 200
+    return conditional_response(etag, None, build)
 
 
 @application_router.route('/<int:application_id>', methods=['DELETE'])
@@ -194,5 +241,6 @@ def withdraw_application(application_id: int):
 
     application.status = 'withdrawn'
     application.save(db)
+    dashboard.invalidate(application.user_id)
 
     return jsonify({'message': 'Application withdrawn successfully'}), 200
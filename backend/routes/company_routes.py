@@ -1,8 +1,13 @@
+from datetime import datetime
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from sqlalchemy.orm import Session
 from db import get_db
 from models.company import Company
+from services import company_profile
+from services.conditional import conditional_response, make_etag
+from services.fields import InvalidFields, parse_fields, project
+from services.pagination import InvalidCursor, clamp_per_page, decode_cursor, encode_cursor
 from flasgger import swag_from
 
 company_router = Blueprint('company', __name__)
@@ -75,33 +80,110 @@ def create_company():
 @company_router.route('/', methods=['GET'])
 @swag_from({
     'tags': ['Companies'],
-    'summary': 'Get all companies',
-    'description': 'Retrieve a list of all registered companies.',
+    'summary': 'Get companies',
+    'description': 'Retrieve one page of companies in id order, each with its number of open '
+                   'jobs, optionally filtered by industry and company size. Pass the returned '
+                   'next_cursor to fetch the following page.',
+    'parameters': [
+        {'name': 'industry', 'in': 'query', 'type': 'string', 'required': False},
+        {'name': 'company_size', 'in': 'query', 'type': 'string', 'required': False},
+        {
+            'name': 'cursor',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Opaque cursor from the previous page.'
+        },
+        {
+            'name': 'per_page',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'default': 20,
+            'description': 'Page size (max 100).'
+        },
+        {
+            'name': 'fields',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Comma-separated company fields to return, e.g. company_name,industry. Defaults to all fields.'
+        }
+    ],
     'responses': {
         '200': {
-            'description': 'A list of companies',
+            'description': 'A page of companies',
             'schema': {
-                'type': 'array',
-                'items': {
-                    'type': 'object',
-                    'properties': {
-                        'id': {'type': 'integer'},
-                        'company_name': {'type': 'string'},
-                        'description': {'type': 'string'},
-                        'website_url': {'type': 'string'},
-                        'company_size': {'type': 'string'},
-                        'industry': {'type': 'string'},
-                        'contact_email': {'type': 'string'}
-                    }
+                'type': 'object',
+                'properties': {
+                    'items': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'id': {'type': 'integer'},
+                                'company_name': {'type': 'string'},
+                                'description': {'type': 'string'},
+                                'website_url': {'type': 'string'},
+                                'company_size': {'type': 'string'},
+                                'industry': {'type': 'string'},
+                                'contact_email': {'type': 'string'},
+                                'open_job_count': {'type': 'integer'}
+                            }
+                        }
+                    },
+                    'next_cursor': {'type': 'string'},
+                    'per_page': {'type': 'integer'}
                 }
             }
-        }
+        },
+        '304': {'description': 'Not modified; the ETag matched If-None-Match'},
+        '400': {'description': 'Invalid cursor or unknown field'}
     }
 })
 def get_companies():
     db: Session = get_db()
-    companies = Company.query.all()
-    return jsonify([company.to_dict() for company in companies]), 200
+    per_page = clamp_per_page(request.args.get('per_page', type=int))
+    try:
+        fields = parse_fields(request.args.get('fields'), Company)
+    except InvalidFields as err:
+        return jsonify({'error': str(err)}), 400
+
+    query = db.query(Company)
+    for key in Company.FILTERABLE_FIELDS:
+        value = request.args.get(key)
+        if value:
+            query = query.filter(getattr(Company, key) == value)
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            (after,) = decode_cursor(cursor, int)
+        except InvalidCursor:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        query = query.filter(Company.id > after)
+    query = query.order_by(Company.id)
+
+    versions = query.with_entities(Company.id, Company.updated_at).limit(per_page + 1).all()
+    next_cursor = None
+    if len(versions) > per_page:
+        versions = versions[:per_page]
+        next_cursor = encode_cursor(versions[-1].id)
+    # One GROUP BY for the whole page instead of a lazy load per company
+    counts = Company.open_job_counts(db, [version.id for version in versions])
+    etag = make_etag('companies', per_page, fields,
+                     [tuple(version) for version in versions], sorted(counts.items()))
+
+    def build():
+        companies = project(db.query(Company), Company, fields) \
+            .filter(Company.id.in_(counts)).order_by(Company.id).all() if counts else []
+        items = []
+        for company in companies:
+            item = company.to_dict(fields)
+            item['open_job_count'] = counts.get(company.id, 0)
+            items.append(item)
+        return jsonify({'items': items, 'next_cursor': next_cursor, 'per_page': per_page})
+
+    return conditional_response(etag, None, build)
 
 
 @company_router.route('/<int:company_id>', methods=['GET'])
@@ -116,6 +198,13 @@ def get_companies():
             'type': 'integer',
             'required': True,
             'description': 'The ID of the company to retrieve.'
+        },
+        {
+            'name': 'fields',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Comma-separated company fields to return, e.g. company_name,website_url. Defaults to all fields.'
         }
     ],
     'responses': {
@@ -134,15 +223,106 @@ def get_companies():
                 }
             }
         },
-        '404': {'description': 'Company not found'}
+        '404': {'description': 'Company not found'},
+        '304': {'description': 'Not modified; the ETag or If-Modified-Since date matched'},
+        '400': {'description': 'Unknown field'}
     }
 })
 def get_company(company_id: int):
     db: Session = get_db()
-    company = Company.query.get(company_id)
-    if not company:
+    try:
+        fields = parse_fields(request.args.get('fields'), Company)
+    except InvalidFields as err:
+        return jsonify({'error': str(err)}), 400
+
+    version = db.query(Company.updated_at).filter(Company.id == company_id).first()
+    if not version:
         return jsonify({'error': 'Company not found'}), 404
-    return jsonify(company.to_dict()), 200
+    return conditional_response(
+        make_etag('company', company_id, version.updated_at, fields), version.updated_at,
+        lambda: jsonify(project(db.query(Company), Company, fields)
+                        .filter(Company.id == company_id).one().to_dict(fields)))
+
+
+@company_router.route('/<int:company_id>/profile', methods=['GET'])
+@swag_from({
+    'tags': ['Companies'],
+    'summary': 'Get a company profile',
+    'description': 'Retrieve a company together with one page of its active jobs, newest first, '
+                   'and summary statistics of its listings. Pass jobs.next_cursor to fetch the '
+                   'following page of jobs.',
+    'parameters': [
+        {
+            'name': 'company_id',
+            'in': 'path',
+            'type': 'integer',
+            'required': True,
+            'description': 'The ID of the company to retrieve.'
+        },
+        {
+            'name': 'cursor',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Opaque cursor from the previous page of jobs.'
+        },
+        {
+            'name': 'per_page',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'default': 20,
+            'description': 'Jobs per page (max 100).'
+        }
+    ],
+    'responses': {
+        '200': {
+            'description': 'Company profile',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'company': {'type': 'object'},
+                    'jobs': {
+                        'type': 'object',
+                        'properties': {
+                            'items': {'type': 'array', 'items': {'type': 'object'}},
+                            'next_cursor': {'type': 'string'},
+                            'per_page': {'type': 'integer'}
+                        }
+                    },
+                    'stats': {
+                        'type': 'object',
+                        'properties': {
+                            'open_jobs': {'type': 'integer'},
+                            'total_jobs': {'type': 'integer'},
+                            'jobs_by_status': {'type': 'object'},
+                            'open_jobs_by_type': {'type': 'object'},
+                            'open_jobs_by_experience_level': {'type': 'object'},
+                            'latest_posted_at': {'type': 'string', 'format': 'date-time'}
+                        }
+                    }
+                }
+            }
+        },
+        '400': {'description': 'Invalid cursor'},
+        '404': {'description': 'Company not found'}
+    }
+})
+def get_company_profile(company_id: int):
+    db: Session = get_db()
+    per_page = clamp_per_page(request.args.get('per_page', type=int))
+    after = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            after = decode_cursor(cursor, datetime, int)
+        except InvalidCursor:
+            return jsonify({'error': 'Invalid cursor'}), 400
+
+    profile = company_profile.get_profile(db, company_id, after, per_page)
+    if profile is None:
+        return jsonify({'error': 'Company not found'}), 404
+    return jsonify(profile)
 
 
 @company_router.route('/<int:company_id>', methods=['PUT'])
@@ -206,6 +386,7 @@ def update_company(company_id: int):
         setattr(company, key, value)
 
     company.save(db)
+    company_profile.invalidate(company_id)
     return jsonify(company.to_dict()), 200
 
 
@@ -236,4 +417,5 @@ def delete_company(company_id: int):
         return jsonify({'error': 'Company not found'}), 404
 
     company.delete(db)
+    company_profile.invalidate(company_id)
     return 'message: Company deleted successfully', 204
@@ -0,0 +1,88 @@
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import current_user, jwt_required
+from sqlalchemy.orm import Session
+from db import get_db
+from services.export import ADMIN_ROLE, EXPORTS, csv_lines, iter_rows, ndjson_lines
+from flasgger import swag_from
+
+export_router = Blueprint('export', __name__)
+
+FORMATS = {
+    'ndjson': ('application/x-ndjson', ndjson_lines),
+    'csv': ('text/csv', csv_lines),
+}
+
+
+@export_router.route('/<resource>', methods=['GET'])
+@jwt_required()
+@swag_from({
+    'tags': ['Export'],
+    'summary': 'Stream a full export of a table',
+    'description': 'Stream jobs, companies or applications as NDJSON or CSV. Only public '
+                   'columns are exported, and applications are limited to the caller\'s own '
+                   'unless they are an admin. Rows are fetched in chunks from a server-side '
+                   'cursor, so memory use is constant and the first bytes are sent immediately.',
+    'produces': ['application/x-ndjson', 'text/csv'],
+    'parameters': [
+        {
+            'name': 'resource',
+            'in': 'path',
+            'type': 'string',
+            'enum': ['jobs', 'companies', 'applications'],
+            'required': True,
+            'description': 'The table to export.'
+        },
+        {
+            'name': 'format',
+            'in': 'query',
+            'type': 'string',
+            'enum': ['ndjson', 'csv'],
+            'required': False,
+            'default': 'ndjson',
+            'description': 'Output format.'
+        },
+        {
+            'name': 'since',
+            'in': 'query',
+            'type': 'string',
+            'format': 'date-time',
+            'required': False,
+            'description': 'Only export rows created or updated at or after this ISO 8601 time.'
+        }
+    ],
+    'responses': {
+        '200': {'description': 'The exported rows'},
+        '400': {'description': 'Unknown format or invalid since'},
+        '404': {'description': 'Unknown resource'}
+    }
+})
+def export_resource(resource: str):
+    db: Session = get_db()
+    if resource not in EXPORTS:
+        return jsonify({'error': 'Unknown export resource'}), 404
+    model, columns, since_column, owner_column = EXPORTS[resource]
+
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in FORMATS:
+        return jsonify({'error': 'Unknown export format'}), 400
+    mimetype, encode = FORMATS[export_format]
+
+    since = request.args.get('since')
+    if since:
+        if since_column is None:
+            return jsonify({'error': f'{resource} cannot be filtered by since'}), 400
+        try:
+            since = datetime.fromisoformat(since)
+        except ValueError:
+            return jsonify({'error': 'since must be an ISO 8601 datetime'}), 400
+
+    criteria = []
+    if since:
+        criteria.append(since_column >= since)
+    if owner_column is not None and current_user.role != ADMIN_ROLE:
+        criteria.append(owner_column == current_user.id)
+    rows = iter_rows(db, model, columns, *criteria)
+    response = Response(stream_with_context(encode(columns, rows)), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={resource}.{export_format}'
+    return response
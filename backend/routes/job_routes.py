@@ -1,10 +1,24 @@
-from flask import Blueprint, request, jsonify
+import asyncio
+import json
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required
 from sqlalchemy.orm import Session
 from db import get_db
 from models.job import Job
 from datetime import datetime
-from services.job_service import search_jobs
+from services.job_service import search_cache, search_jobs
+from services.job_providers import aggregate_search
+from services.search_index import job_index
+from services.recommendations import job_recommender
+from services import alerts, company_profile, dedup, facets
+from services.locations import InvalidLocationFilter, apply_location, filter_by_location
+from services.job_import import import_jobs
+from services.rate_limit import limiter
+from services.streaming import StreamFormatError, iter_json_records
+from services.conditional import conditional_response, make_etag
+from services.fields import InvalidFields, parse_fields, project
+from services.pagination import (
+    InvalidCursor, clamp_per_page, decode_cursor, encode_cursor)
 from flasgger import swag_from
 
 job_router = Blueprint('job', __name__)
@@ -22,6 +36,23 @@ job_router = Blueprint('job', __name__)
             'type': 'string',
             'required': True,
             'description': 'The search query for job listings.'
+        },
+        {
+            'name': 'source',
+            'in': 'query',
+            'type': 'string',
+            'enum': ['external', 'local', 'aggregate'],
+            'required': False,
+            'default': 'external',
+            'description': 'Search the external job API, the jobs hosted in our own database, or all configured providers at once.'
+        },
+        {
+            'name': 'limit',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'default': 20,
+            'description': 'Maximum number of local results (max 100).'
         }
     ],
     'responses': {
@@ -41,15 +72,25 @@ job_router = Blueprint('job', __name__)
                 }
             }
         },
-        '400': {'description': 'Missing query parameter'},
+        '400': {'description': 'Missing query parameter or unknown source'},
+        '429': {'description': 'Rate limit or concurrency cap exceeded; retry after the Retry-After delay'},
         '500': {'description': 'Failed to fetch job listings'}
     }
 })
+@limiter.limit('search')
 def search_job():
     query = request.args.get('q', '')
     if not query:
         return jsonify({'error': 'Missing query parameter'}), 400
 
+    source = request.args.get('source', 'external')
+    if source == 'local':
+        return search_local_jobs(query)
+    if source == 'aggregate':
+        return jsonify(asyncio.run(aggregate_search(query))), 200
+    if source != 'external':
+        return jsonify({'error': 'Unknown search source'}), 400
+
     jobs = search_jobs(query)
     if jobs is None:
         return jsonify({'error': 'Failed to fetch job listings'}), 500
@@ -57,6 +98,58 @@ def search_job():
     return jsonify(jobs), 200
 
 
+@job_router.route('/search/stats', methods=['GET'])
+@swag_from({
+    'tags': ['Jobs'],
+    'summary': 'External search cache statistics',
+    'description': 'Hit, miss, refresh and eviction counters for the external job search cache.',
+    'responses': {
+        '200': {
+            'description': 'Cache counters',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'hits': {'type': 'integer'},
+                    'stale_hits': {'type': 'integer'},
+                    'misses': {'type': 'integer'},
+                    'coalesced': {'type': 'integer'},
+                    'refreshes': {'type': 'integer'},
+                    'refresh_failures': {'type': 'integer'},
+                    'evictions': {'type': 'integer'},
+                    'size': {'type': 'integer'},
+                    'maxsize': {'type': 'integer'}
+                }
+            }
+        }
+    }
+})
+def search_cache_stats():
+    return jsonify(search_cache.stats()), 200
+
+
+def search_local_jobs(query):
+    """Rank our own active jobs against `query` using the in-memory index."""
+    db: Session = get_db()
+    limit = clamp_per_page(request.args.get('limit', type=int))
+
+    job_index.ensure_built(db)
+    ranked = job_index.search(query, limit=limit)
+    if not ranked:
+        return jsonify([]), 200
+
+    # The index of this process may lag jobs closed by another process
+    jobs = {job.id: job for job in
+            db.query(Job).filter(Job.id.in_([job_id for job_id, _ in ranked]),
+                                 Job.job_status == 'active')}
+    results = []
+    for job_id, score in ranked:
+        if job_id in jobs:
+            job_dict = jobs[job_id].to_dict()
+            job_dict['score'] = round(score, 4)
+            results.append(job_dict)
+    return jsonify(results), 200
+
+
 @job_router.route('/', methods=['POST'])
 @jwt_required()
 @swag_from({
@@ -104,7 +197,8 @@ def search_job():
                 }
             }
         },
-        '400': {'description': 'Missing required fields'}
+        '400': {'description': 'Missing required fields'},
+        '409': {'description': 'Near-duplicate of an existing job; canonical_id identifies it'}
     }
 })
 def create_job():
@@ -127,45 +221,260 @@ def create_job():
         job_status='active',
         application_link=job_data['application_link']
     )
+    apply_location(new_job)
+
+    signature = dedup.job_signature(db, new_job)
+    canonical_id = dedup.find_duplicate(db, signature)
+    if canonical_id is not None:
+        return jsonify({'error': 'Duplicate of an existing job', 'canonical_id': canonical_id}), 409
 
+    db.add(new_job)
+    db.flush()
+    dedup.register(db, new_job.id, signature)
+    facets.adjust(db, facets.facet_key(new_job), 1)
     new_job.save(db)
+    job_index.upsert(new_job)
+    job_recommender.upsert(new_job)
+    company_profile.invalidate(new_job.company_id)
+    alerts.notify_matches(db, [new_job])
     return jsonify(new_job.to_dict()), 201
 
 
-@job_router.route('/', methods=['GET'])
+@job_router.route('/bulk', methods=['POST'])
 @jwt_required()
 @swag_from({
     'tags': ['Jobs'],
-    'summary': 'Get all jobs',
-    'description': 'Retrieve a list of all job postings for authenticated users.',
-    'responses': {
-        '200': {
-            'description': 'A list of jobs',
+    'summary': 'Create jobs in bulk',
+    'description': 'Stream many jobs as NDJSON (one job object per line) or as a JSON array. '
+                   'Rows are validated as they are read and inserted in batches; the response '
+                   'streams one NDJSON result line per row followed by a summary line.',
+    'consumes': ['application/x-ndjson', 'application/json'],
+    'produces': ['application/x-ndjson'],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
             'schema': {
                 'type': 'array',
                 'items': {
                     'type': 'object',
                     'properties': {
-                        'id': {'type': 'integer'},
                         'job_title': {'type': 'string'},
                         'description': {'type': 'string'},
                         'job_type': {'type': 'string'},
-                        'location': {'type': 'string'},
-                        'application_deadline': {'type': 'string', 'format': 'date'},
                         'category': {'type': 'string'},
                         'company_id': {'type': 'integer'},
                         'experience_level': {'type': 'string'},
-                        'job_status': {'type': 'string'}
+                        'application_link': {'type': 'string'},
+                        'location': {'type': 'string'},
+                        'application_deadline': {'type': 'string', 'format': 'date'}
+                    },
+                    'required': ['job_title', 'description', 'job_type', 'category', 'company_id', 'experience_level', 'application_link']
+                }
+            },
+            'description': 'Jobs to create, as NDJSON lines or a JSON array.'
+        }
+    ],
+    'responses': {
+        '200': {
+            'description': 'One result per row: {index, status: created|duplicate|error, id, canonical_id, error}, then {summary}'
+        }
+    }
+})
+def bulk_create_jobs():
+    db: Session = get_db()
+
+    def generate():
+        summary = {'created': 0, 'duplicate': 0, 'error': 0}
+        try:
+            for result in import_jobs(db, iter_json_records(request.stream)):
+                summary[result['status']] += 1
+                yield json.dumps(result) + '\n'
+        except StreamFormatError as err:
+            yield json.dumps({'status': 'error', 'error': str(err)}) + '\n'
+            summary['aborted'] = True
+        yield json.dumps({'summary': summary}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@job_router.route('/', methods=['GET'])
+@jwt_required()
+@swag_from({
+    'tags': ['Jobs'],
+    'summary': 'Get all jobs',
+    'description': 'Retrieve a cursor-paginated, filterable list of job postings for authenticated users, newest first.',
+    'parameters': [
+        {
+            'name': 'cursor',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Opaque cursor returned as next_cursor by the previous page.'
+        },
+        {
+            'name': 'per_page',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'default': 20,
+            'description': 'Number of jobs per page (max 100).'
+        },
+        {'name': 'job_type', 'in': 'query', 'type': 'string', 'required': False},
+        {'name': 'category', 'in': 'query', 'type': 'string', 'required': False},
+        {'name': 'location', 'in': 'query', 'type': 'string', 'required': False},
+        {'name': 'experience_level', 'in': 'query', 'type': 'string', 'required': False},
+        {'name': 'company_id', 'in': 'query', 'type': 'integer', 'required': False},
+        {'name': 'job_status', 'in': 'query', 'type': 'string', 'required': False},
+        {'name': 'near', 'in': 'query', 'type': 'string', 'required': False,
+         'description': 'A city, e.g. "Lagos" or "Berlin, Germany"; returns jobs within radius_km of it.'},
+        {'name': 'radius_km', 'in': 'query', 'type': 'number', 'required': False, 'default': 50},
+        {'name': 'country', 'in': 'query', 'type': 'string', 'required': False,
+         'description': 'Country name or ISO code.'},
+        {'name': 'region', 'in': 'query', 'type': 'string', 'required': False,
+         'description': 'Africa, Europe, Middle East, Asia, Oceania, North America, '
+                        'Latin America, EMEA, APAC, LATAM or Americas.'},
+        {'name': 'remote_tz', 'in': 'query', 'type': 'string', 'required': False,
+         'description': 'Remote jobs compatible with this timezone (IANA name or UTC offset such as +01:00).'},
+        {'name': 'tz_hours', 'in': 'query', 'type': 'number', 'required': False, 'default': 3,
+         'description': 'Maximum offset difference in hours for remote_tz.'},
+        {
+            'name': 'fields',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Comma-separated job fields to return, e.g. job_title,company_id,job_type,location. Defaults to all fields.'
+        }
+    ],
+    'responses': {
+        '200': {
+            'description': 'A page of jobs',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'items': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'id': {'type': 'integer'},
+                                'job_title': {'type': 'string'},
+                                'description': {'type': 'string'},
+                                'job_type': {'type': 'string'},
+                                'location': {'type': 'string'},
+                                'application_deadline': {'type': 'string', 'format': 'date'},
+                                'category': {'type': 'string'},
+                                'company_id': {'type': 'integer'},
+                                'experience_level': {'type': 'string'},
+                                'job_status': {'type': 'string'}
+                            }
+                        }
+                    },
+                    'next_cursor': {'type': 'string'},
+                    'per_page': {'type': 'integer'}
+                }
+            }
+        },
+        '400': {'description': 'Invalid cursor, unknown field or unknown location filter'},
+        '304': {'description': 'Not modified; the ETag matched If-None-Match'}
+    }
+})
+def get_jobs():
+    db: Session = get_db()
+    per_page = clamp_per_page(request.args.get('per_page', type=int))
+
+    after = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            after = decode_cursor(cursor, datetime, int)
+        except InvalidCursor:
+            return jsonify({'error': 'Invalid cursor'}), 400
+
+    try:
+        fields = parse_fields(request.args.get('fields'), Job)
+    except InvalidFields as err:
+        return jsonify({'error': str(err)}), 400
+
+    filters = {key: request.args.get(key) for key in Job.FILTERABLE_FIELDS}
+    filters['company_id'] = request.args.get('company_id', type=int)
+
+    query = Job.filter_by_fields(db, **filters)
+    try:
+        query = filter_by_location(
+            query,
+            near=request.args.get('near'),
+            radius_km=request.args.get('radius_km', type=float),
+            country=request.args.get('country'),
+            region=request.args.get('region'),
+            remote_tz=request.args.get('remote_tz'),
+            tz_hours=request.args.get('tz_hours', type=float))
+    except InvalidLocationFilter as err:
+        return jsonify({'error': str(err)}), 400
+    # Validate against the page's (id, updated_at) pairs before loading any rows
+    versions = Job.keyset_page(query.with_entities(Job.id, Job.updated_at, Job.date_posted),
+                               after=after, per_page=per_page)
+    etag = make_etag(per_page, fields, [(job_id, updated_at) for job_id, updated_at, _ in versions])
+
+    def build():
+        # date_posted is always loaded for the next cursor
+        jobs = Job.keyset_page(project(query, Job, fields, 'date_posted'),
+                               after=after, per_page=per_page)
+        next_cursor = None
+        if len(jobs) > per_page:
+            jobs = jobs[:per_page]
+            next_cursor = encode_cursor(jobs[-1].date_posted, jobs[-1].id)
+        return jsonify({
+            'items': [job.to_dict(fields) for job in jobs],
+            'next_cursor': next_cursor,
+            'per_page': per_page
+        })
+
+    return conditional_response(etag, None, build)
+
+
+@job_router.route('/facets', methods=['GET'])
+@jwt_required()
+@swag_from({
+    'tags': ['Jobs'],
+    'summary': 'Get job filter facet counts',
+    'description': 'Count active jobs per job_type, category, location and experience_level. '
+                   'Each facet is constrained by the filters given for the other facets.',
+    'parameters': [
+        {'name': 'job_type', 'in': 'query', 'type': 'string', 'required': False},
+        {'name': 'category', 'in': 'query', 'type': 'string', 'required': False},
+        {'name': 'location', 'in': 'query', 'type': 'string', 'required': False},
+        {'name': 'experience_level', 'in': 'query', 'type': 'string', 'required': False}
+    ],
+    'responses': {
+        '200': {
+            'description': 'Facet counts',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'total': {'type': 'integer'},
+                    'facets': {
+                        'type': 'object',
+                        'additionalProperties': {
+                            'type': 'array',
+                            'items': {
+                                'type': 'object',
+                                'properties': {
+                                    'value': {'type': 'string'},
+                                    'count': {'type': 'integer'}
+                                }
+                            }
+                        }
                     }
                 }
             }
         }
     }
 })
-def get_jobs():
+def get_job_facets():
     db: Session = get_db()
-    jobs = Job.query.all()
-    return jsonify([job.to_dict() for job in jobs]), 200
+    filters = {field: request.args.get(field) for field in facets.FACET_FIELDS}
+    return jsonify(facets.facet_counts(db, **filters)), 200
 
 
 @job_router.route('/<int:job_id>', methods=['GET'])
@@ -181,6 +490,13 @@ def get_jobs():
             'type': 'integer',
             'required': True,
             'description': 'The ID of the job to retrieve.'
+        },
+        {
+            'name': 'fields',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Comma-separated job fields to return, e.g. job_title,description. Defaults to all fields.'
         }
     ],
     'responses': {
@@ -202,15 +518,25 @@ def get_jobs():
                 }
             }
         },
-        '404': {'description': 'Job not found'}
+        '404': {'description': 'Job not found'},
+        '304': {'description': 'Not modified; the ETag or If-Modified-Since date matched'},
+        '400': {'description': 'Unknown field'}
     }
 })
 def get_job(job_id: int):
     db: Session = get_db()
-    job = Job.query.get(job_id)
-    if not job:
+    try:
+        fields = parse_fields(request.args.get('fields'), Job)
+    except InvalidFields as err:
+        return jsonify({'error': str(err)}), 400
+
+    version = db.query(Job.updated_at).filter(Job.id == job_id).first()
+    if not version:
         return jsonify({'error': 'Job not found'}), 404
-    return jsonify(job.to_dict()), 200
+    return conditional_response(
+        make_etag('job', job_id, version.updated_at, fields), version.updated_at,
+        lambda: jsonify(project(db.query(Job), Job, fields)
+                        .filter(Job.id == job_id).one().to_dict(fields)))
 
 
 @job_router.route('/<int:job_id>', methods=['PUT'])
@@ -275,10 +601,21 @@ def update_job(job_id: int):
         return jsonify({'error': 'Job not found'}), 404
 
     job_data = request.json
+    old_facet_key = facets.facet_key(job)
+    old_company_id = job.company_id
     for key, value in job_data.items():
         setattr(job, key, value)
 
+    if 'location' in job_data:
+        apply_location(job)
+    if {'job_title', 'description', 'company_id'} & job_data.keys():
+        dedup.refresh(db, job)
+    facets.move(db, old_facet_key, facets.facet_key(job))
     job.save(db)
+    job_index.upsert(job)
+    job_recommender.upsert(job)
+    company_profile.invalidate(old_company_id, job.company_id)
+    alerts.notify_matches(db, [job])
     return jsonify(job.to_dict()), 200
 
 
@@ -308,5 +645,16 @@ def delete_job(job_id: int):
     if not job:
         return jsonify({'error': 'Job not found'}), 404
 
+    company_id = job.company_id
+    promoted = dedup.forget(db, job.id)
+    facets.adjust(db, facets.facet_key(job), -1)
+    facets.adjust(db, facets.facet_key(promoted), 1)
+    alerts.forget_jobs(db, [job.id])
     job.delete(db)
+    job_index.remove(job_id)
+    job_recommender.remove(job_id)
+    if promoted is not None:
+        job_index.upsert(promoted)
+        job_recommender.upsert(promoted)
+    company_profile.invalidate(company_id)
     return jsonify({'message': 'Job deleted successfully'}), 204
@@ -0,0 +1,118 @@
+from datetime import datetime
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import current_user, jwt_required
+from sqlalchemy.orm import Session
+from db import get_db
+from models.notification import Notification
+from services.pagination import InvalidCursor, clamp_per_page, decode_cursor, encode_cursor
+from flasgger import swag_from
+
+notification_router = Blueprint('notification', __name__)
+
+
+@notification_router.route('/', methods=['GET'])
+@jwt_required()
+@swag_from({
+    'tags': ['Notifications'],
+    'summary': 'List saved search notifications',
+    'description': 'Jobs matched by the current user\'s saved searches, newest first, '
+                   'paginated with an opaque cursor.',
+    'parameters': [
+        {'name': 'unread', 'in': 'query', 'type': 'boolean', 'required': False,
+         'description': 'Only return notifications not yet marked as read.'},
+        {'name': 'cursor', 'in': 'query', 'type': 'string', 'required': False},
+        {'name': 'per_page', 'in': 'query', 'type': 'integer', 'required': False, 'default': 20}
+    ],
+    'responses': {
+        '200': {
+            'description': 'A page of notifications',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'items': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'id': {'type': 'integer'},
+                                'saved_search_id': {'type': 'integer'},
+                                'job_id': {'type': 'integer'},
+                                'created_at': {'type': 'string'},
+                                'read_at': {'type': 'string'}
+                            }
+                        }
+                    },
+                    'next_cursor': {'type': 'string'},
+                    'per_page': {'type': 'integer'}
+                }
+            }
+        },
+        '400': {'description': 'Invalid cursor'}
+    }
+})
+def get_notifications():
+    db: Session = get_db()
+    user_id = current_user.id
+    per_page = clamp_per_page(request.args.get('per_page', type=int))
+
+    query = db.query(Notification).filter(Notification.user_id == user_id)
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            (after,) = decode_cursor(cursor, int)
+        except InvalidCursor:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        query = query.filter(Notification.id < after)
+    if request.args.get('unread') in ('1', 'true'):
+        query = query.filter(Notification.read_at.is_(None))
+
+    notifications = query.order_by(Notification.id.desc()).limit(per_page + 1).all()
+    next_cursor = None
+    if len(notifications) > per_page:
+        notifications = notifications[:per_page]
+        next_cursor = encode_cursor(notifications[-1].id)
+    return jsonify({
+        'items': [notification.to_dict() for notification in notifications],
+        'next_cursor': next_cursor,
+        'per_page': per_page
+    }), 200
+
+
+@notification_router.route('/read', methods=['POST'])
+@jwt_required()
+@swag_from({
+    'tags': ['Notifications'],
+    'summary': 'Mark notifications as read',
+    'description': 'Mark the given notifications, or all of the current user\'s notifications '
+                   'when no ids are given, as read.',
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'ids': {'type': 'array', 'items': {'type': 'integer'}}
+                }
+            }
+        }
+    ],
+    'responses': {
+        '200': {
+            'description': 'Number of notifications marked as read',
+            'schema': {'type': 'object', 'properties': {'updated': {'type': 'integer'}}}
+        }
+    }
+})
+def mark_notifications_read():
+    db: Session = get_db()
+    user_id = current_user.id
+    ids = (request.get_json(silent=True) or {}).get('ids')
+
+    query = db.query(Notification).filter(Notification.user_id == user_id,
+                                          Notification.read_at.is_(None))
+    if ids:
+        query = query.filter(Notification.id.in_(ids))
+    updated = query.update({'read_at': datetime.utcnow()}, synchronize_session=False)
+    db.commit()
+    return jsonify({'updated': updated}), 200
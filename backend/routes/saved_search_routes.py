@@ -0,0 +1,139 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import current_user, jwt_required
+from sqlalchemy.orm import Session
+from db import get_db
+from models.company import Company
+from models.notification import Notification
+from models.saved_search import SavedSearch
+from services.alerts import search_matcher
+from flasgger import swag_from
+
+saved_search_router = Blueprint('saved_search', __name__)
+
+# Bounds the work every new job does in the matcher
+MAX_SAVED_SEARCHES_PER_USER = 20
+
+SAVED_SEARCH_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'integer'},
+        'name': {'type': 'string'},
+        'keywords': {'type': 'string'},
+        'job_type': {'type': 'string'},
+        'category': {'type': 'string'},
+        'location': {'type': 'string'},
+        'experience_level': {'type': 'string'},
+        'company_id': {'type': 'integer'},
+        'created_at': {'type': 'string'}
+    }
+}
+
+
+@saved_search_router.route('/', methods=['POST'])
+@jwt_required()
+@swag_from({
+    'tags': ['Saved Searches'],
+    'summary': 'Save a job search',
+    'description': 'Store search criteria for the current user. New and updated jobs matching '
+                   'them create notifications. Keywords must all appear in the job; every '
+                   'other criterion is an exact match.',
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'name': {'type': 'string'},
+                    'keywords': {'type': 'string'},
+                    'job_type': {'type': 'string'},
+                    'category': {'type': 'string'},
+                    'location': {'type': 'string'},
+                    'experience_level': {'type': 'string'},
+                    'company_id': {'type': 'integer'}
+                },
+                'required': ['name']
+            }
+        }
+    ],
+    'responses': {
+        '201': {'description': 'Saved search created', 'schema': SAVED_SEARCH_SCHEMA},
+        '400': {'description': 'Missing name, unknown company_id or too many saved searches'}
+    }
+})
+def create_saved_search():
+    db: Session = get_db()
+    user_id = current_user.id
+    data = request.json
+
+    if not data or not data.get('name'):
+        return jsonify({'error': 'Missing required fields'}), 400
+    company_id = data.get('company_id')
+    if company_id is not None and (not isinstance(company_id, int) or isinstance(company_id, bool)
+                                   or not db.query(Company.id).filter_by(id=company_id).first()):
+        return jsonify({'error': 'company_id must be the id of an existing company'}), 400
+    if db.query(SavedSearch).filter_by(user_id=user_id).count() >= MAX_SAVED_SEARCHES_PER_USER:
+        return jsonify({'error': f'At most {MAX_SAVED_SEARCHES_PER_USER} saved searches per user'}), 400
+
+    saved_search = SavedSearch(
+        user_id=user_id,
+        name=data['name'],
+        keywords=data.get('keywords'),
+        **{field: data.get(field) for field in SavedSearch.FILTER_FIELDS}
+    )
+    saved_search.save(db)
+    search_matcher.upsert(saved_search)
+    return jsonify(saved_search.to_dict()), 201
+
+
+@saved_search_router.route('/', methods=['GET'])
+@jwt_required()
+@swag_from({
+    'tags': ['Saved Searches'],
+    'summary': 'List saved searches',
+    'description': "Retrieve the current user's saved searches.",
+    'responses': {
+        '200': {
+            'description': 'Saved searches',
+            'schema': {'type': 'array', 'items': SAVED_SEARCH_SCHEMA}
+        }
+    }
+})
+def get_saved_searches():
+    db: Session = get_db()
+    user_id = current_user.id
+    searches = db.query(SavedSearch).filter_by(user_id=user_id).order_by(SavedSearch.id)
+    return jsonify([search.to_dict() for search in searches]), 200
+
+
+@saved_search_router.route('/<int:search_id>', methods=['DELETE'])
+@jwt_required()
+@swag_from({
+    'tags': ['Saved Searches'],
+    'summary': 'Delete a saved search',
+    'description': 'Delete one of the current user\'s saved searches and its notifications.',
+    'parameters': [
+        {
+            'name': 'search_id',
+            'in': 'path',
+            'type': 'integer',
+            'required': True,
+            'description': 'The ID of the saved search to delete.'
+        }
+    ],
+    'responses': {
+        '204': {'description': 'Saved search deleted'},
+        '404': {'description': 'Saved search not found'}
+    }
+})
+def delete_saved_search(search_id: int):
+    db: Session = get_db()
+    user_id = current_user.id
+    saved_search = db.query(SavedSearch).filter_by(id=search_id, user_id=user_id).first()
+    if not saved_search:
+        return jsonify({'error': 'Saved search not found'}), 404
+
+    db.query(Notification).filter_by(saved_search_id=search_id).delete(synchronize_session=False)
+    saved_search.delete(db)
+    search_matcher.remove(search_id)
+    return jsonify({'message': 'Saved search deleted successfully'}), 204
@@ -1,9 +1,12 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, create_access_token, get_jwt_identity
+from flask_jwt_extended import jwt_required, create_access_token, current_user
 from sqlalchemy.orm import Session
 from db import get_db
 from models.user import User
-from werkzeug.security import generate_password_hash, check_password_hash
+from services.passwords import HasherBusy, password_hasher
+from services.rate_limit import limiter
+from services import dashboard, identity, user_search
+from services.pagination import InvalidCursor, clamp_per_page, decode_cursor, encode_cursor
 from werkzeug.utils import secure_filename
 import os
 from flasgger import swag_from
@@ -18,6 +21,13 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def hasher_busy():
+    """503 response for a request turned away by the password hasher."""
+    response = jsonify({'error': 'Too many password operations in progress, retry shortly'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
 @user_router.route('/register', methods=['POST'])
 @swag_from({
     'tags': ['Users'],
@@ -75,9 +85,12 @@ def allowed_file(filename):
                 }
             }
         },
-        '400': {'description': 'Missing required fields or email already registered'}
+        '400': {'description': 'Missing required fields or email already registered'},
+        '429': {'description': 'Rate limit or concurrency cap exceeded; retry after the Retry-After delay'},
+        '503': {'description': 'Too many password operations in progress; retry after the Retry-After delay'}
     }
 })
+@limiter.limit('auth')
 def register_user():
     db: Session = get_db()
 
@@ -89,7 +102,10 @@ def register_user():
     if existing_user:
         return jsonify({'error': 'Email already registered'}), 400
 
-    hashed_password = generate_password_hash(data['password'])
+    try:
+        hashed_password = password_hasher.hash(data['password'])
+    except HasherBusy:
+        return hasher_busy()
     new_user = User(
         fullname=data['fullname'],
         email=data['email'],
@@ -111,6 +127,9 @@ def register_user():
             resume.save(os.path.join(UPLOAD_FOLDER, filename))
             new_user.resume = filename
 
+    db.add(new_user)
+    db.flush()
+    user_search.index_user(db, new_user)
     new_user.save(db)
     return jsonify(new_user.to_dict()), 201
 
@@ -180,9 +199,12 @@ def register_user():
                     'error': {'type': 'string'}
                 }
             }
-        }
+        },
+        '429': {'description': 'Rate limit or concurrency cap exceeded; retry after the Retry-After delay'},
+        '503': {'description': 'Too many password operations in progress; retry after the Retry-After delay'}
     }
 })
+@limiter.limit('auth')
 def login():
     db: Session = get_db()
     data = request.json
@@ -190,8 +212,15 @@ def login():
         return jsonify({'error': 'Missing required fields'}), 400
 
     user = User.find_by_email(db, data['email'])
-    if not user or not check_password_hash(user.password_hash, data['password']):
-        return jsonify({'error': 'Invalid email or password'}), 401
+    try:
+        if not user or not password_hasher.verify(user.password_hash, data['password']):
+            return jsonify({'error': 'Invalid email or password'}), 401
+        if password_hasher.needs_rehash(user.password_hash):
+            # Upgrade hashes made with an older method or cost while the password is at hand
+            user.password_hash = password_hasher.hash(data['password'])
+            user.save(db)
+    except HasherBusy:
+        return hasher_busy()
 
     access_token = create_access_token(identity=user.id)
 
@@ -207,24 +236,30 @@ def login():
 @swag_from({
     'tags': ['Users'],
     'summary': 'Get user dashboard',
-    'description': 'Fetches the dashboard for the user.',
+    'description': 'Fetches the dashboard for the user: their application counts by status, '
+                   'latest applications with job and company summaries, profile completeness '
+                   'and active jobs recommended from their skills, experience level and location.',
+    'parameters': [
+        {
+            'name': 'limit',
+            'in': 'query',
+            'type': 'integer',
+            'description': 'Number of recommended jobs (max 50).',
+            'required': False,
+            'default': 10
+        }
+    ],
     'responses': {
         '200': {'description': 'Dashboard data retrieved successfully'},
         '403': {'description': 'Unauthorized access'}
     }
 })
 def user_dashboard():
-    current_user_id = get_jwt_identity()
     db: Session = get_db()
-    user = User.find_by_id(db, current_user_id)
-    if not user:
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+    dashboard_data = dashboard.get_dashboard(db, current_user.id, limit)
+    if dashboard_data is None:
         return jsonify({'error': 'Unauthorized'}), 403
-
-    # Here you would fetch and return relevant dashboard data
-    dashboard_data = {
-        'user': user.to_dict(),
-        # Add other relevant dashboard data here
-    }
     return jsonify(dashboard_data), 200
 
 # The rest of your routes (get_users, get_user, update_user, delete_user) can remain largely unchanged,
@@ -236,21 +271,21 @@ def user_dashboard():
 @swag_from({
     'tags': ['Users'],
     'summary': 'Get all users',
-    'description': 'Fetches a paginated list of all users.',
+    'description': 'Fetches one page of users in id order, optionally only those whose name '
+                   'matches a search term. Pass the returned next_cursor to fetch the following page.',
     'parameters': [
         {
-            'name': 'page',
+            'name': 'cursor',
             'in': 'query',
-            'type': 'integer',
-            'description': 'Page number for pagination.',
-            'required': False,
-            'default': 1
+            'type': 'string',
+            'description': 'Opaque cursor from the previous page.',
+            'required': False
         },
         {
             'name': 'per_page',
             'in': 'query',
             'type': 'integer',
-            'description': 'Number of users per page.',
+            'description': 'Number of users per page (max 100).',
             'required': False,
             'default': 10
         },
@@ -258,8 +293,17 @@ def user_dashboard():
             'name': 'search',
             'in': 'query',
             'type': 'string',
-            'description': 'Search term for user fullname.',
+            'description': 'Search term for user fullname. Words of three or more letters match '
+                           'anywhere in a name word, shorter words match the start of one.',
             'required': False
+        },
+        {
+            'name': 'exact_total',
+            'in': 'query',
+            'type': 'boolean',
+            'description': 'Count every match instead of stopping at 1000.',
+            'required': False,
+            'default': False
         }
     ],
     'responses': {
@@ -283,32 +327,77 @@ def user_dashboard():
                         }
                     },
                     'total': {'type': 'integer'},
-                    'page': {'type': 'integer'},
+                    'total_exact': {
+                        'type': 'boolean',
+                        'description': 'False when total was capped and more users match.'
+                    },
+                    'next_cursor': {'type': 'string'},
                     'per_page': {'type': 'integer'}
                 }
             }
         },
+        '400': {'description': 'Invalid cursor'},
         '403': {'description': 'Unauthorized access'}
     },
 })
 def get_users():
     db: Session = get_db()
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    per_page = clamp_per_page(request.args.get('per_page', type=int), default=10)
     search = request.args.get('search', '')
-
-    query = User.filter_by_fullname(db, search)
-    total = query.count()
-    users = query.offset((page - 1) * per_page).limit(per_page).all()
+    exact = request.args.get('exact_total', '').lower() in ('1', 'true', 'yes')
+
+    after = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            (after,) = decode_cursor(cursor, int)
+        except InvalidCursor:
+            return jsonify({'error': 'Invalid cursor'}), 400
+
+    users = user_search.search_page(db, search, after, per_page)
+    next_cursor = None
+    if len(users) > per_page:
+        users = users[:per_page]
+        next_cursor = encode_cursor(users[-1].id)
+    total, total_exact = user_search.count_matches(db, search, exact)
 
     return jsonify({
         'items': [user.to_dict() for user in users],
         'total': total,
-        'page': page,
+        'total_exact': total_exact,
+        'next_cursor': next_cursor,
         'per_page': per_page
     })
 
 
+@user_router.route('/identity-cache/stats', methods=['GET'])
+@jwt_required()
+@swag_from({
+    'tags': ['Users'],
+    'summary': 'Identity cache statistics',
+    'description': 'Hit, miss and eviction counters for the per-process cache of '
+                   'authenticated callers.',
+    'responses': {
+        '200': {
+            'description': 'Cache counters',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'hits': {'type': 'integer'},
+                    'misses': {'type': 'integer'},
+                    'coalesced': {'type': 'integer'},
+                    'evictions': {'type': 'integer'},
+                    'size': {'type': 'integer'},
+                    'maxsize': {'type': 'integer'}
+                }
+            }
+        }
+    }
+})
+def identity_cache_stats():
+    return jsonify(identity.identity_cache.stats()), 200
+
+
 @user_router.route('/<int:user_id>', methods=['GET'])
 @jwt_required()
 @swag_from({
@@ -417,14 +506,14 @@ def get_user(user_id: int):
             }
         },
         '404': {'description': 'User not found'},
-        '403': {'description': 'Unauthorized access'}
+        '403': {'description': 'Unauthorized access'},
+        '503': {'description': 'Too many password operations in progress; retry after the Retry-After delay'}
     }
 })
 def update_user(user_id: int):
     db: Session = get_db()
-    current_user_id = get_jwt_identity()
 
-    if current_user_id != user_id:
+    if current_user.id != user_id:
         return jsonify({'error': 'Unauthorized'}), 403
 
     user = User.find_by_id(db, user_id)
@@ -432,9 +521,14 @@ def update_user(user_id: int):
         return jsonify({'error': 'User not found'}), 404
 
     data = request.form  # Use request.form for updates
+    if 'password' in data:
+        try:
+            password_hash = password_hasher.hash(data['password'])
+        except HasherBusy:
+            return hasher_busy()
     for key, value in data.items():
         if key == 'password':
-            setattr(user, 'password_hash', generate_password_hash(value))
+            setattr(user, 'password_hash', password_hash)
         else:
             setattr(user, key, value)
 
@@ -452,7 +546,11 @@ def update_user(user_id: int):
             resume.save(os.path.join(UPLOAD_FOLDER, filename))
             user.resume = filename
 
+    if 'fullname' in data:
+        user_search.index_user(db, user)
     user.save(db)
+    identity.invalidate(user_id)
+    dashboard.invalidate(user_id)
     return jsonify(user.to_dict()), 200
 
 
@@ -479,14 +577,16 @@ def update_user(user_id: int):
 })
 def delete_user(user_id: int):
     db: Session = get_db()
-    current_user_id = get_jwt_identity()
 
-    if current_user_id != user_id:
+    if current_user.id != user_id:
         return jsonify({'error': 'Unauthorized'}), 403
 
     user = User.find_by_id(db, user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 404
 
+    user_search.forget_user(db, user.id)
     user.delete(db)
+    identity.invalidate(user_id)
+    dashboard.invalidate(user_id)
     return jsonify(message='User deleted successfully'), 204
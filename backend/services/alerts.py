@@ -0,0 +1,206 @@
+import threading
+
+from sqlalchemy import func
+
+from models.job import Job
+from models.notification import Notification
+from models.saved_search import SavedSearch
+from services.bulk import bulk_insert_ignore
+from services.search_index import tokenize
+
+# Job fields whose words a saved search's keywords are matched against
+KEYWORD_FIELDS = ('job_title', 'category', 'description')
+# Order in which a filter-only search picks the filter it is indexed under;
+# the most selective first
+ANCHOR_FILTERS = ('company_id', 'category', 'location', 'job_type', 'experience_level')
+NOTIFY_BATCH_SIZE = 1000
+
+
+class SavedSearchMatcher:
+    """
+    Reverse index over saved searches: instead of running every saved
+    search against the jobs table, each job is matched against the
+    searches.
+
+    Every search is filed under one anchor that any matching job must
+    hit: one of its keywords (the longest, as a stand-in for the rarest),
+    otherwise one of its equality filters. A job only looks up the
+    anchors its own words and field values produce, then verifies the
+    few candidates in full, so matching cost follows the number of
+    plausible searches rather than all of them.
+
+    It is loaded on first use. Before each match run it compares the
+    (count, max id) of saved_searches with the snapshot it holds, so
+    searches created or deleted by other processes are picked up: new
+    rows are added incrementally, anything else triggers a reload.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._version = None    # (count, max id) of saved_searches when last synced
+        self._searches = {}     # search id -> (user_id, terms, filters)
+        self._anchors = {}      # ('term', word) / (field, value) -> {search ids}
+        self._match_all = set()
+
+    def __len__(self):
+        return len(self._searches)
+
+    def ensure_built(self, db_session):
+        """Load the saved searches, or catch up with changes made since the last call."""
+        version = tuple(db_session.query(func.count(SavedSearch.id), func.max(SavedSearch.id)).one())
+        if self._built and version == self._version:
+            return
+        with self._lock:
+            if self._built and version == self._version:
+                return
+            if self._built and self._version is not None:
+                count, max_id = self._version
+                added = db_session.query(SavedSearch).filter(SavedSearch.id > (max_id or 0)).all()
+                if count + len(added) == version[0]:
+                    # Only new searches since the snapshot
+                    for search in added:
+                        self._remove(search.id)
+                        self._add(search)
+                    self._version = version
+                    return
+            self._searches, self._anchors, self._match_all = {}, {}, set()
+            for search in db_session.query(SavedSearch).yield_per(1000):
+                self._add(search)
+            self._version = version
+            self._built = True
+
+    def reset(self):
+        """Drop all searches; the next match reloads them from the DB."""
+        with self._lock:
+            self._built = False
+            self._version = None
+            self._searches = {}
+            self._anchors = {}
+            self._match_all = set()
+
+    def upsert(self, search):
+        """Index or re-index a saved search."""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(search.id)
+            self._add(search)
+
+    def remove(self, search_id):
+        """Remove a saved search if present."""
+        with self._lock:
+            self._remove(search_id)
+
+    def match(self, job):
+        """Return (search_id, user_id) for every saved search matching `job`."""
+        words = set()
+        for field in KEYWORD_FIELDS:
+            words.update(tokenize(getattr(job, field)))
+        values = {field: getattr(job, field) for field in SavedSearch.FILTER_FIELDS}
+
+        with self._lock:
+            candidates = set(self._match_all)
+            for word in words:
+                candidates.update(self._anchors.get(('term', word), ()))
+            for field, value in values.items():
+                if value is not None:
+                    candidates.update(self._anchors.get((field, value), ()))
+
+            matches = []
+            for search_id in candidates:
+                user_id, terms, filters = self._searches[search_id]
+                if terms <= words and all(values[field] == value
+                                          for field, value in filters.items()):
+                    matches.append((search_id, user_id))
+        return matches
+
+    def _add(self, search):
+        terms = frozenset(tokenize(search.keywords))
+        filters = {field: getattr(search, field) for field in SavedSearch.FILTER_FIELDS
+                   if getattr(search, field) not in (None, '')}
+        self._searches[search.id] = (search.user_id, terms, filters)
+
+        anchor = self._anchor(terms, filters)
+        if anchor is None:
+            self._match_all.add(search.id)
+        else:
+            self._anchors.setdefault(anchor, set()).add(search.id)
+
+    @staticmethod
+    def _anchor(terms, filters):
+        if terms:
+            return ('term', max(terms, key=lambda term: (len(term), term)))
+        for field in ANCHOR_FILTERS:
+            if field in filters:
+                return (field, filters[field])
+        return None
+
+    def _remove(self, search_id):
+        entry = self._searches.pop(search_id, None)
+        if entry is None:
+            return
+        _, terms, filters = entry
+        anchor = self._anchor(terms, filters)
+        if anchor is None:
+            self._match_all.discard(search_id)
+            return
+        searches = self._anchors.get(anchor)
+        if searches is not None:
+            searches.discard(search_id)
+            if not searches:
+                del self._anchors[anchor]
+
+
+search_matcher = SavedSearchMatcher()
+
+
+def notify_matches(db_session, jobs):
+    """
+    Match active `jobs` against every saved search and write one
+    Notification per new match, NOTIFY_BATCH_SIZE rows per INSERT.
+    Matches already notified are skipped. Commits; returns the number of
+    matches found.
+    """
+    search_matcher.ensure_built(db_session)
+    rows, found = [], 0
+    for job in jobs:
+        if job.job_status != 'active':
+            continue
+        for search_id, user_id in search_matcher.match(job):
+            rows.append({'user_id': user_id, 'saved_search_id': search_id, 'job_id': job.id})
+        if len(rows) >= NOTIFY_BATCH_SIZE:
+            found += len(rows)
+            bulk_insert_ignore(db_session, Notification, rows, ['saved_search_id', 'job_id'])
+            rows = []
+    found += len(rows)
+    bulk_insert_ignore(db_session, Notification, rows, ['saved_search_id', 'job_id'])
+    db_session.commit()
+    return found
+
+
+def forget_jobs(db_session, job_ids):
+    """Delete the notifications of jobs about to be removed. Does not commit."""
+    db_session.query(Notification).filter(Notification.job_id.in_(job_ids)) \
+        .delete(synchronize_session=False)
+
+
+def percolate(db_session, *criteria, batch_size=NOTIFY_BATCH_SIZE):
+    """
+    Run `notify_matches` over the active jobs matching `criteria`, loading
+    only the matched columns. Returns the number of matches found.
+    """
+    search_matcher.ensure_built(db_session)
+    if not len(search_matcher):
+        return 0
+    columns = dict.fromkeys(('id', 'job_status') + KEYWORD_FIELDS + SavedSearch.FILTER_FIELDS)
+    query = db_session.query(*(getattr(Job, column) for column in columns)) \
+        .filter(Job.job_status == 'active', *criteria).order_by(Job.id)
+    found, last_id = 0, 0
+    while True:
+        # Keyset batches, since notify_matches commits between them
+        jobs = query.filter(Job.id > last_id).limit(batch_size).all()
+        if not jobs:
+            return found
+        found += notify_matches(db_session, jobs)
+        last_id = jobs[-1].id
@@ -0,0 +1,62 @@
+from sqlalchemy import insert
+
+
+def dialect_insert(db_session, table):
+    """Return an INSERT construct for `table` that supports the backend's upsert syntax."""
+    dialect = db_session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(table)
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(table)
+    if dialect in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        return mysql_insert(table)
+    return insert(table)
+
+
+def bulk_insert(db_session, model, rows):
+    """Insert `rows` (a list of column dicts) as one multi-row INSERT."""
+    if rows:
+        db_session.execute(insert(model.__table__), rows)
+
+
+def bulk_insert_ignore(db_session, model, rows, conflict_columns):
+    """
+    Insert `rows` in one statement, skipping rows that collide on the
+    unique `conflict_columns`. Does not commit.
+    """
+    if not rows:
+        return
+    stmt = dialect_insert(db_session, model.__table__).values(rows)
+    dialect = db_session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+    elif dialect in ('mysql', 'mariadb'):
+        stmt = stmt.prefix_with('IGNORE')
+    else:
+        raise NotImplementedError(f'Insert-ignore is not supported on {dialect}')
+    db_session.execute(stmt)
+
+
+def bulk_upsert(db_session, model, rows, conflict_columns, update_columns):
+    """
+    Insert `rows` in one statement, updating `update_columns` of rows that
+    collide on the unique `conflict_columns`. Does not commit.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    stmt = dialect_insert(db_session, table).values(rows)
+    dialect = db_session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={column: stmt.excluded[column] for column in update_columns})
+    elif dialect in ('mysql', 'mariadb'):
+        stmt = stmt.on_duplicate_key_update(
+            **{column: stmt.inserted[column] for column in update_columns})
+    else:
+        raise NotImplementedError(f'Upsert is not supported on {dialect}')
+    db_session.execute(stmt)
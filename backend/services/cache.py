@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Pending:
+    """A load in progress that concurrent callers for the same key wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+        # Set when the key is invalidated mid-load; the result is then not stored
+        self.discarded = False
+
+
+class TTLCache:
+    """
+    Thread-safe, bounded LRU cache with a time-to-live per entry.
+
+    `get_or_load` serves fresh entries directly. Entries past their TTL
+    but within `max_stale` seconds are still served while a single
+    background thread refreshes them (stale-while-revalidate). Concurrent
+    misses for the same key share one call to the loader.
+
+    Loaders signal a failed fetch by returning None; failures are never
+    cached, and a failed refresh keeps serving the stale value.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300, max_stale=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._inflight = {}            # key -> _Pending
+        self._refreshing = set()
+        self._counters = dict.fromkeys(
+            ('hits', 'stale_hits', 'misses', 'coalesced', 'refreshes',
+             'refresh_failures', 'evictions'), 0)
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for `key`, calling `loader()` on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                age = now - stored_at
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    return value
+                if age < self.ttl + self.max_stale:
+                    self._entries.move_to_end(key)
+                    self._counters['stale_hits'] += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(target=self._refresh, args=(key, loader),
+                                         daemon=True).start()
+                    return value
+                del self._entries[key]
+
+            self._counters['misses'] += 1
+            pending = self._inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._inflight[key] = _Pending()
+            else:
+                self._counters['coalesced'] += 1
+
+        if not leader:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            pending.value = loader()
+        except Exception as err:
+            pending.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+                if pending.value is not None and not pending.discarded:
+                    self._store(key, pending.value)
+            pending.event.set()
+        return pending.value
+
+    def invalidate(self, key):
+        """Drop a single key, including a load for it that is still running."""
+        self.invalidate_where(lambda candidate: candidate == key)
+
+    def invalidate_where(self, predicate):
+        """
+        Drop every key for which `predicate(key)` is true. Loads of those
+        keys already in flight still answer their callers but are not
+        stored, so a value read before the write is never cached after it.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+            for key, pending in self._inflight.items():
+                if predicate(key):
+                    pending.discarded = True
+            self._refreshing -= {key for key in self._refreshing if predicate(key)}
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return a snapshot of the hit/miss/refresh counters and current size."""
+        with self._lock:
+            return dict(self._counters, size=len(self._entries), maxsize=self.maxsize)
+
+    def _refresh(self, key, loader):
+        try:
+            value = loader()
+        except Exception:
+            value = None
+        with self._lock:
+            if key not in self._refreshing:
+                return  # invalidated while refreshing
+            self._refreshing.discard(key)
+            if value is None:
+                self._counters['refresh_failures'] += 1
+            else:
+                self._counters['refreshes'] += 1
+                self._store(key, value)
+
+    def _store(self, key, value):
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._counters['evictions'] += 1
@@ -0,0 +1,86 @@
+import os
+from collections import Counter
+
+from sqlalchemy import func
+
+from models.company import Company
+from models.job import Job
+from services.cache import TTLCache
+from services.pagination import encode_cursor
+
+# No stale serving: a background refresh would run outside the app context,
+# and every write to a company or its jobs invalidates its entries anyway.
+profile_cache = TTLCache(
+    maxsize=int(os.getenv('COMPANY_PROFILE_CACHE_SIZE', '1024')),
+    ttl=float(os.getenv('COMPANY_PROFILE_CACHE_TTL', '60')),
+    max_stale=0,
+)
+
+
+def get_profile(db_session, company_id, after=None, per_page=20):
+    """Return the profile of a company, served from the cache when possible."""
+    return profile_cache.get_or_load(
+        (company_id, after, per_page),
+        lambda: build_profile(db_session, company_id, after, per_page))
+
+
+def build_profile(db_session, company_id, after=None, per_page=20):
+    """
+    Build the profile of a company from two queries: the company row
+    joined to its job counts grouped by status, type and experience
+    level, and one keyset page of its active jobs. Returns None if the
+    company does not exist.
+    """
+    rows = db_session.query(
+        Company, Job.job_status, Job.job_type, Job.experience_level,
+        func.count(Job.id), func.max(Job.date_posted),
+    ).outerjoin(Job, Job.company_id == Company.id) \
+        .filter(Company.id == company_id) \
+        .group_by(Company.id, Job.job_status, Job.job_type, Job.experience_level).all()
+    if not rows:
+        return None
+
+    by_status, by_job_type, by_experience_level = Counter(), Counter(), Counter()
+    latest_posted_at = None
+    for _, job_status, job_type, experience_level, count, posted_at in rows:
+        if not count:
+            continue
+        by_status[job_status] += count
+        if job_status == 'active':
+            by_job_type[job_type] += count
+            by_experience_level[experience_level] += count
+            if posted_at is not None and (latest_posted_at is None
+                                          or posted_at > latest_posted_at):
+                latest_posted_at = posted_at
+
+    jobs = Job.keyset_page(
+        db_session.query(Job).filter(Job.company_id == company_id, Job.job_status == 'active'),
+        after=after, per_page=per_page)
+    next_cursor = None
+    if len(jobs) > per_page:
+        jobs = jobs[:per_page]
+        next_cursor = encode_cursor(jobs[-1].date_posted, jobs[-1].id)
+
+    return {
+        'company': rows[0][0].to_dict(),
+        'jobs': {
+            'items': [job.to_dict() for job in jobs],
+            'next_cursor': next_cursor,
+            'per_page': per_page,
+        },
+        'stats': {
+            'open_jobs': by_status['active'],
+            'total_jobs': sum(by_status.values()),
+            'jobs_by_status': dict(by_status),
+            'open_jobs_by_type': dict(by_job_type),
+            'open_jobs_by_experience_level': dict(by_experience_level),
+            'latest_posted_at': latest_posted_at,
+        },
+    }
+
+
+def invalidate(*company_ids):
+    """Drop every cached profile page of the given companies."""
+    ids = {company_id for company_id in company_ids if company_id is not None}
+    if ids:
+        profile_cache.invalidate_where(lambda key: key[0] in ids)
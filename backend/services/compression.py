@@ -0,0 +1,55 @@
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional; only gzip is offered without it
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/csv',
+                          'application/javascript', 'text/css'}
+
+
+def _encoders(app):
+    """Content codings this server offers, in order of preference."""
+    encoders = {}
+    if brotli is not None:
+        quality = app.config.get('COMPRESS_BR_QUALITY', 4)
+        encoders['br'] = lambda data: brotli.compress(data, quality=quality)
+    level = app.config.get('COMPRESS_LEVEL', 6)
+    encoders['gzip'] = lambda data: gzip.compress(data, compresslevel=level)
+    return encoders
+
+
+def init_compression(app):
+    """
+    Compress buffered responses of a compressible type above
+    COMPRESS_MIN_SIZE bytes with the best coding the client accepts.
+    Streamed responses (exports, bulk import results) are left alone so
+    they keep flowing row by row.
+    """
+    encoders = _encoders(app)
+    min_size = app.config.get('COMPRESS_MIN_SIZE', 1024)
+
+    @app.after_request
+    def compress_response(response):
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+        response.vary.add('Accept-Encoding')
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or (response.content_length or 0) < min_size):
+            return response
+
+        coding = request.accept_encodings.best_match(list(encoders))
+        if coding is None:
+            return response
+        response.set_data(encoders[coding](response.get_data()))
+        response.headers['Content-Encoding'] = coding
+        # The compressed bytes differ from the identity representation
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
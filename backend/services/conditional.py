@@ -0,0 +1,40 @@
+import hashlib
+import json
+
+from flask import make_response, request
+
+
+def make_etag(*parts):
+    """Strong ETag value for a sequence of JSON-encodable validator parts."""
+    payload = json.dumps(parts, default=str, separators=(',', ':'))
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def not_modified(etag, last_modified=None):
+    """
+    Whether the request's validators still match. If-None-Match takes
+    precedence over If-Modified-Since, as RFC 9110 requires.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        # HTTP dates have one second resolution and are always UTC
+        return last_modified.replace(microsecond=0) <= \
+            request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def conditional_response(etag, last_modified, build, status=200):
+    """
+    Answer 304 if the client's copy is current, otherwise call `build`
+    for the body. Either way the response carries ETag and, when given,
+    Last-Modified, so the body is only serialized when it is needed.
+    """
+    if not_modified(etag, last_modified):
+        response = make_response('', 304)
+    else:
+        response = make_response(build(), status)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
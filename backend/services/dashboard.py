@@ -0,0 +1,113 @@
+import os
+
+from sqlalchemy import func
+
+from models.application import Application
+from models.company import Company
+from models.job import Job
+from models.user import User
+from services.cache import TTLCache
+from services.recommendations import job_recommender
+
+# Profile fields a complete job seeker profile has filled in
+PROFILE_FIELDS = ('fullname', 'email', 'skills', 'location', 'experience_level',
+                  'profile_picture', 'resume')
+RECENT_APPLICATIONS = 5
+
+# Short-lived, per user; 0 disables it. The user's own writes invalidate
+# their entry, changes to jobs and companies show up once it expires.
+dashboard_cache = TTLCache(
+    maxsize=int(os.getenv('DASHBOARD_CACHE_SIZE', '4096')),
+    ttl=float(os.getenv('DASHBOARD_CACHE_TTL', '30')),
+    max_stale=0,
+)
+
+
+def get_dashboard(db_session, user_id, limit=10):
+    """Return the dashboard of a user, or None if they do not exist."""
+    if dashboard_cache.ttl <= 0:
+        return build_dashboard(db_session, user_id, limit)
+    return dashboard_cache.get_or_load(
+        (user_id, limit), lambda: build_dashboard(db_session, user_id, limit))
+
+
+def build_dashboard(db_session, user_id, limit=10):
+    """
+    Build the dashboard of a user from at most four queries whatever the
+    number of applications: the user joined to their application counts
+    grouped by status, their latest applications joined to job and
+    company, the ids of jobs they applied to, and the recommended jobs.
+    """
+    rows = db_session.query(User, Application.status, func.count(Application.id)) \
+        .outerjoin(Application, Application.user_id == User.id) \
+        .filter(User.id == user_id) \
+        .group_by(User.id, Application.status).all()
+    if not rows:
+        return None
+    user = rows[0][0]
+    by_status = {status: count for _, status, count in rows if count}
+
+    recent = db_session.query(
+        Application.id, Application.status, Application.application_date,
+        Job.id.label('job_id'), Job.job_title, Job.job_status, Job.location,
+        Company.id.label('company_id'), Company.company_name,
+    ).outerjoin(Job, Application.job_id == Job.id) \
+        .outerjoin(Company, Job.company_id == Company.id) \
+        .filter(Application.user_id == user_id) \
+        .order_by(Application.application_date.desc(), Application.id.desc()) \
+        .limit(RECENT_APPLICATIONS).all()
+
+    missing = [field for field in PROFILE_FIELDS if not getattr(user, field)]
+    return {
+        'user': user.to_dict(),
+        'profile_completeness': {
+            'percent': round(100 * (len(PROFILE_FIELDS) - len(missing)) / len(PROFILE_FIELDS)),
+            'missing_fields': missing,
+        },
+        'applications': {
+            'total': sum(by_status.values()),
+            'by_status': by_status,
+            'recent': [{
+                'id': row.id,
+                'status': row.status,
+                'application_date': row.application_date,
+                'job': {
+                    'id': row.job_id,
+                    'job_title': row.job_title,
+                    'job_status': row.job_status,
+                    'location': row.location,
+                    'company': {'id': row.company_id, 'company_name': row.company_name},
+                } if row.job_id is not None else None,
+            } for row in recent],
+        },
+        'recommended_jobs': recommended_jobs(db_session, user, limit),
+    }
+
+
+def recommended_jobs(db_session, user, limit=10):
+    """Active jobs matching the user's profile that they have not applied to."""
+    applied = {job_id for (job_id,) in
+               db_session.query(Application.job_id).filter(Application.user_id == user.id)}
+    job_recommender.ensure_built(db_session)
+    ranked = job_recommender.recommend(
+        {'skills': user.skills, 'experience_level': user.experience_level,
+         'location': user.location},
+        limit=limit * 2, exclude=applied)
+
+    # The matrix of this process may lag jobs closed by another process for
+    # up to the sync interval; ranking twice as many keeps the list full
+    jobs = {job.id: job for job in
+            db_session.query(Job).filter(Job.id.in_([job_id for job_id, _ in ranked]),
+                                         Job.job_status == 'active')} if ranked else {}
+    recommended = []
+    for job_id, score in ranked:
+        if job_id in jobs:
+            job_dict = jobs[job_id].to_dict()
+            job_dict['score'] = round(score, 4)
+            recommended.append(job_dict)
+    return recommended[:limit]
+
+
+def invalidate(user_id):
+    """Drop the cached dashboards of a user."""
+    dashboard_cache.invalidate_where(lambda key: key[0] == user_id)
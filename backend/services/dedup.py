@@ -0,0 +1,242 @@
+import hashlib
+import re
+from collections import Counter
+
+import click
+import numpy as np
+from flask.cli import with_appcontext
+from sqlalchemy import bindparam, insert, update
+
+from db import db
+from models.company import Company
+from models.job import Job
+from models.job_fingerprint import JobFingerprint, JobLshBand
+from services import facets
+
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+# Estimated Jaccard similarity above which two listings are the same posting
+DUPLICATE_THRESHOLD = 0.8
+SHINGLE_SIZE = 3
+# Bound parameters per IN (...) lookup, safely under every backend's limit
+LOOKUP_CHUNK = 500
+
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.RandomState(20241002)
+_PERM_A = _rng.randint(1, (1 << 31) - 1, size=NUM_PERMUTATIONS).astype(np.uint64)
+_PERM_B = _rng.randint(0, (1 << 31) - 1, size=NUM_PERMUTATIONS).astype(np.uint64)
+_WORD_RE = re.compile(r'\w+')
+
+
+def shingles(text):
+    """Word n-gram shingles of the normalised `text`."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE])
+            for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(job_title, description, company_name):
+    """MinHash signature (uint32 array) of a listing's title, description and company."""
+    text = ' '.join(part or '' for part in (company_name, job_title, description))
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'little')
+         for shingle in shingles(text)),
+        dtype=np.uint64)
+    if not hashes.size:
+        return np.full(NUM_PERMUTATIONS, (1 << 31) - 1, dtype=np.uint32)
+    hashes %= _PRIME
+    permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def similarity(signature, other):
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(signature == other)) / NUM_PERMUTATIONS
+
+
+def band_buckets(signature):
+    """(band, bucket) pairs used to look a signature up in the LSH table."""
+    buckets = []
+    for band in range(LSH_BANDS):
+        chunk = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, 'little', signed=True)))
+    return buckets
+
+
+class _CandidateSet:
+    """
+    Canonical signatures reachable through a set of LSH buckets, loaded
+    with one query for a whole batch of lookups.
+    """
+
+    def __init__(self, db_session, signatures):
+        self.buckets = {}     # (band, bucket) -> {job_id}
+        self.signatures = {}  # job_id -> signature
+        wanted = {pair for signature in signatures for pair in band_buckets(signature)}
+        bucket_values = sorted({bucket for _, bucket in wanted})
+        for start in range(0, len(bucket_values), LOOKUP_CHUNK):
+            for job_id, band, bucket in db_session.query(
+                    JobLshBand.job_id, JobLshBand.band, JobLshBand.bucket) \
+                    .filter(JobLshBand.bucket.in_(bucket_values[start:start + LOOKUP_CHUNK])):
+                if (band, bucket) in wanted:
+                    self.buckets.setdefault((band, bucket), set()).add(job_id)
+        job_ids = sorted({job_id for ids in self.buckets.values() for job_id in ids})
+        for start in range(0, len(job_ids), LOOKUP_CHUNK):
+            for job_id, raw in db_session.query(JobFingerprint.job_id, JobFingerprint.signature) \
+                    .filter(JobFingerprint.job_id.in_(job_ids[start:start + LOOKUP_CHUNK])):
+                self.signatures[job_id] = np.frombuffer(raw, dtype=np.uint32)
+
+    def add(self, job_id, signature):
+        """Make a newly registered canonical job visible to later lookups."""
+        self.signatures[job_id] = signature
+        for pair in band_buckets(signature):
+            self.buckets.setdefault(pair, set()).add(job_id)
+
+    def best_match(self, signature, exclude_id=None):
+        candidates = set()
+        for pair in band_buckets(signature):
+            candidates |= self.buckets.get(pair, set())
+        candidates.discard(exclude_id)
+
+        best_id, best_score = None, DUPLICATE_THRESHOLD
+        for job_id in sorted(candidates):
+            known = self.signatures.get(job_id)
+            if known is None:
+                continue
+            score = similarity(signature, known)
+            if score > best_score or (score == best_score and best_id is None):
+                best_id, best_score = job_id, score
+        return best_id
+
+
+def find_duplicate(db_session, signature, exclude_id=None):
+    """
+    Return the id of the canonical job most similar to `signature`, or
+    None if no candidate reaches DUPLICATE_THRESHOLD. Only the jobs that
+    share an LSH bucket are compared, so the cost does not grow with the
+    size of the table.
+    """
+    return _CandidateSet(db_session, [signature]).best_match(signature, exclude_id)
+
+
+def register(db_session, job_id, signature, canonical=True):
+    """Store a job's signature, and its LSH buckets if it is canonical. Does not commit."""
+    register_many(db_session, [(job_id, signature, canonical)])
+
+
+def register_many(db_session, entries):
+    """
+    Store (job_id, signature, canonical) entries with one executemany
+    INSERT per table. Does not commit.
+    """
+    fingerprints = [{'job_id': job_id, 'signature': signature.tobytes()}
+                    for job_id, signature, _ in entries]
+    bands = [{'job_id': job_id, 'band': band, 'bucket': bucket}
+             for job_id, signature, canonical in entries if canonical
+             for band, bucket in band_buckets(signature)]
+    if fingerprints:
+        db_session.execute(insert(JobFingerprint.__table__), fingerprints)
+    if bands:
+        db_session.execute(insert(JobLshBand.__table__), bands)
+
+
+def forget(db_session, job_id, promote=True):
+    """
+    Drop a job's fingerprint before it is deleted or re-fingerprinted.
+    With `promote`, if it was the canonical listing for other jobs, the
+    oldest duplicate becomes the new canonical one and is returned.
+    Does not commit.
+    """
+    db_session.query(JobLshBand).filter_by(job_id=job_id).delete(synchronize_session=False)
+    db_session.query(JobFingerprint).filter_by(job_id=job_id).delete(synchronize_session=False)
+    if not promote:
+        return None
+
+    duplicates = db_session.query(Job).filter_by(canonical_id=job_id).order_by(Job.id).all()
+    if not duplicates:
+        return None
+    promoted, rest = duplicates[0], duplicates[1:]
+    promoted.canonical_id = None
+    promoted.job_status = 'active'
+    for job in rest:
+        job.canonical_id = promoted.id
+    raw = db_session.query(JobFingerprint.signature).filter_by(job_id=promoted.id).scalar()
+    if raw is not None:
+        db_session.execute(insert(JobLshBand.__table__), [
+            {'job_id': promoted.id, 'band': band, 'bucket': bucket}
+            for band, bucket in band_buckets(np.frombuffer(raw, dtype=np.uint32))])
+    return promoted
+
+
+def job_signature(db_session, job):
+    """MinHash signature of a Job instance, which need not be flushed yet."""
+    company_name = db_session.query(Company.company_name) \
+        .filter_by(id=job.company_id).scalar()
+    return minhash(job.job_title, job.description, company_name)
+
+
+def refresh(db_session, job):
+    """Re-fingerprint a canonical job after its text changed. Does not commit."""
+    if job.canonical_id is not None:
+        return
+    forget(db_session, job.id, promote=False)
+    register(db_session, job.id, job_signature(db_session, job))
+
+
+def dedupe_unfingerprinted(db_session, *criteria, batch_size=1000, commit=True):
+    """
+    Fingerprint every job matching `criteria` that has no fingerprint yet,
+    in id order, collapsing near-duplicates into the earliest listing and
+    taking them out of the facet counts. Commits once per batch unless `commit` is false, and returns
+    (checked, duplicates).
+    """
+    checked = duplicates = 0
+    while True:
+        rows = db_session.query(Job.id, Job.job_title, Job.description, Company.company_name) \
+            .join(Company, Job.company_id == Company.id) \
+            .outerjoin(JobFingerprint, JobFingerprint.job_id == Job.id) \
+            .filter(JobFingerprint.job_id.is_(None), Job.canonical_id.is_(None), *criteria) \
+            .order_by(Job.id).limit(batch_size).all()
+        if not rows:
+            return checked, duplicates
+
+        signatures = [minhash(title, description, company_name)
+                      for _, title, description, company_name in rows]
+        candidates = _CandidateSet(db_session, signatures)
+        entries, collapsed = [], []
+        for (job_id, *_), signature in zip(rows, signatures):
+            canonical_id = candidates.best_match(signature, exclude_id=job_id)
+            if canonical_id is None:
+                candidates.add(job_id, signature)
+                entries.append((job_id, signature, True))
+            else:
+                entries.append((job_id, signature, False))
+                collapsed.append({'job_id': job_id, 'canonical_id': canonical_id})
+
+        register_many(db_session, entries)
+        if collapsed:
+            facets.apply_change(db_session, facets.count_keys(
+                db_session, Job.id.in_([row['job_id'] for row in collapsed])), Counter())
+            db_session.execute(
+                update(Job.__table__)
+                .where(Job.__table__.c.id == bindparam('job_id'))
+                .values(canonical_id=bindparam('canonical_id'), job_status='duplicate'),
+                collapsed)
+        duplicates += len(collapsed)
+        checked += len(rows)
+        if commit:
+            db_session.commit()
+
+
+@click.command('dedup')
+@click.option('--batch-size', default=1000, show_default=True,
+              help='Jobs fingerprinted per transaction.')
+@with_appcontext
+def dedup_command(batch_size):
+    """Fingerprint existing jobs and collapse near-duplicate listings."""
+    checked, duplicates = dedupe_unfingerprinted(db.session, batch_size=batch_size)
+    click.echo(f'Checked {checked} jobs, collapsed {duplicates} duplicates')
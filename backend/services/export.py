@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from sqlalchemy import select
+
+from models.application import Application
+from models.company import Company
+from models.job import Job
+
+EXPORT_CHUNK_SIZE = 1000
+
+# Role allowed to export every row of every resource
+ADMIN_ROLE = 'admin'
+
+# resource -> (model, exported columns, column used by the `since` filter,
+# column holding the owner's user id, if only owners may export a row)
+EXPORTS = {
+    'jobs': (Job, ('id', 'job_title', 'description', 'job_type', 'location', 'date_posted',
+                   'application_deadline', 'category', 'company_id', 'experience_level',
+                   'job_status', 'application_link', 'updated_at'),
+             Job.updated_at, None),
+    'companies': (Company, ('id', 'company_name', 'description', 'website_url', 'company_size',
+                            'industry', 'logo', 'updated_at'),
+                  Company.updated_at, None),
+    'applications': (Application, ('id', 'user_id', 'job_id', 'application_date', 'status',
+                                   'cover_letter', 'updated_at'),
+                     Application.updated_at, Application.user_id),
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.hex()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def iter_rows(db_session, model, columns, *criteria, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the `columns` of every row of `model` matching `criteria` as a
+    tuple, in primary key order, fetching `chunk_size` rows at a time
+    through a server-side cursor where the backend supports one.
+    """
+    table = model.__table__
+    stmt = select(*(table.c[column] for column in columns)) \
+        .where(*criteria).order_by(*table.primary_key.columns)
+    result = db_session.execute(stmt.execution_options(yield_per=chunk_size))
+    try:
+        yield from result
+    finally:
+        result.close()
+
+
+def ndjson_lines(columns, rows):
+    """Encode rows as NDJSON, one object per line."""
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), default=_json_default) + '\n'
+
+
+def csv_lines(columns, rows):
+    """Encode rows as CSV with a header line, one line per row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    for row in rows:
+        writer.writerow(value.isoformat() if isinstance(value, (datetime, date)) else value
+                        for value in row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
@@ -0,0 +1,108 @@
+from collections import Counter
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, insert, select
+
+from db import db
+from models.job import Job
+from models.job_facet_count import JobFacetCount
+from services.bulk import dialect_insert
+
+FACET_FIELDS = ('job_type', 'category', 'location', 'experience_level')
+
+
+def facet_key(job):
+    """The facet combination a job counts towards, or None if it is not active."""
+    if job is None or job.job_status != 'active':
+        return None
+    return tuple(getattr(job, field) or '' for field in FACET_FIELDS)
+
+
+def adjust(db_session, key, delta):
+    """Add `delta` to the count of one facet combination. Does not commit."""
+    if key is None or not delta:
+        return
+    values = dict(zip(FACET_FIELDS, key))
+    table = JobFacetCount.__table__
+    dialect = db_session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        stmt = dialect_insert(db_session, table).values(count=delta, **values)
+        db_session.execute(stmt.on_conflict_do_update(
+            index_elements=list(FACET_FIELDS),
+            set_={'count': table.c.count + delta}))
+    elif dialect in ('mysql', 'mariadb'):
+        stmt = dialect_insert(db_session, table).values(count=delta, **values)
+        db_session.execute(stmt.on_duplicate_key_update(count=table.c.count + delta))
+    else:
+        updated = db_session.query(JobFacetCount).filter_by(**values).update(
+            {'count': JobFacetCount.count + delta}, synchronize_session=False)
+        if not updated:
+            db_session.execute(insert(table).values(count=delta, **values))
+
+
+def move(db_session, old_key, new_key):
+    """Move one job from `old_key` to `new_key` after an update. Does not commit."""
+    if old_key != new_key:
+        adjust(db_session, old_key, -1)
+        adjust(db_session, new_key, 1)
+
+
+def count_keys(db_session, *criteria):
+    """Counter of facet combinations of the active jobs matching `criteria`."""
+    columns = [func.coalesce(getattr(Job, field), '') for field in FACET_FIELDS]
+    return Counter({tuple(key): count for *key, count in db_session.query(*columns, func.count())
+                    .filter(Job.job_status == 'active', *criteria).group_by(*columns)})
+
+
+def apply_change(db_session, before, after):
+    """
+    Adjust the counts by the difference between two `count_keys` results
+    taken around a change to a set of jobs. Does not commit.
+    """
+    for key in before.keys() | after.keys():
+        adjust(db_session, key, after[key] - before[key])
+
+
+def rebuild(db_session):
+    """Recompute every facet count from the jobs table in one set-based pass."""
+    db_session.query(JobFacetCount).delete(synchronize_session=False)
+    columns = [func.coalesce(getattr(Job, field), '') for field in FACET_FIELDS]
+    db_session.execute(insert(JobFacetCount.__table__).from_select(
+        list(FACET_FIELDS) + ['count'],
+        select(*columns, func.count()).where(Job.job_status == 'active').group_by(*columns)))
+    db_session.commit()
+
+
+def facet_counts(db_session, **filters):
+    """
+    Count active jobs per value of every facet. Each facet is constrained
+    by the filters on the *other* facets, so a sidebar shows how many jobs
+    each choice would leave. Runs one GROUP BY per facet over the stored
+    combinations, plus one for the total.
+    """
+    filters = {field: value for field, value in filters.items()
+               if field in FACET_FIELDS and value not in (None, '')}
+
+    def matching(*except_fields):
+        return [JobFacetCount.count > 0] + [
+            getattr(JobFacetCount, field) == value
+            for field, value in filters.items() if field not in except_fields]
+
+    facets = {}
+    for field in FACET_FIELDS:
+        column = getattr(JobFacetCount, field)
+        rows = db_session.query(column, func.sum(JobFacetCount.count)) \
+            .filter(*matching(field)).group_by(column).all()
+        facets[field] = [{'value': value, 'count': int(count)} for value, count in
+                         sorted(rows, key=lambda item: (-item[1], item[0]))]
+    total = db_session.query(func.sum(JobFacetCount.count)).filter(*matching()).scalar()
+    return {'total': int(total or 0), 'facets': facets}
+
+
+@click.command('rebuild-facets')
+@with_appcontext
+def rebuild_facets_command():
+    """Recompute the facet counts from the jobs table."""
+    rebuild(db.session)
+    click.echo('Rebuilt facet counts')
@@ -0,0 +1,32 @@
+from sqlalchemy.orm import load_only
+
+
+class InvalidFields(ValueError):
+    """Raised when ?fields= names a field the resource does not have."""
+
+
+def parse_fields(raw, model):
+    """
+    Parse a comma-separated ?fields= value against `model.SERIALIZED_FIELDS`.
+    Returns the requested fields in serialization order, always including
+    `id`, or None for the full representation.
+    """
+    requested = {name.strip() for name in (raw or '').split(',') if name.strip()}
+    if not requested:
+        return None
+    unknown = sorted(requested - set(model.SERIALIZED_FIELDS))
+    if unknown:
+        raise InvalidFields(f'Unknown fields: {", ".join(unknown)}')
+    requested.add('id')
+    return tuple(field for field in model.SERIALIZED_FIELDS if field in requested)
+
+
+def project(query, model, fields, *required):
+    """
+    Load only `fields` (plus `required` columns the caller needs, and the
+    primary key) instead of every column of `model`.
+    """
+    if fields is None:
+        return query
+    columns = dict.fromkeys(fields + required)
+    return query.options(load_only(*(getattr(model, column) for column in columns)))
@@ -0,0 +1,147 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class UpstreamError(Exception):
+    """Raised when an upstream call fails after all retries."""
+
+
+class CircuitOpenError(UpstreamError):
+    """Raised without calling upstream while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After `failure_threshold` failures in a row the circuit opens and calls
+    fail fast for `reset_timeout` seconds. Then a single trial call is let
+    through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def allow(self):
+        """Return True if a call may go upstream now."""
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def _state(self, now):
+        if self._opened_at is None:
+            return self.CLOSED
+        if now - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+
+class HttpClient:
+    """
+    Shared HTTP client for an upstream API.
+
+    A single requests.Session keeps connections alive across calls. Each
+    call is bounded by an overall deadline that covers every retry; 5xx
+    responses, connection errors and timeouts are retried with full-jitter
+    exponential backoff, and a circuit breaker fails fast while the
+    upstream is down.
+    """
+
+    RETRY_STATUSES = frozenset(range(500, 600))
+
+    def __init__(self, base_url, headers=None, deadline=10.0, max_retries=3,
+                 backoff_base=0.2, backoff_max=2.0, pool_size=20, breaker=None):
+        self.base_url = base_url.rstrip('/')
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def post_json(self, path, payload, deadline=None):
+        """POST `payload` as JSON to `path` and return the decoded response."""
+        return self.request('POST', path, json=payload, deadline=deadline).json()
+
+    def request(self, method, path, deadline=None, **kwargs):
+        """
+        Send a request, retrying transient failures until `deadline`
+        seconds have elapsed. Raises UpstreamError on final failure.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f'Circuit open for {self.base_url}')
+
+        url = f'{self.base_url}/{path.lstrip("/")}'
+        expires_at = time.monotonic() + (deadline or self.deadline)
+        attempt = 0
+        while True:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                self.breaker.record_failure()
+                raise UpstreamError(f'Deadline exceeded calling {url}')
+            try:
+                response = self.session.request(method, url, timeout=remaining, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as err:
+                error = err
+            except requests.RequestException as err:
+                # Not transient (bad URL, redirect loop, broken body): fail without retrying,
+                # but still settle the breaker so a half-open trial is released
+                self.breaker.record_failure()
+                raise UpstreamError(str(err)) from err
+            else:
+                if response.status_code not in self.RETRY_STATUSES:
+                    self.breaker.record_success()
+                    response.raise_for_status()
+                    return response
+                error = requests.HTTPError(
+                    f'{response.status_code} Server Error for url: {url}', response=response)
+
+            attempt += 1
+            if attempt > self.max_retries:
+                self.breaker.record_failure()
+                raise UpstreamError(str(error)) from error
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+            if time.monotonic() + delay >= expires_at:
+                self.breaker.record_failure()
+                raise UpstreamError(f'Deadline exceeded calling {url}') from error
+            time.sleep(delay)
@@ -0,0 +1,53 @@
+import os
+from collections import namedtuple
+
+from flask import current_app, g
+
+from db import db
+from models.user import User
+from services.cache import TTLCache
+
+# What authenticated routes need to know about the caller, without the
+# profile columns of a full User row
+Principal = namedtuple('Principal', 'id role')
+
+# No stale serving: a background refresh would run outside the app context
+identity_cache = TTLCache(
+    maxsize=int(os.getenv('IDENTITY_CACHE_SIZE', '10000')),
+    ttl=float(os.getenv('IDENTITY_CACHE_TTL', '60')),
+    max_stale=0,
+)
+
+
+def load_principal(identity):
+    """
+    Resolve a JWT identity to a Principal, or None if the user no longer
+    exists. Memoized for the request in `g`, then served from the
+    process-wide cache before falling back to one indexed query.
+    """
+    principals = g.setdefault('principals', {})
+    if identity not in principals:
+        principals[identity] = identity_cache.get_or_load(identity, lambda: _fetch(identity))
+    return principals[identity]
+
+
+def _fetch(identity):
+    row = db.session.query(User.id, User.role).filter(User.id == identity).first()
+    return Principal(*row) if row else None
+
+
+def invalidate(user_id):
+    """Drop the cached principal of a user after it changed or was deleted."""
+    identity_cache.invalidate(user_id)
+    g.pop('principals', None)
+
+
+def init_identity(jwt):
+    """
+    Register the principal loader with flask_jwt_extended, so every
+    @jwt_required route rejects tokens of deleted users and exposes the
+    caller as `current_user`.
+    """
+    @jwt.user_lookup_loader
+    def user_lookup(jwt_header, jwt_data):
+        return load_principal(jwt_data[current_app.config.get('JWT_IDENTITY_CLAIM', 'sub')])
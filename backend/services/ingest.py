@@ -0,0 +1,188 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+
+import click
+from flask.cli import with_appcontext
+
+from db import db
+from models.company import Company
+from models.ingest_checkpoint import IngestCheckpoint
+from models.job import Job
+from services.bulk import bulk_insert, bulk_upsert
+from services import alerts, company_profile, facets
+from services.dedup import dedupe_unfingerprinted
+from services.job_providers import PROVIDERS, configured_providers
+from services.locations import location_columns
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Columns refreshed when a listing we already hold is ingested again.
+# job_status is left alone so re-ingesting never reopens a closed or
+# collapsed duplicate listing.
+JOB_UPDATE_COLUMNS = ('job_title', 'description', 'job_type', 'location',
+                      'application_deadline', 'category', 'company_id',
+                      'experience_level', 'application_link', 'place_id', 'country_code',
+                      'utc_offset', 'is_remote', 'updated_at')
+
+
+def clip(model, field, value, default=''):
+    """Fit `value` into a String column, substituting `default` for empty values."""
+    if value in (None, ''):
+        value = default
+    length = getattr(model.__table__.c[field].type, 'length', None)
+    if isinstance(value, str) and length:
+        return value[:length]
+    return value
+
+
+def resolve_companies(db_session, listings):
+    """
+    Map the company names in `listings` to company ids, creating missing
+    companies with one multi-row INSERT.
+    """
+    names = {clip(Company, 'company_name', job.get('company_name'), 'Unknown')
+             for job in listings}
+    existing = dict(db_session.query(Company.company_name, Company.id)
+                    .filter(Company.company_name.in_(names)))
+    missing = [name for name in names if name not in existing]
+    if missing:
+        bulk_insert(db_session, Company, [{
+            'company_name': name,
+            'description': '',
+            'website_url': '',
+            'company_size': 'Unknown',
+            'industry': 'Unknown',
+            'contact_email': '',
+        } for name in missing])
+        existing.update(db_session.query(Company.company_name, Company.id)
+                        .filter(Company.company_name.in_(missing)))
+    return existing
+
+
+def map_job_rows(listings, company_ids, source):
+    """Turn normalised provider listings into `jobs` rows keyed by source id."""
+    rows = {}
+    now = datetime.utcnow()
+    for job in listings:
+        source_id = job.get('source_id') or job.get('application_link')
+        if not source_id or not job.get('job_title') or not job.get('application_link'):
+            continue
+        company_name = clip(Company, 'company_name', job.get('company_name'), 'Unknown')
+        rows[source_id] = {
+            'source': source,
+            'source_id': clip(Job, 'source_id', source_id),
+            'job_title': clip(Job, 'job_title', job['job_title']),
+            'description': job.get('description') or '',
+            'job_type': clip(Job, 'job_type', job.get('job_type'), 'Unknown'),
+            'location': clip(Job, 'location', job.get('location'), 'Remote'),
+            'date_posted': job.get('date_posted') or now,
+            'application_deadline': job.get('application_deadline'),
+            'category': clip(Job, 'category', job.get('category'), 'Other'),
+            'company_id': company_ids[company_name],
+            'experience_level': clip(Job, 'experience_level', job.get('experience_level'), 'Unknown'),
+            'job_status': clip(Job, 'job_status', job.get('job_status'), 'active'),
+            'application_link': clip(Job, 'application_link', job['application_link']),
+            'updated_at': now,
+        }
+        rows[source_id].update(location_columns(rows[source_id]['location']))
+    return list(rows.values())
+
+
+def upsert_listings(db_session, listings, source):
+    """Bulk-upsert one batch of listings keyed by (source, source_id). Does not commit."""
+    if not listings:
+        return 0
+    rows = map_job_rows(listings, resolve_companies(db_session, listings), source)
+    listed = (Job.source == source, Job.source_id.in_([row['source_id'] for row in rows]))
+    before = facets.count_keys(db_session, *listed)
+    bulk_upsert(db_session, Job, rows, ['source', 'source_id'], JOB_UPDATE_COLUMNS)
+    facets.apply_change(db_session, before, facets.count_keys(db_session, *listed))
+    return len(rows)
+
+
+def ingest_query(db_session, provider, query, batch_size=DEFAULT_BATCH_SIZE, max_pages=100):
+    """
+    Page through `provider` results for `query`, resuming from the stored
+    checkpoint. Each batch is committed together with the checkpoint, so a
+    crash loses at most the page in flight, and re-ingesting it is
+    idempotent.
+    """
+    checkpoint = IngestCheckpoint.get_or_create(db_session, provider.name, query)
+    total = 0
+    for _ in range(max_pages):
+        listings = asyncio.run(provider.fetch(query, page=checkpoint.next_page))
+        if not listings:
+            checkpoint.next_page = 1
+            checkpoint.completed_at = datetime.utcnow()
+            checkpoint.updated_at = datetime.utcnow()
+            db_session.commit()
+            break
+
+        for start in range(0, len(listings), batch_size):
+            count = upsert_listings(db_session, listings[start:start + batch_size], provider.name)
+            checkpoint.jobs_ingested += count
+            total += count
+            if start + batch_size >= len(listings):
+                checkpoint.next_page += 1
+            checkpoint.updated_at = datetime.utcnow()
+            db_session.commit()
+    return total
+
+
+def run_ingest(db_session, providers, queries, batch_size=DEFAULT_BATCH_SIZE, max_pages=100):
+    """Ingest every query from every provider; returns the number of rows upserted."""
+    total = 0
+    for provider in providers:
+        for query in queries:
+            try:
+                started = time.monotonic()
+                since = datetime.utcnow()
+                count = ingest_query(db_session, provider, query, batch_size, max_pages)
+                elapsed = time.monotonic() - started
+                total += count
+                click.echo(f'{provider.name} "{query}": {count} jobs in {elapsed:.2f}s')
+                _, duplicates = dedupe_unfingerprinted(
+                    db_session, Job.source == provider.name, batch_size=batch_size)
+                if duplicates:
+                    click.echo(f'{provider.name} "{query}": collapsed {duplicates} duplicates')
+                changed = (Job.source == provider.name, Job.updated_at >= since)
+                company_profile.invalidate(*(company_id for (company_id,) in db_session
+                                             .query(Job.company_id).filter(*changed).distinct()))
+                alerts.percolate(db_session, *changed)
+            except Exception as err:
+                db_session.rollback()
+                click.echo(f'{provider.name} "{query}" failed: {err}', err=True)
+    return total
+
+
+@click.command('ingest')
+@click.option('--query', '-q', 'queries', multiple=True,
+              help='Search query to ingest; repeatable. Defaults to INGEST_QUERIES.')
+@click.option('--provider', '-p', 'provider_names', multiple=True,
+              help='Provider name; repeatable. Defaults to JOB_PROVIDERS.')
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True,
+              help='Rows per INSERT statement and transaction.')
+@click.option('--max-pages', default=100, show_default=True,
+              help='Maximum provider pages per query and run.')
+@click.option('--interval', type=float, default=None,
+              help='Keep running, starting a new pass every INTERVAL seconds.')
+@with_appcontext
+def ingest_command(queries, provider_names, batch_size, max_pages, interval):
+    """Fetch external listings and bulk-upsert them into the jobs table."""
+    queries = queries or [query.strip() for query in
+                          os.getenv('INGEST_QUERIES', '').split(',') if query.strip()]
+    if not queries:
+        raise click.UsageError('No queries given; pass --query or set INGEST_QUERIES')
+    unknown = [name for name in provider_names if name not in PROVIDERS]
+    if unknown:
+        raise click.UsageError(f'Unknown provider(s): {", ".join(unknown)}')
+    providers = [PROVIDERS[name] for name in provider_names] or configured_providers()
+
+    while True:
+        total = run_ingest(db.session, providers, queries, batch_size, max_pages)
+        click.echo(f'Ingested {total} jobs')
+        if interval is None:
+            break
+        time.sleep(interval)
@@ -0,0 +1,164 @@
+from datetime import datetime
+from itertools import islice
+
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload
+
+from models.company import Company
+from models.job import Job
+from services import alerts, company_profile, dedup, facets
+from services.locations import location_columns
+from services.search_index import job_index
+from services.recommendations import job_recommender
+
+REQUIRED_FIELDS = ('job_title', 'description', 'job_type', 'category',
+                   'company_id', 'experience_level', 'application_link')
+STRING_FIELDS = ('job_title', 'description', 'job_type', 'category',
+                 'experience_level', 'application_link', 'location')
+DEFAULT_CHUNK_SIZE = 500
+
+
+class RowError(ValueError):
+    """A submitted job row failed validation."""
+
+
+def validate_job_row(record, now):
+    """Turn one submitted record into a `jobs` row dict or raise RowError."""
+    if not isinstance(record, dict):
+        raise RowError('Row must be a JSON object')
+    missing = [key for key in REQUIRED_FIELDS if record.get(key) in (None, '')]
+    if missing:
+        raise RowError(f'Missing required fields: {", ".join(missing)}')
+
+    row = {key: record[key] for key in REQUIRED_FIELDS}
+    if not isinstance(row['company_id'], int) or isinstance(row['company_id'], bool):
+        raise RowError('company_id must be an integer')
+    for key in STRING_FIELDS:
+        value = record.get(key)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            raise RowError(f'{key} must be a string')
+        length = getattr(Job.__table__.c[key].type, 'length', None)
+        if length and len(value) > length:
+            raise RowError(f'{key} exceeds {length} characters')
+
+    deadline = record.get('application_deadline')
+    if deadline:
+        try:
+            deadline = datetime.fromisoformat(deadline)
+        except (TypeError, ValueError):
+            raise RowError('application_deadline must be an ISO 8601 date')
+
+    row.update(
+        location=record.get('location') or 'Remote',
+        application_deadline=deadline or None,
+        date_posted=now,
+        job_status='active',
+    )
+    row.update(location_columns(row['location']))
+    return row
+
+
+def import_jobs(db_session, records, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Validate and insert streamed (index, record, error) tuples, yielding
+    one result dict per row. Rows are inserted `chunk_size` at a time with
+    a single multi-row INSERT per chunk, each chunk in its own
+    transaction, so only one chunk is ever held in memory. If reading
+    `records` fails, the rows read so far are still imported and reported
+    before the error is re-raised.
+    """
+    records = iter(records)
+    while True:
+        chunk = []
+        try:
+            for record in islice(records, chunk_size):
+                chunk.append(record)
+        except Exception:
+            yield from _import_chunk(db_session, chunk)
+            raise
+        if not chunk:
+            return
+        yield from _import_chunk(db_session, chunk)
+
+
+def _import_chunk(db_session, chunk):
+    now = datetime.utcnow()
+    results, valid = {}, []
+    for index, record, error in chunk:
+        if error is None:
+            try:
+                valid.append((index, validate_job_row(record, now)))
+                continue
+            except RowError as err:
+                error = str(err)
+        results[index] = {'index': index, 'status': 'error', 'error': error}
+
+    company_ids = {row['company_id'] for _, row in valid}
+    known = {company_id for (company_id,) in db_session.query(Company.id)
+             .filter(Company.id.in_(company_ids))} if company_ids else set()
+    rows = []
+    for index, row in valid:
+        if row['company_id'] in known:
+            rows.append((index, row))
+        else:
+            results[index] = {'index': index, 'status': 'error', 'error': 'Company not found'}
+
+    if rows:
+        try:
+            job_ids = _insert_rows(db_session, [row for _, row in rows])
+            duplicates = _dedupe_and_count(db_session, job_ids)
+            db_session.commit()
+        except Exception as err:
+            db_session.rollback()
+            for index, _ in rows:
+                results[index] = {'index': index, 'status': 'error', 'error': f'Insert failed: {err}'}
+        else:
+            company_profile.invalidate(*{row['company_id'] for _, row in rows})
+            for (index, _), job_id in zip(rows, job_ids):
+                results[index] = {'index': index, 'status': 'created', 'id': job_id}
+                if job_id in duplicates:
+                    results[index].update(status='duplicate', canonical_id=duplicates[job_id])
+            _after_commit(db_session, job_ids)
+
+    for index, _, _ in chunk:
+        yield results[index]
+
+
+def _insert_rows(db_session, rows):
+    """
+    Insert `rows` into `jobs` and return their ids in row order: one
+    multi-row INSERT ... RETURNING where the dialect supports it (MySQL
+    does not), otherwise one INSERT per row. Does not commit.
+    """
+    table = Job.__table__
+    if db_session.get_bind().dialect.insert_executemany_returning:
+        return db_session.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True), rows).scalars().all()
+    return [db_session.execute(insert(table).values(row)).inserted_primary_key[0] for row in rows]
+
+
+def _dedupe_and_count(db_session, job_ids):
+    """
+    Count and fingerprint a freshly inserted chunk of jobs in the insert's
+    transaction, so a chunk is committed with its duplicates already
+    collapsed. Returns {job_id: canonical_id} for the duplicates. Does not
+    commit.
+    """
+    for key, count in facets.count_keys(db_session, Job.id.in_(job_ids)).items():
+        facets.adjust(db_session, key, count)
+    dedup.dedupe_unfingerprinted(db_session, Job.id.in_(job_ids), commit=False)
+    return dict(db_session.query(Job.id, Job.canonical_id)
+                .filter(Job.id.in_(job_ids), Job.canonical_id.isnot(None)))
+
+
+def _after_commit(db_session, job_ids):
+    """Index a committed chunk of jobs and notify saved searches matching it."""
+    if job_index.built or job_recommender.built:
+        for job in db_session.query(Job).options(joinedload(Job.company)) \
+                .filter(Job.id.in_(job_ids)):
+            job_index.upsert(job)
+            job_recommender.upsert(job)
+
+    alerts.percolate(db_session, Job.id.in_(job_ids))
@@ -0,0 +1,152 @@
+import asyncio
+import os
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+
+from flask import current_app
+
+from services.job_service import search_jobs
+
+DEFAULT_PROVIDER_TIMEOUT = float(os.getenv('PROVIDER_TIMEOUT', '5'))
+
+# Keys of Job.to_dict(); every provider result is normalised to this shape
+JOB_FIELDS = ('id', 'job_title', 'description', 'job_type', 'location',
+              'date_posted', 'application_deadline', 'category', 'company_id',
+              'experience_level', 'job_status', 'application_link')
+
+
+class JobProvider(ABC):
+    """
+    Base class for external job listing providers.
+
+    Subclasses set `name` and implement `search`, returning raw listings
+    for one page of results, and `normalize`, mapping one raw listing onto
+    the Job.to_dict() shape.
+    """
+
+    name = None
+    timeout = DEFAULT_PROVIDER_TIMEOUT
+
+    @abstractmethod
+    async def search(self, query, page=1):
+        """Return the raw listings of one page of results for `query`."""
+
+    @abstractmethod
+    def normalize(self, listing):
+        """Map one raw listing onto (part of) the Job.to_dict() shape."""
+
+    async def fetch(self, query, page=1):
+        """Search and normalise one page of results."""
+        listings = await self.search(query, page=page)
+        results = []
+        for listing in listings or []:
+            job = dict.fromkeys(JOB_FIELDS)
+            job.update(self.normalize(listing))
+            job['source'] = self.name
+            results.append(job)
+        return results
+
+
+class ApiJobsProvider(JobProvider):
+    """apijobs.dev, reached through the cached, pooled search_jobs client."""
+
+    name = 'apijobs'
+
+    async def search(self, query, page=1):
+        if page > 1:
+            # The search endpoint we use does not page; one call returns all hits
+            return []
+        response = await asyncio.to_thread(search_jobs, query)
+        if response is None:
+            raise RuntimeError('apijobs search failed')
+        return response.get('hits', []) if isinstance(response, dict) else response
+
+    def normalize(self, listing):
+        return {
+            'source_id': str(listing.get('id')) if listing.get('id') is not None else None,
+            'job_title': listing.get('title'),
+            'description': listing.get('description'),
+            'job_type': listing.get('employment_type'),
+            'location': listing.get('location') or 'Remote',
+            'date_posted': parse_datetime(listing.get('published_at')),
+            'category': listing.get('industry') or listing.get('category'),
+            'company_name': listing.get('hiring_organization_name'),
+            'experience_level': listing.get('experience_level'),
+            'job_status': 'active',
+            'application_link': listing.get('url'),
+        }
+
+
+PROVIDERS = {provider.name: provider for provider in (ApiJobsProvider(),)}
+
+
+def register_provider(provider):
+    """Make a provider available to the aggregator under `provider.name`."""
+    PROVIDERS[provider.name] = provider
+
+
+def configured_providers():
+    """Providers enabled through the comma separated JOB_PROVIDERS setting."""
+    names = os.getenv('JOB_PROVIDERS', ','.join(PROVIDERS))
+    return [PROVIDERS[name.strip()] for name in names.split(',')
+            if name.strip() in PROVIDERS]
+
+
+def parse_datetime(value):
+    """Parse an ISO 8601 timestamp from a provider, returning naive UTC or None."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def dedupe_key(job):
+    """Identity of a listing across providers: link, else title+company+location."""
+    if job.get('application_link'):
+        return ('link', job['application_link'].strip().lower().rstrip('/'))
+    return ('text',) + tuple(
+        re.sub(r'\W+', ' ', (job.get(field) or '').lower()).strip()
+        for field in ('job_title', 'company_name', 'location'))
+
+
+async def _fetch_with_timeout(provider, query, page):
+    return await asyncio.wait_for(provider.fetch(query, page=page), provider.timeout)
+
+
+async def aggregate_search(query, providers=None, page=1):
+    """
+    Query every provider concurrently and merge their results.
+
+    Each provider is bounded by its own timeout, so the total latency is
+    that of the slowest provider that answers in time. Providers that time
+    out or fail are reported in `providers` and contribute no results.
+    """
+    providers = configured_providers() if providers is None else providers
+    outcomes = await asyncio.gather(
+        *(_fetch_with_timeout(provider, query, page) for provider in providers),
+        return_exceptions=True)
+
+    items, seen, status = [], set(), {}
+    for provider, outcome in zip(providers, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            status[provider.name] = 'timeout'
+            continue
+        if isinstance(outcome, Exception):
+            current_app.logger.warning('Provider %s failed: %s', provider.name, outcome)
+            status[provider.name] = 'error'
+            continue
+        status[provider.name] = 'ok'
+        for job in outcome:
+            key = dedupe_key(job)
+            if key not in seen:
+                seen.add(key)
+                items.append(job)
+
+    items.sort(key=lambda job: job['date_posted'] or datetime.min, reverse=True)
+    return {'items': items, 'providers': status}
@@ -1,6 +1,8 @@
 import os
 import requests
 from dotenv import load_dotenv
+from services.cache import TTLCache
+from services.http_client import CircuitBreaker, HttpClient, UpstreamError
 
 # Load environment variables from the .env file
 load_dotenv()
@@ -11,15 +13,43 @@ HEADERS = {
     'Content-Type': 'application/json',
 }
 
+apijobs_client = HttpClient(
+    os.getenv('APIJOBS_BASE_URL', 'https://api.apijobs.dev'),
+    headers=HEADERS,
+    deadline=float(os.getenv('APIJOBS_DEADLINE', '10')),
+    max_retries=int(os.getenv('APIJOBS_MAX_RETRIES', '3')),
+    pool_size=int(os.getenv('APIJOBS_POOL_SIZE', '20')),
+    breaker=CircuitBreaker(
+        failure_threshold=int(os.getenv('APIJOBS_BREAKER_THRESHOLD', '5')),
+        reset_timeout=float(os.getenv('APIJOBS_BREAKER_RESET', '30')),
+    ),
+)
+
+search_cache = TTLCache(
+    maxsize=int(os.getenv('SEARCH_CACHE_SIZE', '1024')),
+    ttl=float(os.getenv('SEARCH_CACHE_TTL', '300')),
+    max_stale=float(os.getenv('SEARCH_CACHE_MAX_STALE', '3600')),
+)
+
+
+def normalize_query(query):
+    """Canonical cache key for a search query: lowercased, single-spaced."""
+    return ' '.join(query.lower().split())
+
 
 def search_jobs(query):
+    """Fetch job listings, served from the search cache when possible."""
+    key = normalize_query(query)
+    return search_cache.get_or_load(key, lambda: fetch_jobs(key))
+
+
+def fetch_jobs(query):
     """Fetch job listings from the API."""
-    data = f'{{"q": "{query}"}}'  # Adjust query format if needed
     try:
-        response = requests.post(
-            'https://api.apijobs.dev/v1/job/search', headers=HEADERS, data=data)
-        response.raise_for_status()  # Raise an error for bad responses
-        return response.json()  # Return the job listings data
+        return apijobs_client.post_json('/v1/job/search', {'q': query})
+    except UpstreamError as err:
+        print(f"Upstream error occurred: {err}")
+        return None
     except requests.exceptions.HTTPError as err:
         print(f"HTTP error occurred: {err}")
         return None
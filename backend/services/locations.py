@@ -0,0 +1,273 @@
+import csv
+import math
+import os
+import re
+import threading
+from collections import namedtuple
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import bindparam, update
+
+from db import db
+from models.job import Job
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+GAZETTEER_PATH = os.path.join(DATA_DIR, 'gazetteer.csv')
+COUNTRIES_PATH = os.path.join(DATA_DIR, 'countries.csv')
+
+EARTH_RADIUS_KM = 6371.0
+# Side of a cell of the in-memory place grid, in degrees
+GRID_DEGREES = 1.0
+MAX_RADIUS_KM = 1000
+
+REMOTE_RE = re.compile(r'\b(remote|anywhere|worldwide|work from home|wfh|distributed)\b')
+SPLIT_RE = re.compile(r'\s*[,/|;()]+\s*|\s+[-–]\s+')
+OFFSET_RE = re.compile(r'^(?:utc|gmt)?\s*([+-])(\d{1,2})(?::?(\d{2}))?$')
+
+# Region names accepted by the region filter beyond the regions of countries.csv
+REGION_GROUPS = {
+    'emea': ('Europe', 'Middle East', 'Africa'),
+    'apac': ('Asia', 'Oceania'),
+    'latam': ('Latin America',),
+    'americas': ('North America', 'Latin America'),
+}
+
+Place = namedtuple('Place', 'id name country_code latitude longitude utc_offset')
+Country = namedtuple('Country', 'code name region utc_offset')
+# The normalized form of a free-text location; place_id is None when only
+# the country (or nothing beyond "remote") could be recognized.
+Location = namedtuple('Location', 'place_id country_code utc_offset is_remote')
+
+
+def _normalize_text(text):
+    return ' '.join(text.lower().replace('.', ' ').split())
+
+
+class Gazetteer:
+    """
+    Offline place and country lookup loaded from the CSV files in data/,
+    with a grid index over place coordinates for radius searches.
+    """
+
+    def __init__(self, places_path=GAZETTEER_PATH, countries_path=COUNTRIES_PATH):
+        self._places_path = places_path
+        self._countries_path = countries_path
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self.countries = {}
+            self._country_names = {}
+            with open(self._countries_path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    country = Country(row['code'], row['name'], row['region'], int(row['utc_offset']))
+                    self.countries[country.code] = country
+                    for name in [row['name']] + row['aliases'].split('|'):
+                        if name:
+                            self._country_names[_normalize_text(name)] = country.code
+
+            self.places = {}
+            self._place_names = {}   # normalized name -> [place ids], gazetteer order
+            self._grid = {}          # (lat cell, lon cell) -> [place ids]
+            with open(self._places_path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    place = Place(row['id'], row['name'], row['country_code'],
+                                  float(row['latitude']), float(row['longitude']),
+                                  int(row['utc_offset']))
+                    self.places[place.id] = place
+                    for name in [row['name']] + row['aliases'].split('|'):
+                        if name:
+                            self._place_names.setdefault(_normalize_text(name), []).append(place.id)
+                    self._grid.setdefault(self._cell(place.latitude, place.longitude), []) \
+                        .append(place.id)
+            self._loaded = True
+
+    @staticmethod
+    def _cell(latitude, longitude):
+        return (math.floor(latitude / GRID_DEGREES), math.floor(longitude / GRID_DEGREES))
+
+    def normalize(self, text):
+        """Map a free-text location to a Location, or None if nothing is recognized."""
+        if not text:
+            return None
+        self._ensure_loaded()
+        raw = text.strip().lower()
+        is_remote = bool(REMOTE_RE.search(raw))
+        cleaned = REMOTE_RE.sub(' ', raw)
+        parts = [_normalize_text(part) for part in SPLIT_RE.split(cleaned)]
+        parts = [part for part in parts if part]
+        whole = _normalize_text(cleaned)
+
+        country_code, hints = None, set()
+        for part in parts:
+            if part in self._country_names:
+                country_code = self._country_names[part]
+            elif len(part) == 2 and part.upper() in self.countries:
+                # Bare codes such as "CA" are often states; only use them to disambiguate
+                hints.add(part.upper())
+        if country_code:
+            hints.add(country_code)
+
+        for candidate in [whole] + parts:
+            place_ids = self._place_names.get(candidate)
+            if place_ids:
+                place = next((self.places[place_id] for place_id in place_ids
+                              if self.places[place_id].country_code in hints),
+                             self.places[place_ids[0]])
+                return Location(place.id, place.country_code, place.utc_offset, is_remote)
+
+        if country_code:
+            return Location(None, country_code, self.countries[country_code].utc_offset, is_remote)
+        if is_remote:
+            return Location(None, None, None, True)
+        return None
+
+    def country_code(self, text):
+        """ISO code for a country name, alias or code, or None."""
+        self._ensure_loaded()
+        text = _normalize_text(text or '')
+        if text.upper() in self.countries:
+            return text.upper()
+        return self._country_names.get(text)
+
+    def region_countries(self, region):
+        """Country codes in a region (e.g. "Europe", "EMEA"), or None if unknown."""
+        self._ensure_loaded()
+        key = _normalize_text(region or '')
+        regions = {name.lower() for name in REGION_GROUPS.get(key, (region,))}
+        codes = [country.code for country in self.countries.values()
+                 if country.region.lower() in regions]
+        return codes or None
+
+    def places_within(self, latitude, longitude, radius_km):
+        """Ids of places within `radius_km` of a point, via the grid index."""
+        self._ensure_loaded()
+        lat_span = radius_km / 111.0
+        lon_span = radius_km / (111.0 * max(math.cos(math.radians(latitude)), 0.01))
+        low_lat, low_lon = self._cell(latitude - lat_span, longitude - lon_span)
+        high_lat, high_lon = self._cell(latitude + lat_span, longitude + lon_span)
+        found = []
+        for lat_cell in range(low_lat, high_lat + 1):
+            for lon_cell in range(low_lon, high_lon + 1):
+                # Wrap longitude cells across the antimeridian
+                wrapped = (lon_cell + 180) % 360 - 180
+                for place_id in self._grid.get((lat_cell, wrapped), ()):
+                    place = self.places[place_id]
+                    if haversine_km(latitude, longitude, place.latitude,
+                                    place.longitude) <= radius_km:
+                        found.append(place_id)
+        return found
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + \
+        math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def parse_utc_offset(value):
+    """Minutes east of UTC for "+03:00", "UTC-5" or an IANA zone name; None if invalid."""
+    value = (value or '').strip()
+    match = OFFSET_RE.match(value.lower())
+    if match:
+        sign, hours, minutes = match.groups()
+        offset = int(hours) * 60 + int(minutes or 0)
+        return -offset if sign == '-' else offset
+    try:
+        # Standard (January) offset, matching the gazetteer's offsets
+        return int(datetime(2025, 1, 15, tzinfo=ZoneInfo(value)).utcoffset().total_seconds() // 60)
+    except Exception:
+        return None
+
+
+gazetteer = Gazetteer()
+
+
+def location_columns(text):
+    """The normalized `jobs` location columns for a free-text location."""
+    location = gazetteer.normalize(text)
+    if location is None:
+        return {'place_id': None, 'country_code': None, 'utc_offset': None, 'is_remote': False}
+    return location._asdict()
+
+
+def apply_location(job):
+    """Set a Job's normalized location columns from its `location` text."""
+    for column, value in location_columns(job.location).items():
+        setattr(job, column, value)
+
+
+class InvalidLocationFilter(ValueError):
+    """Raised when a location filter names an unknown place, region or timezone."""
+
+
+def filter_by_location(query, near=None, radius_km=None, country=None, region=None,
+                       remote_tz=None, tz_hours=None):
+    """
+    Narrow a Job query by the normalized location columns; every filter
+    is an indexed IN or range lookup.
+
+    near/radius_km: jobs at a known place within radius_km of `near`.
+    country/region: jobs located in, or remote-restricted to, that area.
+    remote_tz/tz_hours: remote jobs whose home timezone is within tz_hours
+    of remote_tz, plus remote jobs with no location restriction.
+    """
+    if near:
+        center = gazetteer.normalize(near)
+        if center is None or center.place_id is None:
+            raise InvalidLocationFilter(f'Unknown place: {near}')
+        place = gazetteer.places[center.place_id]
+        radius_km = min(max(radius_km or 50, 0), MAX_RADIUS_KM)
+        query = query.filter(Job.place_id.in_(
+            gazetteer.places_within(place.latitude, place.longitude, radius_km)))
+    if country:
+        code = gazetteer.country_code(country)
+        if code is None:
+            raise InvalidLocationFilter(f'Unknown country: {country}')
+        query = query.filter(Job.country_code == code)
+    if region:
+        codes = gazetteer.region_countries(region)
+        if codes is None:
+            raise InvalidLocationFilter(f'Unknown region: {region}')
+        query = query.filter(Job.country_code.in_(codes))
+    if remote_tz:
+        offset = parse_utc_offset(remote_tz)
+        if offset is None:
+            raise InvalidLocationFilter(f'Unknown timezone: {remote_tz}')
+        window = int((3 if tz_hours is None else tz_hours) * 60)
+        query = query.filter(Job.is_remote.is_(True)).filter(
+            Job.utc_offset.between(offset - window, offset + window) | Job.utc_offset.is_(None))
+    return query
+
+
+@click.command('normalize-locations')
+@click.option('--all', 'renormalize', is_flag=True,
+              help='Recompute every job, not only those never normalized.')
+@with_appcontext
+def normalize_locations_command(renormalize):
+    """Fill the normalized location columns of jobs from their location text."""
+    query = db.session.query(Job.location).distinct()
+    if not renormalize:
+        query = query.filter(Job.place_id.is_(None), Job.country_code.is_(None),
+                             Job.is_remote.isnot(True))
+    # One UPDATE per distinct location string rather than per job
+    rows = [dict({f'new_{column}': value for column, value in location_columns(text).items()},
+                 match_location=text)
+            for (text,) in query if text is not None]
+    if rows:
+        table = Job.__table__
+        db.session.execute(
+            update(table).where(table.c.location == bindparam('match_location'))
+            .values({column: bindparam(f'new_{column}') for column in Location._fields}),
+            rows)
+        db.session.commit()
+    click.echo(f'Normalized {len(rows)} distinct locations')
@@ -0,0 +1,38 @@
+import base64
+import json
+from datetime import datetime
+
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def clamp_per_page(per_page, default=DEFAULT_PER_PAGE, maximum=MAX_PER_PAGE):
+    """Bound a client supplied page size to [1, maximum]."""
+    if per_page is None:
+        return default
+    return max(1, min(per_page, maximum))
+
+
+def encode_cursor(*values):
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    payload = [value.isoformat() if isinstance(value, datetime) else value
+               for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, *types):
+    """Decode a cursor produced by `encode_cursor` back into typed values."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise InvalidCursor(cursor)
+        return tuple(datetime.fromisoformat(value) if type_ is datetime else type_(value)
+                     for type_, value in zip(types, payload))
+    except (ValueError, TypeError, UnicodeError) as err:
+        raise InvalidCursor(cursor) from err
@@ -0,0 +1,120 @@
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import (
+    DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash)
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+
+
+class HasherBusy(RuntimeError):
+    """Too many password hashes are queued; the caller should retry later."""
+
+
+def normalize_method(method):
+    """
+    Spell a werkzeug hash method out with all of its parameters, as it
+    appears at the start of the hashes it produces, e.g. 'pbkdf2' becomes
+    'pbkdf2:sha256:600000'.
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        defaults = ['32768', '8', '1']
+    elif name == 'pbkdf2':
+        defaults = ['sha256', str(DEFAULT_PBKDF2_ITERATIONS)]
+    else:
+        raise ValueError(f'Unsupported password hash method: {method}')
+    return ':'.join([name] + args + defaults[len(args):])
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords in a bounded pool of worker processes,
+    so CPU-bound key derivation neither holds the GIL nor starves the
+    request threads of the web worker.
+
+    At most `max_pending` operations may be queued or running at once;
+    further callers wait up to `wait` seconds for a slot and then get
+    HasherBusy instead of piling onto the queue. With `workers` set to 0
+    hashing runs inline on the calling thread.
+    """
+
+    def __init__(self, method=DEFAULT_METHOD, workers=None, max_pending=None, wait=1.0):
+        self._lock = threading.Lock()
+        self._executor = None
+        self.configure(method, workers, max_pending, wait)
+
+    def configure(self, method=DEFAULT_METHOD, workers=None, max_pending=None, wait=1.0):
+        """(Re)apply settings; a running pool is shut down and recreated on demand."""
+        self.shutdown()
+        self.method = normalize_method(method)
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max_pending or max(self.workers, 1) * 4
+        self.wait = wait
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def init_app(self, app):
+        """Configure from PASSWORD_HASH_* settings and stop the pool at exit."""
+        self.configure(
+            method=app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD),
+            workers=app.config.get('PASSWORD_HASH_WORKERS'),
+            max_pending=app.config.get('PASSWORD_HASH_MAX_PENDING'),
+            wait=app.config.get('PASSWORD_HASH_WAIT', 1.0))
+        atexit.register(self.shutdown)
+
+    def hash(self, password):
+        """Hash `password` with the configured method."""
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        """Check `password` against a stored hash of any supported method."""
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if a stored hash was made with a method other than the configured one."""
+        return password_hash.split('$', 1)[0] != self.method
+
+    def shutdown(self):
+        """Stop the worker processes, if any were started."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(timeout=self.wait):
+            raise HasherBusy('Too many password operations in progress')
+        try:
+            if not self.workers:
+                return func(*args)
+            try:
+                return self._submit(func, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); retry once on a fresh pool
+                return self._submit(func, *args)
+        finally:
+            self._slots.release()
+
+    def _submit(self, func, *args):
+        pool = self._pool()
+        try:
+            return pool.submit(func, *args).result()
+        except BrokenProcessPool:
+            with self._lock:
+                if self._executor is pool:
+                    self._executor = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def _pool(self):
+        # Started lazily so each forked web worker gets its own pool
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+
+password_hasher = PasswordHasher(workers=0)
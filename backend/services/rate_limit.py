@@ -0,0 +1,256 @@
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+try:
+    import redis
+except ImportError:  # optional; only needed for redis:// storage
+    redis = None
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_rate(value):
+    """
+    Parse '<count>/<period>' (e.g. '10/minute') into (tokens per second,
+    burst). The bucket holds `count` tokens, so a client may spend a whole
+    period's allowance at once. Empty, None or a count of 0 disables the
+    limit.
+    """
+    if not value:
+        return None
+    count, _, period = value.partition('/')
+    try:
+        count = int(count)
+        seconds = PERIODS[period.strip().lower().rstrip('s') or 'second']
+    except (KeyError, ValueError):
+        raise ValueError(f'Invalid rate limit: {value}')
+    if count < 0:
+        raise ValueError(f'Invalid rate limit: {value}')
+    if not count:
+        return None
+    return count / seconds, count
+
+
+def _refill(tokens, updated, now, rate, burst, cost):
+    """Token bucket step: return (allowed, tokens left, seconds until allowed)."""
+    tokens = burst if tokens is None else min(burst, tokens + (now - updated) * rate)
+    if tokens >= cost:
+        return True, tokens - cost, 0.0
+    return False, tokens, (cost - tokens) / rate
+
+
+class MemoryStorage:
+    """Buckets in a bounded LRU dict of this process."""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()  # key -> (tokens, updated)
+
+    def take(self, key, rate, burst, cost=1):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (None, now))
+            allowed, tokens, retry_after = _refill(tokens, updated, now, rate, burst, cost)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                # The evicted client comes back to a full bucket
+                self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+
+class SQLiteStorage:
+    """
+    Buckets in a SQLite file shared by every worker process on the host.
+    Each check is one short write transaction; synchronous writes are
+    off since losing recent buckets on a crash only resets some limits.
+    """
+
+    PRUNE_EVERY = 10000
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._checks = 0
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS rate_limit_buckets '
+                         '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, rate, burst, cost=1):
+        now = time.time()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?',
+                               (key,)).fetchone()
+            tokens, updated = row if row else (None, now)
+            allowed, tokens, retry_after = _refill(tokens, updated, now, rate, burst, cost)
+            conn.execute('INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?) '
+                         'ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, '
+                         'updated = excluded.updated', (key, tokens, now))
+            self._checks += 1
+            if self._checks % self.PRUNE_EVERY == 0:
+                # Buckets idle for a day are full again; dropping them changes nothing
+                conn.execute('DELETE FROM rate_limit_buckets WHERE updated < ?', (now - 86400,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return allowed, retry_after
+
+
+class RedisStorage:
+    """Buckets in Redis (or any server speaking its protocol), updated by one Lua script."""
+
+    SCRIPT = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local rate, burst, cost, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local tokens = burst
+if bucket[1] then
+    tokens = math.min(burst, tonumber(bucket[1]) + (now - tonumber(bucket[2])) * rate)
+end
+local retry_ms = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry_ms = math.ceil((cost - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return retry_ms
+"""
+
+    def __init__(self, url):
+        if redis is None:
+            raise RuntimeError('redis:// rate limit storage needs the redis package')
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def take(self, key, rate, burst, cost=1):
+        retry_ms = self._script(keys=[f'rate_limit:{key}'], args=[rate, burst, cost, time.time()])
+        return not retry_ms, retry_ms / 1000
+
+
+# Failures of a storage backend, which let requests through rather than
+# failing them; anything else is a bug and propagates
+STORAGE_ERRORS = (sqlite3.Error, OSError) + ((redis.RedisError,) if redis is not None else ())
+
+
+def make_storage(url):
+    """Storage for RATE_LIMIT_STORAGE: 'memory', 'sqlite:///<path>' or 'redis://...'."""
+    if not url or url == 'memory':
+        return MemoryStorage()
+    if url.startswith('sqlite:///'):
+        return SQLiteStorage(url[len('sqlite:///'):])
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisStorage(url)
+    raise ValueError(f'Unsupported rate limit storage: {url}')
+
+
+class Policy:
+    """Limits of one named group of routes."""
+
+    def __init__(self, per_client=None, per_route=None, concurrency=0):
+        self.per_client = parse_rate(per_client)
+        self.per_route = parse_rate(per_route)
+        self.slots = threading.BoundedSemaphore(concurrency) if concurrency else None
+
+
+def client_key():
+    """The JWT identity of the caller when there is one, else their address."""
+    identity = None
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:  # the route is not @jwt_required
+        if request.headers.get('Authorization'):
+            try:
+                verify_jwt_in_request(optional=True)
+                identity = get_jwt_identity()
+            except Exception:  # a bad token is for the view to reject, not the limiter
+                pass
+    return f'user:{identity}' if identity is not None else f'ip:{request.remote_addr}'
+
+
+def too_many_requests(retry_after):
+    response = jsonify({'error': 'Too many requests, retry later'})
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response, 429
+
+
+class RateLimiter:
+    """
+    Token-bucket limits per client and per route, plus a cap on requests
+    of a route running at once in this process, applied by the `limit`
+    decorator. Storage errors (STORAGE_ERRORS) let requests through rather
+    than failing them.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.storage = None
+        self.policies = {}
+
+    def init_app(self, app):
+        """Configure from RATE_LIMIT_ENABLED, RATE_LIMIT_STORAGE and RATE_LIMITS."""
+        self.enabled = app.config.get('RATE_LIMIT_ENABLED', True)
+        self.storage = make_storage(app.config.get('RATE_LIMIT_STORAGE', 'memory'))
+        self.policies = {name: Policy(**limits)
+                         for name, limits in app.config.get('RATE_LIMITS', {}).items()}
+
+    def limit(self, name):
+        """Decorate a view with the limits of policy `name`."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                policy = self.policies.get(name)
+                if not self.enabled or policy is None:
+                    return view(*args, **kwargs)
+                retry_after = self._check(name, policy)
+                if retry_after:
+                    return too_many_requests(retry_after)
+                if policy.slots is None:
+                    return view(*args, **kwargs)
+                if not policy.slots.acquire(blocking=False):
+                    return too_many_requests(1)
+                try:
+                    return view(*args, **kwargs)
+                finally:
+                    policy.slots.release()
+            return wrapper
+        return decorator
+
+    def _check(self, name, policy):
+        """Seconds the caller must wait, or 0 if the request may proceed."""
+        try:
+            if policy.per_client:
+                allowed, retry_after = self.storage.take(f'{name}:{client_key()}', *policy.per_client)
+                if not allowed:
+                    return retry_after
+            if policy.per_route:
+                allowed, retry_after = self.storage.take(name, *policy.per_route)
+                if not allowed:
+                    return retry_after
+        except STORAGE_ERRORS as err:
+            current_app.logger.warning('Rate limit storage failed, not limiting: %s', err)
+        return 0
+
+
+limiter = RateLimiter()
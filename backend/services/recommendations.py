@@ -0,0 +1,382 @@
+import math
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from flask import current_app
+from scipy import sparse
+from sqlalchemy import func
+
+from db import db
+from models.job import Job
+from services.search_index import SYNC_INTERVAL, SYNC_OVERLAP, tokenize
+
+# Per-field term frequency multipliers for job documents
+JOB_FIELD_WEIGHTS = {
+    'job_title': 3,
+    'category': 2,
+    'experience_level': 2,
+    'location': 1,
+    'description': 1,
+}
+# Profile fields that make up a user's query vector
+USER_FIELD_WEIGHTS = {
+    'skills': 1.0,
+    'experience_level': 0.5,
+    'location': 0.5,
+}
+
+# Only the strongest terms of each job are kept, which bounds the matrix
+# at MAX_TERMS_PER_JOB non-zeros per row however long the description is.
+MAX_TERMS_PER_JOB = 48
+# Rebuild the base matrix in the background once pending and removed
+# rows reach this many rows or this share of it
+COMPACT_MIN_ROWS = 1000
+COMPACT_RATIO = 0.05
+# Rebuild from the DB in the background (refreshing the IDF weights) when
+# the number of jobs drifts this far from the count the weights were
+# computed for
+IDF_DRIFT = 0.2
+
+
+class JobRecommender:
+    """
+    Recommends active jobs for a user profile by TF-IDF cosine similarity
+    between the user's skills and each job's text.
+
+    Job vectors live in a column-compressed SciPy matrix so that scoring a
+    profile only touches the columns of the profile's terms: one sparse
+    matrix product over the whole catalogue. New and updated jobs are
+    weighted with the current IDF snapshot and appended to a small pending
+    matrix; removed jobs are masked out. Only the weighted sparse rows are
+    kept.
+
+    Like the search index, it is kept current through `upsert` and
+    `remove`, and `ensure_built` reloads the jobs other processes changed.
+    The matrix is built, and rebuilt once the pending rows grow or the IDF
+    weights go stale, by a background thread while the current matrix
+    keeps serving; until the first build finishes there are no
+    recommendations.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._replay = None                  # job_id -> fields or None, while rebuilding
+        self._reset_state()
+
+    def _reset_state(self):
+        self._built = False
+        self._stale = False
+        self._high_water = None              # newest jobs.updated_at loaded
+        self._checked_at = 0.0               # monotonic time of the last sync check
+        self._vocabulary = {}                # term -> column
+        self._idf = np.zeros(0, dtype=np.float32)
+        self._idf_docs = 0                   # job count the IDF snapshot is for
+        self._base = sparse.csc_matrix((0, 0), dtype=np.float32)
+        self._base_ids = np.zeros(0, dtype=np.int64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._base_rows = {}                 # job_id -> row of the base matrix
+        self._pending = {}                   # job_id -> (columns, weights)
+        self._pending_matrix = None
+
+    def __len__(self):
+        return int(self._alive.sum()) + len(self._pending)
+
+    @property
+    def built(self):
+        """Whether the matrix has been loaded and is being kept current."""
+        return self._built
+
+    def ensure_built(self, db_session):
+        """
+        Start loading every active job into the matrix in the background
+        on first use, or rebuilding it once stale. Every SYNC_INTERVAL
+        seconds, reload the jobs changed by other processes.
+        """
+        if not self._built or self._stale:
+            self._rebuild_in_background()
+        if self._built and time.monotonic() - self._checked_at >= SYNC_INTERVAL:
+            self._sync(db_session)
+
+    def rebuild(self, db_session):
+        """
+        Rebuild the matrix from the DB without blocking recommendations,
+        then swap it in. Changes made meanwhile are replayed onto it.
+        """
+        with self._lock:
+            if self._replay is None:
+                self._replay = {}
+        try:
+            fresh = JobRecommender()
+            high_water = db_session.query(func.max(Job.updated_at)).scalar()
+            fresh._build(self._documents(db_session))
+            fresh._high_water = high_water
+            fresh._checked_at = time.monotonic()
+            with self._lock:
+                for name, value in vars(fresh).items():
+                    if name not in ('_lock', '_replay'):
+                        setattr(self, name, value)
+                for job_id, fields in self._replay.items():
+                    self._remove(job_id)
+                    if fields is not None:
+                        self._add(job_id, fields)
+        finally:
+            with self._lock:
+                self._replay = None
+
+    def reset(self):
+        """Drop the matrix; the next recommendation rebuilds it from the DB."""
+        with self._lock:
+            self._reset_state()
+
+    def upsert(self, job):
+        """Add or re-vectorize a job, dropping it if it is no longer active."""
+        fields = {field: getattr(job, field) for field in JOB_FIELD_WEIGHTS} \
+            if job.job_status == 'active' else None
+        with self._lock:
+            if self._replay is not None:
+                self._replay[job.id] = fields
+            if not self._built:
+                return
+            self._remove(job.id)
+            if fields is not None:
+                self._add(job.id, fields)
+            self._check_stale()
+
+    def remove(self, job_id):
+        """Remove a job from the recommendations if present."""
+        with self._lock:
+            if self._replay is not None:
+                self._replay[job_id] = None
+            self._remove(job_id)
+
+    def recommend(self, profile, limit=10, exclude=()):
+        """
+        Return up to `limit` (job_id, score) pairs for a user profile dict
+        with skills/experience_level/location, best first. Jobs in
+        `exclude` (e.g. already applied for) are skipped.
+        """
+        with self._lock:
+            query = self._query_vector(profile)
+            if query is None:
+                return []
+            columns, weights = query
+            ids, scores = [], []
+            base_columns = columns < self._base.shape[1]
+            if base_columns.any() and self._base.shape[0]:
+                # Only the selected columns are read; the product is sparse
+                # over the jobs sharing at least one term with the profile.
+                vector = sparse.csc_matrix(
+                    (weights[base_columns], (columns[base_columns], np.zeros(base_columns.sum(), dtype=np.int32))),
+                    shape=(self._base.shape[1], 1))
+                product = (self._base @ vector).tocoo()
+                hit = self._alive[product.row]
+                ids.append(self._base_ids[product.row[hit]])
+                scores.append(product.data[hit])
+            if self._pending:
+                matrix, pending_ids = self._pending_csr()
+                vector = np.zeros(matrix.shape[1], dtype=np.float32)
+                vector[columns[columns < matrix.shape[1]]] = weights[columns < matrix.shape[1]]
+                pending_scores = matrix @ vector
+                hit = pending_scores > 0
+                ids.append(pending_ids[hit])
+                scores.append(pending_scores[hit])
+
+        if not ids:
+            return []
+        ids, scores = np.concatenate(ids), np.concatenate(scores)
+        if exclude:
+            keep = ~np.isin(ids, np.fromiter(exclude, dtype=np.int64))
+            ids, scores = ids[keep], scores[keep]
+        if len(scores) > limit:
+            top = np.argpartition(-scores, limit)[:limit]
+            ids, scores = ids[top], scores[top]
+        order = np.argsort(-scores, kind='stable')
+        return [(int(ids[i]), float(scores[i])) for i in order]
+
+    @staticmethod
+    def _rows(db_session, *criteria):
+        return db_session.query(
+            Job.id, Job.job_status, *(getattr(Job, field) for field in JOB_FIELD_WEIGHTS)
+        ).filter(*criteria).yield_per(1000)
+
+    @classmethod
+    def _documents(cls, db_session):
+        return ((row.id, row._asdict()) for row in cls._rows(db_session, Job.job_status == 'active'))
+
+    def _sync(self, db_session):
+        """Reload the jobs changed since the matrix was last checked."""
+        with self._lock:
+            if not self._built or time.monotonic() - self._checked_at < SYNC_INTERVAL:
+                return
+            self._checked_at = time.monotonic()
+            latest = db_session.query(func.max(Job.updated_at)).scalar()
+            if latest is not None and (self._high_water is None or latest > self._high_water):
+                criteria = () if self._high_water is None \
+                    else (Job.updated_at >= self._high_water - SYNC_OVERLAP,)
+                for row in self._rows(db_session, *criteria):
+                    self._remove(row.id)
+                    if row.job_status == 'active':
+                        self._add(row.id, row._asdict())
+                self._high_water = latest
+
+            active = db_session.query(func.count(Job.id)).filter(Job.job_status == 'active').scalar()
+            if active != len(self):
+                # Deletes leave no updated_at behind; reconcile by id
+                active_ids = {job_id for (job_id,) in
+                              db_session.query(Job.id).filter(Job.job_status == 'active')}
+                loaded = set(self._pending) | set(self._base_rows)
+                for job_id in loaded - active_ids:
+                    self._remove(job_id)
+                missing = active_ids - loaded
+                if missing:
+                    for row in self._rows(db_session, Job.id.in_(missing)):
+                        self._add(row.id, row._asdict())
+            self._check_stale()
+
+    def _rebuild_in_background(self):
+        with self._lock:
+            if self._replay is not None:
+                return
+            self._replay = {}
+        app = current_app._get_current_object()
+
+        def run():
+            with app.app_context():
+                try:
+                    self.rebuild(db.session)
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception('Recommendation matrix rebuild failed')
+                finally:
+                    db.session.remove()
+
+        threading.Thread(target=run, name='recommendation-rebuild', daemon=True).start()
+
+    def _build(self, documents):
+        """Vectorize `documents` ((job_id, fields) pairs) into a fresh base matrix."""
+        self._reset_state()
+        job_ids, doc_columns, doc_counts, df = [], [], [], Counter()
+        for job_id, fields in documents:
+            counts = self._term_counts(fields)
+            columns = [self._column(term) for term in counts]
+            df.update(columns)
+            job_ids.append(job_id)
+            doc_columns.append(columns)
+            doc_counts.append(list(counts.values()))
+
+        self._refresh_idf(df, len(job_ids))
+        indptr, indices, data = [0], [], []
+        for columns, counts in zip(doc_columns, doc_counts):
+            columns, weights = self._weigh(columns, counts)
+            indices.append(columns)
+            data.append(weights)
+            indptr.append(indptr[-1] + len(columns))
+        matrix = sparse.csr_matrix(
+            (np.concatenate(data) if data else np.zeros(0, dtype=np.float32),
+             np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32),
+             np.array(indptr, dtype=np.int64)),
+            shape=(len(job_ids), len(self._vocabulary)), dtype=np.float32)
+        self._set_base(matrix, np.array(job_ids, dtype=np.int64))
+        self._built = True
+
+    def _add(self, job_id, fields):
+        counts = self._term_counts(fields)
+        columns = [self._column(term) for term in counts]
+        self._pending[job_id] = self._weigh(columns, list(counts.values()))
+        self._pending_matrix = None
+
+    def _set_base(self, matrix, job_ids):
+        self._base = matrix.tocsc()
+        self._base_ids = job_ids
+        self._alive = np.ones(len(job_ids), dtype=bool)
+        self._base_rows = {int(job_id): row for row, job_id in enumerate(job_ids)}
+
+    @staticmethod
+    def _term_counts(fields):
+        counts = Counter()
+        for field, weight in JOB_FIELD_WEIGHTS.items():
+            for token in tokenize(fields.get(field)):
+                counts[token] += weight
+        return counts
+
+    def _column(self, term):
+        column = self._vocabulary.get(term)
+        if column is None:
+            column = self._vocabulary[term] = len(self._vocabulary)
+        return column
+
+    def _refresh_idf(self, doc_freq, doc_count):
+        df = np.zeros(len(self._vocabulary), dtype=np.float32)
+        if doc_freq:
+            columns = np.fromiter(doc_freq.keys(), dtype=np.int64, count=len(doc_freq))
+            df[columns] = np.fromiter(doc_freq.values(), dtype=np.float32, count=len(doc_freq))
+        self._idf = (np.log((1 + doc_count) / (1 + df)) + 1).astype(np.float32)
+        self._idf_docs = doc_count
+
+    def _idf_of(self, columns):
+        """IDF from the snapshot; terms newer than it get the rarest-term weight."""
+        known = columns < len(self._idf)
+        idf = np.full(len(columns), math.log(1 + self._idf_docs) + 1, dtype=np.float32)
+        idf[known] = self._idf[columns[known]]
+        return idf
+
+    def _weigh(self, columns, counts):
+        """Sublinear TF-IDF, pruned to MAX_TERMS_PER_JOB terms and L2-normalized."""
+        columns = np.asarray(columns, dtype=np.int32)
+        weights = (1 + np.log(np.asarray(counts, dtype=np.float32))) * self._idf_of(columns)
+        if len(columns) > MAX_TERMS_PER_JOB:
+            keep = np.argpartition(-weights, MAX_TERMS_PER_JOB)[:MAX_TERMS_PER_JOB]
+            columns, weights = columns[keep], weights[keep]
+        norm = np.linalg.norm(weights)
+        if norm:
+            weights /= norm
+        order = np.argsort(columns)
+        return columns[order], weights[order]
+
+    def _query_vector(self, profile):
+        counts = Counter()
+        for field, weight in USER_FIELD_WEIGHTS.items():
+            for token in tokenize(profile.get(field)):
+                if token in self._vocabulary:
+                    counts[self._vocabulary[token]] += weight
+        if not counts:
+            return None
+        columns = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        weights *= self._idf_of(columns)
+        return columns, weights / np.linalg.norm(weights)
+
+    def _pending_csr(self):
+        if self._pending_matrix is None:
+            job_ids = np.fromiter(self._pending.keys(), dtype=np.int64, count=len(self._pending))
+            indptr, indices, data = [0], [], []
+            for columns, weights in self._pending.values():
+                indices.append(columns)
+                data.append(weights)
+                indptr.append(indptr[-1] + len(columns))
+            matrix = sparse.csr_matrix(
+                (np.concatenate(data), np.concatenate(indices), np.array(indptr, dtype=np.int64)),
+                shape=(len(job_ids), len(self._vocabulary)), dtype=np.float32)
+            self._pending_matrix = (matrix, job_ids)
+        return self._pending_matrix
+
+    def _check_stale(self):
+        """Flag the matrix for a background rebuild once it drifted enough."""
+        live = len(self)
+        if self._idf_docs and abs(live - self._idf_docs) > IDF_DRIFT * self._idf_docs:
+            self._stale = True
+        dead = len(self._alive) - int(self._alive.sum())
+        if len(self._pending) + dead >= max(COMPACT_MIN_ROWS, COMPACT_RATIO * len(self._base_ids)):
+            self._stale = True
+
+    def _remove(self, job_id):
+        if self._pending.pop(job_id, None) is not None:
+            self._pending_matrix = None
+        row = self._base_rows.pop(job_id, None)
+        if row is not None:
+            self._alive[row] = False
+
+
+job_recommender = JobRecommender()
@@ -0,0 +1,263 @@
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from models.company import Company
+from models.job import Job
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]')
+STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in',
+    'is', 'it', 'of', 'on', 'or', 'our', 'that', 'the', 'to', 'we', 'with',
+    'you', 'your', 'will',
+})
+
+# Per-field term frequency multipliers; a hit in the title counts more
+# than the same word buried in the description.
+FIELD_WEIGHTS = {
+    'job_title': 3,
+    'category': 2,
+    'company_name': 2,
+    'description': 1,
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+RECENCY_WEIGHT = 0.3
+RECENCY_HALF_LIFE_DAYS = 30.0
+
+# Check the jobs table for changes made by other processes at most this
+# often (seconds); 0 checks on every search
+SYNC_INTERVAL = float(os.getenv('SEARCH_INDEX_SYNC_INTERVAL', '5'))
+# Changed rows are re-read from this long before the newest updated_at
+# seen, to catch transactions that committed after a later-stamped one
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+def tokenize(text):
+    """Lowercase `text` and split it into index terms."""
+    if not text:
+        return []
+    return [token for token in TOKEN_RE.findall(text.lower())
+            if token not in STOPWORDS]
+
+
+class JobSearchIndex:
+    """
+    In-memory inverted index over active jobs, ranked with BM25 and a
+    recency boost on date_posted.
+
+    The index is built from the jobs table on first use and then kept
+    current by the job routes through `upsert` and `remove`. Changes made
+    by other processes are picked up by `ensure_built`, which compares
+    the newest updated_at and the number of active jobs with the index
+    and reloads only the rows that changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._high_water = None  # newest jobs.updated_at loaded
+        self._checked_at = 0.0  # monotonic time of the last sync check
+        self._postings = {}     # term -> {job_id: weighted tf}
+        self._doc_terms = {}    # job_id -> {term: weighted tf}
+        self._doc_lengths = {}  # job_id -> weighted length
+        self._doc_posted = {}   # job_id -> date_posted timestamp
+        self._total_length = 0
+        self._norms = {}        # job_id -> BM25 length normaliser
+        self._norms_avg = None  # average length the norms were computed for
+
+    def __len__(self):
+        return len(self._doc_lengths)
+
+    @property
+    def built(self):
+        """Whether the index has been loaded and is being kept current."""
+        return self._built
+
+    def ensure_built(self, db_session):
+        """
+        Load every active job into the index once per process, then every
+        SYNC_INTERVAL seconds reload the jobs changed by other processes.
+        """
+        if self._built:
+            if time.monotonic() - self._checked_at >= SYNC_INTERVAL:
+                self._sync(db_session)
+            return
+        with self._lock:
+            if self._built:
+                return
+            self._high_water = db_session.query(func.max(Job.updated_at)).scalar()
+            for row in self._rows(db_session, Job.job_status == 'active'):
+                self._add(row.id, row._asdict())
+            self._checked_at = time.monotonic()
+            self._built = True
+
+    def reset(self):
+        """Drop all indexed documents; the next query rebuilds from the DB."""
+        with self._lock:
+            self._built = False
+            self._high_water = None
+            self._checked_at = 0.0
+            self._postings = {}
+            self._doc_terms = {}
+            self._doc_lengths = {}
+            self._doc_posted = {}
+            self._total_length = 0
+            self._norms = {}
+            self._norms_avg = None
+
+    def upsert(self, job):
+        """Index or re-index a job, dropping it if it is no longer active."""
+        with self._lock:
+            if not self._built:
+                # The initial build will read the committed row itself
+                return
+            self._remove(job.id)
+            if job.job_status == 'active':
+                self._add(job.id, {
+                    'job_title': job.job_title,
+                    'description': job.description,
+                    'category': job.category,
+                    'company_name': job.company.company_name if job.company else None,
+                    'date_posted': job.date_posted,
+                })
+
+    def remove(self, job_id):
+        """Remove a job from the index if present."""
+        with self._lock:
+            self._remove(job_id)
+
+    def search(self, query, limit=20, now=None):
+        """
+        Return up to `limit` (job_id, score) pairs for `query`, best first.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        now = (now or datetime.utcnow()).timestamp()
+
+        with self._lock:
+            doc_count = len(self._doc_lengths)
+            if not doc_count:
+                return []
+            norms = self._current_norms(doc_count)
+            scores = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                weight = idf * (BM25_K1 + 1)
+                get = scores.get
+                for job_id, tf in postings.items():
+                    scores[job_id] = get(job_id, 0.0) + weight * tf / (tf + norms[job_id])
+
+            # Only the BM25 top candidates get the recency boost; the
+            # boost is bounded so it can reorder but never rescue a
+            # document far outside the text-relevance cut.
+            candidates = heapq.nlargest(limit * 4, scores.items(), key=lambda item: item[1])
+            boosted = [(job_id, score * self._recency_factor(job_id, now))
+                       for job_id, score in candidates]
+        return heapq.nlargest(limit, boosted, key=lambda item: item[1])
+
+    @staticmethod
+    def _rows(db_session, *criteria):
+        return db_session.query(
+            Job.id, Job.job_title, Job.description, Job.category,
+            Job.date_posted, Job.job_status, Company.company_name
+        ).join(Company, Job.company_id == Company.id) \
+            .filter(*criteria) \
+            .yield_per(1000)
+
+    def _sync(self, db_session):
+        """Reload the jobs changed since the index was last checked."""
+        with self._lock:
+            if time.monotonic() - self._checked_at < SYNC_INTERVAL:
+                return
+            self._checked_at = time.monotonic()
+            latest = db_session.query(func.max(Job.updated_at)).scalar()
+            if latest is not None and (self._high_water is None or latest > self._high_water):
+                criteria = () if self._high_water is None \
+                    else (Job.updated_at >= self._high_water - SYNC_OVERLAP,)
+                for row in self._rows(db_session, *criteria):
+                    self._remove(row.id)
+                    if row.job_status == 'active':
+                        self._add(row.id, row._asdict())
+                self._high_water = latest
+
+            active = db_session.query(func.count(Job.id)).filter(Job.job_status == 'active').scalar()
+            if active != len(self._doc_lengths):
+                # Deletes leave no updated_at behind; reconcile by id
+                active_ids = {job_id for (job_id,) in
+                              db_session.query(Job.id).filter(Job.job_status == 'active')}
+                for job_id in set(self._doc_lengths) - active_ids:
+                    self._remove(job_id)
+                missing = active_ids - set(self._doc_lengths)
+                if missing:
+                    for row in self._rows(db_session, Job.id.in_(missing)):
+                        self._add(row.id, row._asdict())
+
+    def _current_norms(self, doc_count):
+        """
+        Return the per-document BM25 length normalisers, recomputing them
+        only once the average document length has drifted by more than 1%.
+        """
+        avg_length = self._total_length / doc_count or 1.0
+        if self._norms_avg is None or abs(avg_length - self._norms_avg) > 0.01 * self._norms_avg:
+            self._norms = {job_id: self._norm(length, avg_length)
+                           for job_id, length in self._doc_lengths.items()}
+            self._norms_avg = avg_length
+        return self._norms
+
+    @staticmethod
+    def _norm(length, avg_length):
+        return BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+
+    def _recency_factor(self, job_id, now):
+        posted = self._doc_posted.get(job_id)
+        if posted is None:
+            return 1.0
+        age_days = max(0.0, (now - posted) / 86400.0)
+        return 1.0 + RECENCY_WEIGHT * 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+    def _add(self, job_id, fields):
+        terms = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(fields.get(field)):
+                terms[token] += weight
+        length = sum(terms.values())
+
+        self._doc_terms[job_id] = terms
+        self._doc_lengths[job_id] = length
+        self._total_length += length
+        if self._norms_avg is not None:
+            self._norms[job_id] = self._norm(length, self._norms_avg)
+        posted = fields.get('date_posted')
+        self._doc_posted[job_id] = posted.timestamp() if posted else None
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[job_id] = tf
+
+    def _remove(self, job_id):
+        terms = self._doc_terms.pop(job_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(job_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(job_id)
+        self._doc_posted.pop(job_id, None)
+        self._norms.pop(job_id, None)
+
+
+job_index = JobSearchIndex()
@@ -0,0 +1,120 @@
+import codecs
+import json
+
+READ_SIZE = 64 * 1024
+# Largest single record we are willing to buffer while looking for its end
+MAX_RECORD_BYTES = 1024 * 1024
+
+
+class StreamFormatError(ValueError):
+    """Raised when a streamed body is not valid NDJSON or a JSON array."""
+
+
+def iter_json_records(stream, read_size=READ_SIZE, max_record=MAX_RECORD_BYTES):
+    """
+    Yield (index, record, error) for every record in a request body that
+    is either NDJSON or a single JSON array, reading it in fixed-size
+    chunks so memory stays bounded by the largest record.
+
+    A malformed NDJSON line is reported through `error` and skipped; a
+    malformed JSON array raises StreamFormatError since its remaining
+    records cannot be located.
+    """
+    chunks = _iter_text(stream, read_size)
+    buffer = ''
+    for chunk in chunks:
+        buffer += chunk
+        if buffer.strip():
+            break
+    stripped = buffer.lstrip()
+    if stripped.startswith('['):
+        yield from _iter_array(stripped[1:], chunks, max_record)
+    else:
+        yield from _iter_lines(buffer, chunks, max_record)
+
+
+def _iter_text(stream, read_size):
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='strict')
+    while True:
+        data = stream.read(read_size)
+        if not data:
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                yield tail
+            return
+        try:
+            yield decoder.decode(data)
+        except UnicodeDecodeError as err:
+            raise StreamFormatError('Body is not valid UTF-8') from err
+
+
+def _iter_lines(buffer, chunks, max_record):
+    index = 0
+    while True:
+        newline = buffer.find('\n')
+        if newline == -1:
+            if len(buffer) > max_record:
+                raise StreamFormatError(f'Record {index} exceeds {max_record} bytes')
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            buffer += chunk
+            continue
+        line, buffer = buffer[:newline], buffer[newline + 1:]
+        if line.strip():
+            yield (index,) + _decode(line)
+            index += 1
+    if buffer.strip():
+        yield (index,) + _decode(buffer)
+
+
+def _decode(text):
+    try:
+        return json.loads(text), None
+    except ValueError as err:
+        return None, f'Invalid JSON: {err}'
+
+
+def _iter_array(buffer, chunks, max_record):
+    decoder = json.JSONDecoder()
+    index = 0
+    expect_value = True
+    exhausted = False
+    while True:
+        buffer = buffer.lstrip()
+        if not expect_value and buffer.startswith(','):
+            buffer = buffer[1:].lstrip()
+            expect_value = True
+        if buffer.startswith(']'):
+            if expect_value and index:
+                raise StreamFormatError(f'Trailing "," after record {index - 1}')
+            if buffer[1:].strip():
+                raise StreamFormatError('Unexpected data after JSON array')
+            for extra in chunks:
+                if extra.strip():
+                    raise StreamFormatError('Unexpected data after JSON array')
+            return
+        if buffer and expect_value:
+            try:
+                record, end = decoder.raw_decode(buffer)
+            except ValueError:
+                # Incomplete record; read more unless the stream is done
+                if exhausted or len(buffer) > max_record:
+                    raise StreamFormatError(f'Malformed or oversized record {index}')
+            else:
+                # A bare number at the end of a chunk may still be growing
+                if end < len(buffer) or exhausted:
+                    yield index, record, None
+                    index += 1
+                    buffer = buffer[end:]
+                    expect_value = False
+                    continue
+        elif buffer and not expect_value:
+            raise StreamFormatError(f'Expected "," or "]" after record {index - 1}')
+        if exhausted:
+            raise StreamFormatError('Unterminated JSON array')
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+        else:
+            buffer += chunk
@@ -0,0 +1,169 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import exists, insert, select
+from sqlalchemy.orm import aliased
+
+from db import db
+from models.application import Application
+from models.job import Job
+from models.job_archive import JobArchive
+from models.job_fingerprint import JobFingerprint, JobLshBand
+from models.scheduler_lock import SchedulerLock
+from services import alerts, company_profile, facets
+from services.search_index import job_index
+from services.recommendations import job_recommender
+
+DEFAULT_BATCH_SIZE = 1000
+LOCK_NAME = 'job-sweeper'
+# How long a sweeper's lock outlives its last run, so a crashed runner is
+# replaced after at most one interval plus this many seconds
+LOCK_GRACE = 300
+
+ARCHIVED_COLUMNS = ('id', 'job_title', 'description', 'job_type', 'location',
+                    'date_posted', 'application_deadline', 'category', 'company_id',
+                    'experience_level', 'job_status', 'application_link',
+                    'source', 'source_id')
+
+
+def close_expired_jobs(db_session, now=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Close active jobs whose application deadline has passed, one batch
+    per transaction, with a single UPDATE per batch. Closed jobs are
+    taken out of the facet counts and the local search index.
+    Returns the number of jobs closed.
+    """
+    now = now or datetime.utcnow()
+    closed = 0
+    while True:
+        batch = db_session.query(Job.id, Job.company_id) \
+            .filter(Job.job_status == 'active', Job.application_deadline < now) \
+            .order_by(Job.id).limit(batch_size).all()
+        if not batch:
+            return closed
+        job_ids = [job_id for job_id, _ in batch]
+
+        for key, count in facets.count_keys(db_session, Job.id.in_(job_ids)).items():
+            facets.adjust(db_session, key, -count)
+        db_session.query(Job).filter(Job.id.in_(job_ids)) \
+            .update({'job_status': 'closed'}, synchronize_session=False)
+        db_session.commit()
+
+        for job_id in job_ids:
+            job_index.remove(job_id)
+            job_recommender.remove(job_id)
+        company_profile.invalidate(*{company_id for _, company_id in batch})
+        closed += len(job_ids)
+
+
+def archive_closed_jobs(db_session, older_than_days, now=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Move closed jobs whose deadline passed more than `older_than_days`
+    ago into jobs_archive with INSERT ... SELECT and DELETE, one batch per
+    transaction. Jobs that still have applications or are the canonical
+    listing of a duplicate stay in place. Returns the number archived.
+    """
+    cutoff = (now or datetime.utcnow()) - timedelta(days=older_than_days)
+    duplicate = aliased(Job)
+    archived = 0
+    while True:
+        batch = db_session.query(Job.id, Job.company_id).filter(
+            Job.job_status == 'closed',
+            Job.application_deadline < cutoff,
+            ~exists().where(Application.job_id == Job.id),
+            ~exists().where(duplicate.canonical_id == Job.id),
+        ).order_by(Job.id).limit(batch_size).all()
+        if not batch:
+            return archived
+        job_ids = [job_id for job_id, _ in batch]
+
+        db_session.execute(insert(JobArchive.__table__).from_select(
+            list(ARCHIVED_COLUMNS),
+            select(*(getattr(Job, column) for column in ARCHIVED_COLUMNS))
+            .where(Job.id.in_(job_ids))))
+        alerts.forget_jobs(db_session, job_ids)
+        for model in (JobLshBand, JobFingerprint):
+            db_session.query(model).filter(model.job_id.in_(job_ids)) \
+                .delete(synchronize_session=False)
+        db_session.query(Job).filter(Job.id.in_(job_ids)).delete(synchronize_session=False)
+        db_session.commit()
+        company_profile.invalidate(*{company_id for _, company_id in batch})
+        archived += len(job_ids)
+
+
+def sweep(db_session, archive_after_days=0, batch_size=DEFAULT_BATCH_SIZE):
+    """Close expired jobs and, if enabled, archive long-closed ones."""
+    closed = close_expired_jobs(db_session, batch_size=batch_size)
+    archived = 0
+    if archive_after_days:
+        archived = archive_closed_jobs(db_session, archive_after_days, batch_size=batch_size)
+    return closed, archived
+
+
+def lock_owner():
+    """A scheduler lock owner name unique to the calling runner."""
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+def start_sweeper(app, interval):
+    """
+    Run `sweep` every `interval` seconds in a daemon thread of this
+    process. Every web worker starts one, but only the one holding the
+    sweeper lock sweeps; the others stand by to take over if it stops.
+    """
+    def run():
+        owner = lock_owner()
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                try:
+                    if not SchedulerLock.acquire(db.session, LOCK_NAME, owner, interval + LOCK_GRACE):
+                        continue
+                    closed, archived = sweep(db.session, app.config.get('JOB_ARCHIVE_AFTER_DAYS', 0))
+                    if closed or archived:
+                        app.logger.info('Job sweeper closed %d and archived %d jobs',
+                                        closed, archived)
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception('Job sweeper failed')
+                finally:
+                    db.session.remove()
+
+    thread = threading.Thread(target=run, name='job-sweeper', daemon=True)
+    thread.start()
+    return thread
+
+
+@click.command('sweep-jobs')
+@click.option('--archive-after-days', type=int, default=None,
+              help='Archive jobs closed this many days past their deadline. '
+                   'Defaults to JOB_ARCHIVE_AFTER_DAYS; 0 disables archiving.')
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True,
+              help='Jobs updated per transaction.')
+@click.option('--interval', type=float, default=None,
+              help='Keep running, sweeping every INTERVAL seconds.')
+@with_appcontext
+def sweep_command(archive_after_days, batch_size, interval):
+    """Close jobs past their application deadline and archive old ones."""
+    if archive_after_days is None:
+        archive_after_days = current_app.config.get('JOB_ARCHIVE_AFTER_DAYS', 0)
+    owner = lock_owner()
+    try:
+        while True:
+            if SchedulerLock.acquire(db.session, LOCK_NAME, owner, (interval or 0) + LOCK_GRACE):
+                closed, archived = sweep(db.session, archive_after_days, batch_size)
+                click.echo(f'Closed {closed} expired jobs, archived {archived}')
+            else:
+                click.echo('Another sweeper holds the lock, skipping this run')
+            if interval is None:
+                break
+            time.sleep(interval)
+    finally:
+        SchedulerLock.release(db.session, LOCK_NAME, owner)
@@ -0,0 +1,158 @@
+import unicodedata
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, select
+
+from db import db
+from models.user import User
+from models.user_name_trigram import UserNameTrigram
+from services.bulk import bulk_insert
+
+# Matching users counted before the total is reported as a lower bound
+TOTAL_CAP = 1000
+DEFAULT_BATCH_SIZE = 1000
+
+
+def normalize_name(text):
+    """Lowercase `text`, strip accents and reduce it to space-separated words."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char if char.isalnum() else ' ' for char in text
+                   if not unicodedata.combining(char))
+    return ' '.join(text.lower().split())
+
+
+def name_trigrams(name):
+    """
+    Trigrams of every word of a name, padded like pg_trgm with two spaces
+    in front and one behind, so the leading trigrams ('  a', ' al') also
+    answer one- and two-letter word prefixes.
+    """
+    grams = set()
+    for word in normalize_name(name).split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def search_trigrams(term):
+    """
+    Trigrams a name must contain to match `term`. Words of three or more
+    letters match anywhere inside a name word; shorter words take the
+    prefix fast path and match the start of a name word.
+    """
+    grams = set()
+    for word in normalize_name(term).split():
+        if len(word) < 3:
+            grams.add(f'  {word}'[-3:])
+        else:
+            grams.update(word[i:i + 3] for i in range(len(word) - 2))
+    return grams
+
+
+def matches(name, term):
+    """Exact check behind the trigram filter, which can give false positives."""
+    words = normalize_name(name).split()
+    return all(any(word.startswith(part) if len(part) < 3 else part in word for word in words)
+               for part in normalize_name(term).split())
+
+
+def index_user(db_session, user):
+    """Replace the name trigrams of a flushed user. Does not commit."""
+    forget_user(db_session, user.id)
+    bulk_insert(db_session, UserNameTrigram,
+                [{'trigram': gram, 'user_id': user.id} for gram in name_trigrams(user.fullname)])
+
+
+def forget_user(db_session, user_id):
+    """Drop the name trigrams of a user. Does not commit."""
+    db_session.query(UserNameTrigram).filter(UserNameTrigram.user_id == user_id) \
+        .delete(synchronize_session=False)
+
+
+def _candidates(grams, after):
+    """Ids of users holding every trigram in `grams`, in id order, after `after`."""
+    query = select(UserNameTrigram.user_id).where(UserNameTrigram.trigram.in_(grams))
+    if after is not None:
+        query = query.where(UserNameTrigram.user_id > after)
+    return query.group_by(UserNameTrigram.user_id) \
+        .having(func.count() == len(grams)).order_by(UserNameTrigram.user_id)
+
+
+def search_page(db_session, term, after=None, per_page=10):
+    """
+    Fetch one page of users whose name matches `term`, in id order,
+    strictly after the id `after`. One extra user is returned when a next
+    page exists. Candidates come from the trigram index in batches and
+    are checked against the name, so no query scans the users table.
+    """
+    grams = search_trigrams(term)
+    if not grams:
+        query = db_session.query(User)
+        if after is not None:
+            query = query.filter(User.id > after)
+        return query.order_by(User.id).limit(per_page + 1).all()
+
+    users = []
+    batch_size = max(per_page + 1, 100)
+    while len(users) <= per_page:
+        ids = db_session.execute(_candidates(grams, after).limit(batch_size)).scalars().all()
+        if not ids:
+            break
+        users.extend(user for user in db_session.query(User).filter(User.id.in_(ids))
+                     .order_by(User.id) if matches(user.fullname, term))
+        if len(ids) < batch_size:
+            break
+        after = ids[-1]
+    return users[:per_page + 1]
+
+
+def count_matches(db_session, term, exact=False, cap=TOTAL_CAP):
+    """
+    Return (total, is_exact) for users matching `term`. Candidates are
+    read from the trigram index in id order and checked against the name
+    in batches; unless `exact` is set, counting stops once more than `cap`
+    users matched and the total is reported as `cap`, marked inexact.
+    """
+    grams = search_trigrams(term)
+    if not grams:
+        if exact:
+            return db_session.execute(select(func.count()).select_from(User)).scalar(), True
+        total = db_session.execute(select(func.count()).select_from(
+            select(User.id).limit(cap + 1).subquery())).scalar()
+        return (cap, False) if total > cap else (total, True)
+
+    total, after = 0, None
+    while True:
+        ids = db_session.execute(_candidates(grams, after).limit(DEFAULT_BATCH_SIZE)).scalars().all()
+        if ids:
+            names = db_session.execute(select(User.fullname).where(User.id.in_(ids))).scalars()
+            total += sum(1 for name in names if matches(name, term))
+        if not exact and total > cap:
+            return cap, False
+        if len(ids) < DEFAULT_BATCH_SIZE:
+            return total, True
+        after = ids[-1]
+
+
+@click.command('index-user-names')
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True,
+              help='Users indexed per transaction.')
+@with_appcontext
+def index_user_names_command(batch_size):
+    """Rebuild the trigram index behind the user directory search."""
+    db.session.query(UserNameTrigram).delete(synchronize_session=False)
+    indexed, after = 0, 0
+    while True:
+        users = db.session.query(User.id, User.fullname).filter(User.id > after) \
+            .order_by(User.id).limit(batch_size).all()
+        if not users:
+            break
+        bulk_insert(db.session, UserNameTrigram,
+                    [{'trigram': gram, 'user_id': user_id}
+                     for user_id, fullname in users for gram in name_trigrams(fullname)])
+        db.session.commit()
+        indexed += len(users)
+        after = users[-1].id
+    db.session.commit()
+    click.echo(f'Indexed the names of {indexed} users')
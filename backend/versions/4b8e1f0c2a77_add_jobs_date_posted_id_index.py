@@ -0,0 +1,25 @@
+"""Add (date_posted, id) index on jobs for keyset pagination
+
+Revision ID: 4b8e1f0c2a77
+Revises: d903ae3bdbf0
+Create Date: 2026-10-18 09:12:44.120318
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4b8e1f0c2a77'
+down_revision = 'd903ae3bdbf0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_date_posted_id', ['date_posted', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_date_posted_id')
@@ -0,0 +1,45 @@
+"""Add source/source_id to jobs and ingest_checkpoints table
+
+Revision ID: 7c2d9a41e5b3
+Revises: 4b8e1f0c2a77
+Create Date: 2026-10-18 11:03:27.554102
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2d9a41e5b3'
+down_revision = '4b8e1f0c2a77'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('source', sa.String(length=50), nullable=True))
+        batch_op.add_column(sa.Column('source_id', sa.String(length=255), nullable=True))
+        batch_op.create_unique_constraint('uq_jobs_source_source_id', ['source', 'source_id'])
+
+    op.create_table(
+        'ingest_checkpoints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('provider', sa.String(length=50), nullable=False),
+        sa.Column('search_query', sa.String(length=255), nullable=False),
+        sa.Column('next_page', sa.Integer(), nullable=False),
+        sa.Column('jobs_ingested', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('provider', 'search_query', name='uq_ingest_checkpoints_provider_query')
+    )
+
+
+def downgrade():
+    op.drop_table('ingest_checkpoints')
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_jobs_source_source_id', type_='unique')
+        batch_op.drop_column('source_id')
+        batch_op.drop_column('source')
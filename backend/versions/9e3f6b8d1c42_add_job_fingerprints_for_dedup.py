@@ -0,0 +1,55 @@
+"""Add job fingerprint tables and jobs.canonical_id for near-duplicate detection
+
+Revision ID: 9e3f6b8d1c42
+Revises: 7c2d9a41e5b3
+Create Date: 2026-10-18 12:26:05.913877
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e3f6b8d1c42'
+down_revision = '7c2d9a41e5b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('canonical_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_jobs_canonical_id_jobs', 'jobs', ['canonical_id'], ['id'])
+
+    op.create_table(
+        'job_fingerprints',
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('signature', sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
+        sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_table(
+        'job_lsh_bands',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('band', sa.SmallInteger(), nullable=False),
+        sa.Column('bucket', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('job_lsh_bands', schema=None) as batch_op:
+        batch_op.create_index('ix_job_lsh_bands_band_bucket', ['band', 'bucket'], unique=False)
+        batch_op.create_index(batch_op.f('ix_job_lsh_bands_job_id'), ['job_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('job_lsh_bands', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_job_lsh_bands_job_id'))
+        batch_op.drop_index('ix_job_lsh_bands_band_bucket')
+
+    op.drop_table('job_lsh_bands')
+    op.drop_table('job_fingerprints')
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_jobs_canonical_id_jobs', type_='foreignkey')
+        batch_op.drop_column('canonical_id')
@@ -0,0 +1,29 @@
+"""Backfill jobs.date_posted and make it NOT NULL
+
+Revision ID: a4d7e2b95f31
+Revises: f3a9c1e58b20
+Create Date: 2026-10-19 10:02:51.377406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d7e2b95f31'
+down_revision = 'f3a9c1e58b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pages seek on (date_posted, id), which cannot step past a NULL
+    op.execute('UPDATE jobs SET date_posted = COALESCE(updated_at, CURRENT_TIMESTAMP) '
+               'WHERE date_posted IS NULL')
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.alter_column('date_posted', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.alter_column('date_posted', existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,42 @@
+"""Add normalized location columns to jobs
+
+Run `flask normalize-locations` after upgrading to fill them for
+existing jobs.
+
+Revision ID: a9d5e6f2c817
+Revises: f7a3c2b19e54
+Create Date: 2026-10-18 19:55:31.408127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d5e6f2c817'
+down_revision = 'f7a3c2b19e54'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('place_id', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('country_code', sa.String(length=2), nullable=True))
+        batch_op.add_column(sa.Column('utc_offset', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('is_remote', sa.Boolean(), nullable=False,
+                                      server_default=sa.false()))
+        batch_op.create_index(batch_op.f('ix_jobs_place_id'), ['place_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_jobs_country_code'), ['country_code'], unique=False)
+        batch_op.create_index('ix_jobs_is_remote_utc_offset', ['is_remote', 'utc_offset'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_is_remote_utc_offset')
+        batch_op.drop_index(batch_op.f('ix_jobs_country_code'))
+        batch_op.drop_index(batch_op.f('ix_jobs_place_id'))
+        batch_op.drop_column('is_remote')
+        batch_op.drop_column('utc_offset')
+        batch_op.drop_column('country_code')
+        batch_op.drop_column('place_id')
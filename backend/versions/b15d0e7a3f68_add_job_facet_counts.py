@@ -0,0 +1,44 @@
+"""Add job_facet_counts table for incrementally maintained filter facets
+
+Revision ID: b15d0e7a3f68
+Revises: 9e3f6b8d1c42
+Create Date: 2026-10-18 13:40:51.208114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b15d0e7a3f68'
+down_revision = '9e3f6b8d1c42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'job_facet_counts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_type', sa.String(length=50), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('location', sa.String(length=100), nullable=False),
+        sa.Column('experience_level', sa.String(length=50), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job_type', 'category', 'location', 'experience_level',
+                            name='uq_job_facet_counts_values')
+    )
+    op.execute("""
+        INSERT INTO job_facet_counts (job_type, category, location, experience_level, count)
+        SELECT COALESCE(job_type, ''), COALESCE(category, ''), COALESCE(location, ''),
+               COALESCE(experience_level, ''), COUNT(*)
+        FROM jobs
+        WHERE job_status = 'active'
+        GROUP BY COALESCE(job_type, ''), COALESCE(category, ''), COALESCE(location, ''),
+                 COALESCE(experience_level, '')
+    """)
+
+
+def downgrade():
+    op.drop_table('job_facet_counts')
@@ -0,0 +1,33 @@
+"""Add company filter indexes and (company_id, job_status) on jobs
+
+Revision ID: b2e8f4a61c39
+Revises: a9d5e6f2c817
+Create Date: 2026-10-18 20:31:47.552093
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2e8f4a61c39'
+down_revision = 'a9d5e6f2c817'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.create_index('ix_companies_industry_id', ['industry', 'id'], unique=False)
+        batch_op.create_index('ix_companies_company_size_id', ['company_size', 'id'], unique=False)
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_company_id_job_status', ['company_id', 'job_status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_company_id_job_status')
+
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.drop_index('ix_companies_company_size_id')
+        batch_op.drop_index('ix_companies_industry_id')
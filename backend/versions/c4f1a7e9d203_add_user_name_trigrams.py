@@ -0,0 +1,37 @@
+"""Add user_name_trigrams for the user directory search
+
+Run `flask index-user-names` after upgrading to index existing users.
+
+Revision ID: c4f1a7e9d203
+Revises: b2e8f4a61c39
+Create Date: 2026-10-18 21:14:52.630418
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f1a7e9d203'
+down_revision = 'b2e8f4a61c39'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'user_name_trigrams',
+        sa.Column('trigram', sa.String(length=3), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('trigram', 'user_id')
+    )
+    with op.batch_alter_table('user_name_trigrams', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_name_trigrams_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user_name_trigrams', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_name_trigrams_user_id'))
+
+    op.drop_table('user_name_trigrams')
@@ -0,0 +1,56 @@
+"""Add indexes for hot query paths on jobs and applications
+
+Revision ID: c8a4f2e61d05
+Revises: b15d0e7a3f68
+Create Date: 2026-10-18 14:52:19.337460
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8a4f2e61d05'
+down_revision = 'b15d0e7a3f68'
+branch_labels = None
+depends_on = None
+
+ACTIVE_JOBS = sa.text("job_status = 'active'")
+
+
+def upgrade():
+    # Keep the earliest application per (user_id, job_id) so the unique
+    # constraint can be created on tables that already hold duplicates.
+    op.execute("""
+        DELETE FROM applications WHERE id NOT IN (
+            SELECT id FROM (
+                SELECT MIN(id) AS id FROM applications GROUP BY user_id, job_id
+            ) AS keep
+        )
+    """)
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_applications_user_id_job_id', ['user_id', 'job_id'])
+        batch_op.create_index('ix_applications_job_id', ['job_id'], unique=False)
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_job_status_date_posted',
+                              ['job_status', 'date_posted', 'id'], unique=False)
+        batch_op.create_index('ix_jobs_company_id_date_posted',
+                              ['company_id', 'date_posted', 'id'], unique=False)
+
+    if op.get_bind().dialect.name in ('postgresql', 'sqlite'):
+        op.create_index('ix_jobs_active_date_posted_id', 'jobs', ['date_posted', 'id'],
+                        unique=False, postgresql_where=ACTIVE_JOBS, sqlite_where=ACTIVE_JOBS)
+
+
+def downgrade():
+    if op.get_bind().dialect.name in ('postgresql', 'sqlite'):
+        op.drop_index('ix_jobs_active_date_posted_id', table_name='jobs')
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_company_id_date_posted')
+        batch_op.drop_index('ix_jobs_job_status_date_posted')
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_index('ix_applications_job_id')
+        batch_op.drop_constraint('uq_applications_user_id_job_id', type_='unique')
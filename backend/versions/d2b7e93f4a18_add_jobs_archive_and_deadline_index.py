@@ -0,0 +1,54 @@
+"""Add jobs_archive table and (job_status, application_deadline) index
+
+Revision ID: d2b7e93f4a18
+Revises: c8a4f2e61d05
+Create Date: 2026-10-18 16:05:42.671930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b7e93f4a18'
+down_revision = 'c8a4f2e61d05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_job_status_application_deadline',
+                              ['job_status', 'application_deadline'], unique=False)
+
+    op.create_table(
+        'jobs_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('job_title', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('job_type', sa.String(length=50), nullable=False),
+        sa.Column('location', sa.String(length=100), nullable=True),
+        sa.Column('date_posted', sa.DateTime(), nullable=True),
+        sa.Column('application_deadline', sa.DateTime(), nullable=True),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('experience_level', sa.String(length=50), nullable=False),
+        sa.Column('job_status', sa.String(length=20), nullable=True),
+        sa.Column('application_link', sa.String(length=255), nullable=False),
+        sa.Column('source', sa.String(length=50), nullable=True),
+        sa.Column('source_id', sa.String(length=255), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('jobs_archive', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_jobs_archive_company_id'), ['company_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('jobs_archive', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_jobs_archive_company_id'))
+
+    op.drop_table('jobs_archive')
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_job_status_application_deadline')
@@ -0,0 +1,26 @@
+"""Add index on applications (user_id, application_date, id)
+
+Revision ID: d8a3b5c70e16
+Revises: c4f1a7e9d203
+Create Date: 2026-10-18 21:48:09.271635
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8a3b5c70e16'
+down_revision = 'c4f1a7e9d203'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.create_index('ix_applications_user_id_application_date',
+                              ['user_id', 'application_date', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_index('ix_applications_user_id_application_date')
@@ -0,0 +1,39 @@
+"""Add updated_at to jobs, companies and applications
+
+Revision ID: e41c9d07b6a2
+Revises: d2b7e93f4a18
+Create Date: 2026-10-18 17:22:08.914356
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41c9d07b6a2'
+down_revision = 'd2b7e93f4a18'
+branch_labels = None
+depends_on = None
+
+# table -> column the existing rows take their updated_at from
+TABLES = {
+    'jobs': 'date_posted',
+    'companies': None,
+    'applications': 'application_date',
+}
+
+
+def upgrade():
+    for table, source in TABLES.items():
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+            batch_op.create_index(batch_op.f(f'ix_{table}_updated_at'), ['updated_at'], unique=False)
+        backfill = f'COALESCE({source}, CURRENT_TIMESTAMP)' if source else 'CURRENT_TIMESTAMP'
+        op.execute(f'UPDATE {table} SET updated_at = {backfill}')
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(batch_op.f(f'ix_{table}_updated_at'))
+            batch_op.drop_column('updated_at')
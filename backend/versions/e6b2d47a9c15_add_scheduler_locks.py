@@ -0,0 +1,30 @@
+"""Add scheduler_locks table
+
+Revision ID: e6b2d47a9c15
+Revises: d8a3b5c70e16
+Create Date: 2026-10-18 23:12:40.518267
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6b2d47a9c15'
+down_revision = 'd8a3b5c70e16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'scheduler_locks',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('owner', sa.String(length=255), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('scheduler_locks')
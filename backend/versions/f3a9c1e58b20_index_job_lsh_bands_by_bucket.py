@@ -0,0 +1,27 @@
+"""Index job_lsh_bands by (bucket, band) instead of (band, bucket)
+
+Revision ID: f3a9c1e58b20
+Revises: e6b2d47a9c15
+Create Date: 2026-10-19 09:26:14.803512
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a9c1e58b20'
+down_revision = 'e6b2d47a9c15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('job_lsh_bands', schema=None) as batch_op:
+        batch_op.create_index('ix_job_lsh_bands_bucket_band', ['bucket', 'band'], unique=False)
+        batch_op.drop_index('ix_job_lsh_bands_band_bucket')
+
+
+def downgrade():
+    with op.batch_alter_table('job_lsh_bands', schema=None) as batch_op:
+        batch_op.create_index('ix_job_lsh_bands_band_bucket', ['band', 'bucket'], unique=False)
+        batch_op.drop_index('ix_job_lsh_bands_bucket_band')
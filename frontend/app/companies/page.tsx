@@ -16,7 +16,7 @@ export default function Companies() {
     fetch('/api/companies')
       .then(response => response.json())
       .then(data => {
-        setCompanies(data)
+        setCompanies(data.items)
         setLoading(false)
       })
       .catch(error => {
@@ -17,7 +17,7 @@ export default function Jobs() {
     fetch('/api/jobs')
       .then(response => response.json())
       .then(data => {
-        setJobs(data)
+        setJobs(data.items)
         setLoading(false)
       })
       .catch(error => {
@@ -21,7 +21,7 @@ export const CompanyManagement: React.FC = () => {
 
   useEffect(() => {
     fetchApi('/companies')
-      .then(data => setCompanies(data))
+      .then(data => setCompanies(data.items))
       .catch(error => console.error('Failed to fetch companies:', error));
   }, []);
 
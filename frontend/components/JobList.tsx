@@ -15,7 +15,7 @@ export const JobList: React.FC = () => {
 
     useEffect(() => {
         fetchApi('/jobs')
-            .then(data => setJobs(data))
+            .then(data => setJobs(data.items))
             .catch(error => console.error('Failed to fetch jobs:', error));
     }, []);
 